@@ -0,0 +1,196 @@
+import atexit
+import logging
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+
+from django.conf import settings
+
+AUDIT_SETTINGS = {
+    'SINK': 'file',
+    'PATH': os.path.join(
+        os.path.dirname(__file__), 'email', 'confirmation_codes.txt'
+    ),
+    'BUFFER_SIZE': 100,
+    'FLUSH_INTERVAL': 5,
+    'MAX_BYTES': 10 * 1024 * 1024,
+    'BACKUP_COUNT': 10,
+    **getattr(settings, 'CONFIRMATION_AUDIT', {}),
+}
+
+logger = logging.getLogger(__name__)
+
+
+class NullSink:
+    """Журнал, который ничего не записывает."""
+
+    def write(self, line):
+        pass
+
+    def flush(self):
+        pass
+
+
+class BufferedSink(ABC):
+    """Журнал с буфером в памяти процесса.
+
+    Записи копятся в буфере и сбрасываются одной операцией, когда
+    их набирается `buffer_size` или проходит `flush_interval` секунд.
+    Все операции идут под одной блокировкой, поэтому строки из разных
+    потоков не перемешиваются. Если запись не удалась, строки остаются
+    в буфере до следующего сброса, а ошибка пишется в журнал приложения.
+    """
+
+    def __init__(self, buffer_size=100, flush_interval=5):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+        self.timer = None
+        atexit.register(self.flush)
+
+    def write(self, line):
+        with self.lock:
+            self.buffer.append(line)
+            if (
+                len(self.buffer) >= self.buffer_size
+                or time.monotonic() - self.last_flush >= self.flush_interval
+            ):
+                self._flush()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.flush_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+        try:
+            self.emit(''.join(self.buffer))
+        except Exception:
+            logger.exception(
+                'Не удалось записать журнал кодов, строк в буфере: %d',
+                len(self.buffer),
+            )
+        else:
+            self.buffer.clear()
+
+    @abstractmethod
+    def emit(self, data):
+        """Записывает накопленные строки одной операцией."""
+
+
+class StreamSink(BufferedSink):
+    """Журнал в поток вывода, по умолчанию stdout."""
+
+    def __init__(self, stream=None, **kwargs):
+        super().__init__(**kwargs)
+        self.stream = stream
+
+    def emit(self, data):
+        stream = self.stream or sys.stdout
+        stream.write(data)
+        stream.flush()
+
+
+class RotatingFileSink(BufferedSink):
+    """Журнал в файл с ротацией по размеру и по дате.
+
+    Заполненный или вчерашний файл переименовывается в
+    `<имя>.<дата>` (`<имя>.<дата>.<n>` при повторной ротации за день),
+    хранится не больше `backup_count` старых файлов.
+    """
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backup_count=10,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+    def emit(self, data):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        encoded = data.encode()
+        if self.should_rotate(len(encoded)):
+            self.rotate()
+        with open(self.path, 'ab') as file:
+            file.write(encoded)
+
+    def should_rotate(self, incoming):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if not stat.st_size:
+            return False
+        file_date = datetime.fromtimestamp(stat.st_mtime).date()
+        return (
+            file_date != date.today()
+            or stat.st_size + incoming > self.max_bytes
+        )
+
+    def rotate(self):
+        file_date = datetime.fromtimestamp(os.stat(self.path).st_mtime)
+        target = f'{self.path}.{file_date:%Y-%m-%d}'
+        suffix = 0
+        while os.path.exists(target if not suffix else f'{target}.{suffix}'):
+            suffix += 1
+        os.replace(self.path, target if not suffix else f'{target}.{suffix}')
+        self.remove_old_backups()
+
+    def remove_old_backups(self):
+        directory, name = os.path.split(self.path)
+        backups = sorted(
+            (os.path.join(directory, filename)
+             for filename in os.listdir(directory)
+             if filename.startswith(f'{name}.')),
+            key=os.path.getmtime,
+        )
+        for backup in backups[:max(len(backups) - self.backup_count, 0)]:
+            os.remove(backup)
+
+
+def build_sink(options):
+    """Создает журнал по настройке SINK: file, stdout или disabled."""
+    buffering = {
+        'buffer_size': options['BUFFER_SIZE'],
+        'flush_interval': options['FLUSH_INTERVAL'],
+    }
+    if options['SINK'] == 'file':
+        return RotatingFileSink(
+            options['PATH'],
+            max_bytes=options['MAX_BYTES'],
+            backup_count=options['BACKUP_COUNT'],
+            **buffering,
+        )
+    if options['SINK'] == 'stdout':
+        return StreamSink(**buffering)
+    if options['SINK'] == 'disabled':
+        return NullSink()
+    raise ValueError(f'Неизвестный журнал кодов: {options["SINK"]}')
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_audit_sink():
+    """Возвращает общий для процесса журнал кодов подтверждения."""
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = build_sink(AUDIT_SETTINGS)
+    return _sink
@@ -0,0 +1,158 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .user_cache import user_cache
+from reviews.models import User
+
+AUTH_SETTINGS = {
+    'CACHE_ALIAS': 'default',
+    'VERSION_TIMEOUT': 5,
+    **getattr(settings, 'STATELESS_AUTH', {}),
+}
+ROLE_CLAIM = 'role'
+VERSION_CLAIM = 'ver'
+VERSION_KEY = 'auth:token_version:{}'
+# Версия для удаленных и заблокированных пользователей: с ней не совпадет
+# ни один выданный токен.
+REVOKED = -1
+
+
+def issue_access_token(user):
+    """Выдает токен с данными, достаточными для проверки прав."""
+    token = AccessToken.for_user(user)
+    token['username'] = user.username
+    token['is_superuser'] = user.is_superuser
+    token[ROLE_CLAIM] = user.role
+    token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+def get_cache():
+    return caches[AUTH_SETTINGS['CACHE_ALIAS']]
+
+
+def get_token_version(user_id):
+    """Текущая версия токенов пользователя, из кэша или из БД."""
+    cache = get_cache()
+    key = VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        row = (
+            User.objects.filter(pk=user_id)
+            .values_list('token_version', 'is_active')
+            .first()
+        )
+        version = row[0] if row and row[1] else REVOKED
+        cache.set(key, version, AUTH_SETTINGS['VERSION_TIMEOUT'])
+    return version
+
+
+def forget_token_version(user_id):
+    get_cache().delete(VERSION_KEY.format(user_id))
+
+
+class StatelessUser(TokenUser):
+    """Пользователь, собранный из токена без запроса к БД.
+
+    Умеет отвечать на вопросы о роли, а для записи связей и работы
+    с профилем отдает модель через `as_reference` и `instance`.
+    """
+
+    @classmethod
+    def from_state(cls, token, state):
+        """Пользователь по токену без утверждений и кэшу состояния."""
+        user = cls(token)
+        user.__dict__.update(
+            username=state.username,
+            role=state.role,
+            is_superuser=state.is_superuser,
+        )
+        return user
+
+    @cached_property
+    def role(self):
+        return self.token.get(ROLE_CLAIM, User.Role.USER)
+
+    @property
+    def is_admin(self):
+        return self.is_superuser or self.role == User.Role.ADMIN
+
+    @property
+    def is_moderator(self):
+        return self.role == User.Role.MODERATOR
+
+    def as_reference(self):
+        """Несохраняемая модель с id и именем, подходит для внешних ключей."""
+        return User(
+            pk=self.id,
+            username=self.username,
+            role=self.role,
+            is_superuser=self.is_superuser,
+        )
+
+    @cached_property
+    def instance(self):
+        return User.objects.get(pk=self.id)
+
+
+def get_user_instance(user):
+    """Полная модель пользователя запроса."""
+    if isinstance(user, StatelessUser):
+        return user.instance
+    return user
+
+
+def get_user_reference(user):
+    """Модель пользователя запроса для записи во внешний ключ."""
+    if isinstance(user, StatelessUser):
+        return user.as_reference()
+    return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Аутентификация по токену без загрузки пользователя из БД.
+
+    Роль и имя берутся из утверждений токена. Чтобы смена роли или
+    блокировка отзывала токен, он содержит версию, которая сверяется
+    с кэшированной версией пользователя. Кэш версии сбрасывается при
+    изменении пользователя, но с кэшем в памяти процесса другие процессы
+    видят новую версию только через VERSION_TIMEOUT секунд. Для токенов
+    без этих утверждений роль берется из кэша состояния пользователей
+    процесса.
+    """
+
+    def get_user(self, validated_token):
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            or api_settings.USER_ID_CLAIM not in validated_token
+        ):
+            return super().get_user(validated_token)
+        if (
+            ROLE_CLAIM not in validated_token
+            or VERSION_CLAIM not in validated_token
+        ):
+            return self.get_cached_user(validated_token)
+        user = StatelessUser(validated_token)
+        if validated_token[VERSION_CLAIM] != get_token_version(user.id):
+            raise AuthenticationFailed(
+                'Токен отозван', code='token_revoked'
+            )
+        return user
+
+    def get_cached_user(self, validated_token):
+        state = user_cache.get(validated_token[api_settings.USER_ID_CLAIM])
+        if state is None:
+            raise AuthenticationFailed(
+                'Пользователь не найден', code='user_not_found'
+            )
+        if not state.is_active:
+            raise AuthenticationFailed(
+                'Пользователь заблокирован', code='user_inactive'
+            )
+        return StatelessUser.from_state(validated_token, state)
@@ -0,0 +1,198 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.renderers import BrowsableAPIRenderer
+
+from .compression import compress_variants
+from .process_stats import register_stats
+
+CACHE_SETTINGS = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+    'ENABLED': True,
+    **getattr(settings, 'API_RESPONSE_CACHE', {}),
+}
+GENERATION_KEY = 'api:generation:{}'
+RESPONSE_KEY = 'api:response:{}:{}'
+CACHE_HEADER = 'X-Cache'
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[CACHE_SETTINGS['ALIAS']]
+
+
+def new_generation():
+    """Начальное значение счетчика.
+
+    Берется из времени, чтобы после вытеснения счетчика из кэша
+    не совпасть со значением, под которым лежат старые ответы.
+    """
+    return time.time_ns()
+
+
+def get_generations(labels):
+    """Возвращает текущие поколения моделей, создавая недостающие."""
+    cache = get_cache()
+    keys = {label: GENERATION_KEY.format(label) for label in labels}
+    found = cache.get_many(keys.values())
+    generations = {}
+    for label, key in keys.items():
+        if key not in found:
+            cache.add(key, new_generation(), timeout=None)
+            found[key] = cache.get(key)
+        generations[label] = found[key]
+    return generations
+
+
+def bump_generation(label):
+    """Делает недоступными все ответы, зависящие от модели.
+
+    Поколение меняется после фиксации транзакции, иначе параллельный
+    запрос мог бы закэшировать еще не измененные данные под новым ключом.
+    """
+    transaction.on_commit(lambda: _bump_generation(label))
+
+
+def _bump_generation(label):
+    cache = get_cache()
+    key = GENERATION_KEY.format(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, new_generation(), timeout=None)
+
+
+def record(event):
+    with _stats_lock:
+        _stats[event] += 1
+
+
+def cache_stats():
+    """Возвращает счетчики попаданий и промахов текущего процесса."""
+    with _stats_lock:
+        hits, misses = _stats['hit'], _stats['miss']
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else 0.0,
+    }
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+register_stats('response_cache', cache_stats)
+
+
+@contextmanager
+def response_cache_enabled(enabled):
+    """Включает или выключает кэш ответов на время блока."""
+    previous = CACHE_SETTINGS['ENABLED']
+    CACHE_SETTINGS['ENABLED'] = enabled
+    try:
+        yield
+    finally:
+        CACHE_SETTINGS['ENABLED'] = previous
+
+
+class CachedResponseMixin:
+    """Кэширует ответы list/retrieve с учетом поколений моделей.
+
+    Ключ строится из полного URL с параметрами запроса, заголовка
+    Accept и поколений моделей из `cache_dependencies`. Изменение
+    любой из них повышает поколение, и старые записи больше не читаются.
+    """
+
+    cache_dependencies = ()
+    cached_actions = ('list', 'retrieve')
+
+    def get_response_cache_key(self, request):
+        generations = get_generations(self.cache_dependencies)
+        parts = [
+            request.build_absolute_uri(),
+            request.META.get('HTTP_ACCEPT', ''),
+            *(f'{label}={generations[label]}'
+              for label in self.cache_dependencies),
+        ]
+        digest = hashlib.md5(
+            '\n'.join(parts).encode(), usedforsecurity=False
+        ).hexdigest()
+        return RESPONSE_KEY.format(self.basename, digest)
+
+    def is_response_cacheable(self, request):
+        # Страница Browsable API зависит от пользователя: в ней формы
+        # по его правам и CSRF-токен, поэтому кэшируются только данные.
+        return (
+            CACHE_SETTINGS['ENABLED']
+            and request.method == 'GET'
+            and self.action in self.cached_actions
+            and not isinstance(
+                getattr(request, 'accepted_renderer', None),
+                BrowsableAPIRenderer,
+            )
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        entry = get_cache().get(key)
+        if entry is not None:
+            record('hit')
+            response = HttpResponse(
+                entry['content'], content_type=entry['content_type']
+            )
+            response.compressed_variants = entry.get('variants')
+            response[CACHE_HEADER] = 'HIT'
+            return response
+        record('miss')
+        response = handler(request, *args, **kwargs)
+        response.response_cache_key = key
+        return response
+
+    def initial(self, request, *args, **kwargs):
+        """Оборачивает обработчик после проверки прав доступа."""
+        super().initial(request, *args, **kwargs)
+        if self.is_response_cacheable(request):
+            method = request.method.lower()
+            self.wrap_handler(method, self.cached_response)
+
+    def wrap_handler(self, method, wrapper):
+        handler = getattr(self, method)
+        setattr(self, method, partial(wrapper, handler))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        key = getattr(response, 'response_cache_key', None)
+        if key is not None and response.status_code == 200:
+            response.render()
+            # Сжатые варианты хранятся вместе с телом, чтобы не сжимать
+            # ответ заново при каждом попадании.
+            response.compressed_variants = compress_variants(
+                response.content
+            )
+            get_cache().set(
+                key,
+                {
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'variants': response.compressed_variants,
+                },
+                timeout=CACHE_SETTINGS['TIMEOUT'],
+            )
+            response[CACHE_HEADER] = 'MISS'
+        return response
@@ -0,0 +1,187 @@
+import gzip
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from .process_stats import register_stats
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_SETTINGS = {
+    'MIN_SIZE': 1024,
+    'PATH_PREFIX': '/api/',
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,
+    'ZSTD_LEVEL': 3,
+    **getattr(settings, 'API_COMPRESSION', {}),
+}
+
+ACCEPT_ENCODING_RE = re.compile(r'^\s*([\w*-]+)\s*(?:;\s*q=([\d.]+))?')
+
+
+def compress_gzip(content):
+    # mtime=0 делает результат детерминированным, как в GZipMiddleware.
+    return gzip.compress(
+        content, compresslevel=COMPRESSION_SETTINGS['GZIP_LEVEL'], mtime=0
+    )
+
+
+def compress_brotli(content):
+    return brotli.compress(
+        content, quality=COMPRESSION_SETTINGS['BROTLI_QUALITY']
+    )
+
+
+def compress_zstd(content):
+    return zstandard.ZstdCompressor(
+        level=COMPRESSION_SETTINGS['ZSTD_LEVEL']
+    ).compress(content)
+
+
+# Кодировки в порядке предпочтения сервера.
+CODECS = {
+    **({'br': compress_brotli} if brotli else {}),
+    **({'zstd': compress_zstd} if zstandard else {}),
+    'gzip': compress_gzip,
+}
+
+_stats = defaultdict(lambda: {
+    'responses': 0, 'original_bytes': 0, 'compressed_bytes': 0,
+})
+_stats_lock = threading.Lock()
+
+
+def parse_accept_encoding(header):
+    """Возвращает словарь кодировка -> вес из Accept-Encoding."""
+    weights = {}
+    for item in header.split(','):
+        match = ACCEPT_ENCODING_RE.match(item)
+        if not match:
+            continue
+        try:
+            weight = float(match[2]) if match[2] else 1.0
+        except ValueError:
+            continue
+        weights[match[1].lower()] = weight
+    return weights
+
+
+def choose_encoding(header):
+    """Выбирает кодировку с наибольшим весом среди доступных."""
+    weights = parse_accept_encoding(header or '')
+    default = weights.get('*', 0)
+    candidates = [
+        (weights.get(name, default), -position, name)
+        for position, name in enumerate(CODECS)
+    ]
+    weight, _, name = max(candidates)
+    return name if weight > 0 else None
+
+
+def compress_variants(content):
+    """Сжимает тело всеми доступными кодировками.
+
+    Возвращает только варианты, которые меньше исходного тела.
+    """
+    if len(content) < COMPRESSION_SETTINGS['MIN_SIZE']:
+        return {}
+    variants = {}
+    for name, compress in CODECS.items():
+        compressed = compress(content)
+        if len(compressed) < len(content):
+            variants[name] = compressed
+    return variants
+
+
+def record(endpoint, original, compressed):
+    with _stats_lock:
+        stats = _stats[endpoint]
+        stats['responses'] += 1
+        stats['original_bytes'] += original
+        stats['compressed_bytes'] += compressed
+
+
+def compression_stats():
+    """Сэкономленные байты по эндпоинтам в текущем процессе."""
+    with _stats_lock:
+        return {
+            endpoint: {
+                **stats,
+                'saved_bytes': (
+                    stats['original_bytes'] - stats['compressed_bytes']
+                ),
+            }
+            for endpoint, stats in _stats.items()
+        }
+
+
+def reset_compression_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+register_stats('compression', compression_stats)
+
+
+class CompressionMiddleware:
+    """Сжимает ответы API по заголовку Accept-Encoding.
+
+    Сжимаются ответы не меньше MIN_SIZE байт. Если кэш ответов уже
+    хранит сжатые варианты (`response.compressed_variants`), они
+    отдаются без повторного сжатия.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        prefix = COMPRESSION_SETTINGS['PATH_PREFIX']
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not request.path.startswith(prefix)
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        content = response.content
+        if len(content) < COMPRESSION_SETTINGS['MIN_SIZE']:
+            return response
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if encoding is None:
+            return response
+
+        variants = getattr(response, 'compressed_variants', None)
+        if variants is not None:
+            compressed = variants.get(encoding)
+        else:
+            compressed = CODECS[encoding](content)
+            if len(compressed) >= len(content):
+                compressed = None
+        if compressed is None:
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # Тело изменилось, поэтому сильный ETag становится слабым.
+            response['ETag'] = f'W/{etag}'
+        match = request.resolver_match
+        record(
+            match.view_name if match else request.path,
+            len(content), len(compressed),
+        )
+        return response
@@ -0,0 +1,96 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_generations
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 на условные GET-запросы до запуска сериализатора.
+
+    Представление описывает состояние ответа методом
+    `get_conditional_state`: дешевыми значениями вроде максимальной
+    даты изменения и количества строк. Из них строится сильный ETag,
+    а дата используется как Last-Modified.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+    conditional_dependencies = ()
+
+    def get_conditional_state(self, request):
+        """Возвращает (части ETag, дата изменения) или None."""
+        return None
+
+    def get_list_state(self, queryset, request):
+        """Состояние списка: последнее изменение и число строк."""
+        state = queryset.order_by().aggregate(
+            last_modified=Max('updated_at'), total=Count('pk')
+        )
+        if not state['total']:
+            return None
+        return (
+            (state['last_modified'].isoformat(), state['total']),
+            state['last_modified'],
+        )
+
+    def get_object_state(self, queryset, request):
+        """Состояние одного объекта по его дате изменения."""
+        last_modified = queryset.values_list('updated_at', flat=True).first()
+        if last_modified is None:
+            return None
+        return (last_modified.isoformat(),), last_modified
+
+    def build_etag(self, request, parts):
+        generations = get_generations(self.conditional_dependencies)
+        source = '\n'.join((
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            *map(str, parts),
+            *(f'{label}={generations[label]}'
+              for label in self.conditional_dependencies),
+        ))
+        return quote_etag(
+            hashlib.md5(source.encode(), usedforsecurity=False).hexdigest()
+        )
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional_headers = None
+        if (
+            request.method != 'GET'
+            or self.action not in self.conditional_actions
+        ):
+            return
+        try:
+            state = self.get_conditional_state(request)
+        except (TypeError, ValueError):
+            # Некорректный id в URL: ошибку вернет обычный обработчик.
+            return
+        if state is None:
+            return
+        parts, last_modified = state
+        etag = self.build_etag(request, parts)
+        timestamp = int(last_modified.timestamp())
+        self.conditional_headers = {
+            'ETag': etag, 'Last-Modified': http_date(timestamp),
+        }
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if not_modified is not None:
+            setattr(
+                self, request.method.lower(),
+                lambda *args, **kwargs: not_modified
+            )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        headers = getattr(self, 'conditional_headers', None)
+        if headers and response.status_code in (200, 304):
+            for header, value in headers.items():
+                response.headers.setdefault(header, value)
+        return response
@@ -1,35 +1,28 @@
-import os
-
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.conf import settings
 from django.utils import timezone
 
+from .audit import get_audit_sink
+from reviews.outbox import enqueue_email
+
 
 def send_confirmation_code(user):
     """Отправляет код подтверждения пользователю.
 
-    Код выводится в консоль и сохраняется в файл.
+    Письмо ставится в очередь отправки, код записывается в журнал.
     """
     confirmation_code = default_token_generator.make_token(user)
 
-    # Отправляем код через email (сохраняется в mail.outbox).
-
-    send_mail(
+    enqueue_email(
         'Код подтверждения',
         f'Ваш код подтверждения: {confirmation_code}',
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        fail_silently=True,
+        user.email,
     )
 
-    # Сохраняем код в файл email/confirmation_codes.txt.
-    email_dir = os.path.join(os.path.dirname(__file__), 'email')
-    os.makedirs(email_dir, exist_ok=True)
-    file_path = os.path.join(email_dir, 'confirmation_codes.txt')
+    # Журнал буферизуется, запись на диск идет пакетами.
     current_time = timezone.now().strftime('%Y-%m-%d %H:%M:%S %Z')
-    with open(file_path, 'a') as f:
-        f.write(f'[{current_time}] User: {user.username}, '
-                f'Email: {user.email}, Code: {confirmation_code}\n')
+    get_audit_sink().write(
+        f'[{current_time}] User: {user.username}, '
+        f'Email: {user.email}, Code: {confirmation_code}\n'
+    )
 
     return confirmation_code
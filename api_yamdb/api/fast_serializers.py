@@ -0,0 +1,167 @@
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.db.models.query import ModelIterable, QuerySet
+from rest_framework import serializers
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from reviews.models import Genre, Title
+
+FAST_SERIALIZERS_SETTINGS = {
+    'ENABLED': True,
+    **getattr(settings, 'FAST_SERIALIZERS', {}),
+}
+
+# Поле DRF используется только ради формата даты, чтобы вывод совпадал
+# с ModelSerializer: часовой пояс, DATETIME_FORMAT и суффикс Z.
+DATETIME_FIELD = serializers.DateTimeField(read_only=True)
+
+
+class ValuesSerializer(ABC):
+    """Сериализатор чтения, который строит ответ из строк values_list.
+
+    Повторяет интерфейс сериализатора DRF, которым пользуются списки:
+    конструктор с `many` и `context` и свойство `data`. Столбцы для
+    выборки перечислены в `values`, а порядок ключей ответа задается
+    в `to_representation` и совпадает с обычным сериализатором.
+    """
+
+    values = ()
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @classmethod
+    def prepare(cls, queryset):
+        """Превращает queryset моделей в queryset строк для сериализатора."""
+        return queryset.prefetch_related(None).values_list(
+            *cls.values, named=True
+        )
+
+    def get_rows(self):
+        rows = self.instance
+        if isinstance(rows, QuerySet) and rows._iterable_class is (
+            ModelIterable
+        ):
+            rows = self.prepare(rows)
+        return list(rows) if self.many else [rows]
+
+    def load_related(self, rows):
+        """Загружает связанные данные для всех строк одним запросом."""
+        return None
+
+    @abstractmethod
+    def to_representation(self, row, related):
+        """Словарь ответа для одной строки."""
+
+    @property
+    def data(self):
+        rows = self.get_rows()
+        related = self.load_related(rows)
+        if self.many:
+            return ReturnList(
+                [self.to_representation(row, related) for row in rows],
+                serializer=self,
+            )
+        return ReturnDict(
+            self.to_representation(rows[0], related), serializer=self
+        )
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    """Быстрая замена TitleReadSerializer для списков."""
+
+    values = (
+        'id', 'name', 'year', 'description', 'rating',
+        'category__name', 'category__slug',
+    )
+
+    def load_related(self, rows):
+        genres = {}
+        ordering = [f'genre__{field}' for field in Genre._meta.ordering]
+        through = (
+            Title.genre.through.objects
+            .filter(title_id__in=[row.id for row in rows])
+            .order_by(*ordering)
+            .values_list('title_id', 'genre__name', 'genre__slug')
+        )
+        for title_id, name, slug in through:
+            genres.setdefault(title_id, []).append(
+                {'name': name, 'slug': slug}
+            )
+        return genres
+
+    def to_representation(self, row, genres):
+        return {
+            'id': row.id,
+            'name': row.name,
+            'year': row.year,
+            'description': row.description,
+            'rating': None if row.rating is None else int(row.rating),
+            'genre': genres.get(row.id, []),
+            'category': None if row.category__slug is None else {
+                'name': row.category__name, 'slug': row.category__slug,
+            },
+        }
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """Быстрая замена ReviewSerializer для списков."""
+
+    values = (
+        'id', 'title_id', 'text', 'author__username', 'score', 'pub_date'
+    )
+
+    def to_representation(self, row, related):
+        return {
+            'id': row.id,
+            'title': row.title_id,
+            'text': row.text,
+            'author': row.author__username,
+            'score': row.score,
+            'pub_date': DATETIME_FIELD.to_representation(row.pub_date),
+        }
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """Быстрая замена CommentSerializer для списков."""
+
+    values = ('id', 'review_id', 'text', 'author__username', 'pub_date')
+
+    def to_representation(self, row, related):
+        return {
+            'id': row.id,
+            'review': row.review_id,
+            'text': row.text,
+            'author': row.author__username,
+            'pub_date': DATETIME_FIELD.to_representation(row.pub_date),
+        }
+
+
+class FastListMixin:
+    """Отдает списки через сериализатор из `fast_list_serializer_class`.
+
+    Страница выбирается из queryset строк, поэтому модели для списка
+    не создаются. Выключается настройкой FAST_SERIALIZERS['ENABLED'].
+    """
+
+    fast_list_serializer_class = None
+
+    def use_fast_list(self):
+        return (
+            self.action == 'list'
+            and self.fast_list_serializer_class is not None
+            and FAST_SERIALIZERS_SETTINGS['ENABLED']
+        )
+
+    def get_serializer_class(self):
+        if self.use_fast_list():
+            return self.fast_list_serializer_class
+        return super().get_serializer_class()
+
+    def paginate_queryset(self, queryset):
+        if self.use_fast_list():
+            queryset = self.fast_list_serializer_class.prepare(queryset)
+        return super().paginate_queryset(queryset)
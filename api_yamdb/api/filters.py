@@ -1,6 +1,8 @@
 from django_filters.rest_framework import FilterSet, CharFilter
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleFilter(FilterSet):
@@ -13,3 +15,31 @@ class TitleFilter(FilterSet):
     class Meta:
         model = Title
         fields = ('genre', 'category', 'name', 'year')
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск произведений по параметру `search`.
+
+    Ищет по названию, описанию и текстам отзывов через поисковый
+    индекс и сортирует выдачу по релевантности. Явный параметр
+    `ordering` заменяет сортировку по релевантности.
+    """
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_titles(queryset, query).order_by(
+            '-search_rank', *queryset.query.order_by, 'pk'
+        )
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Поиск по названию, описанию и отзывам.',
+            'schema': {'type': 'string'},
+        }]
@@ -0,0 +1,83 @@
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand
+
+from api.process_stats import load_snapshots
+
+
+def hit_rate(counters):
+    total = counters['hits'] + counters['misses']
+    return counters['hits'] / total if total else 0.0
+
+
+class Command(BaseCommand):
+    """Команда отчета о кэшах и сжатии ответов по всем процессам."""
+
+    help = (
+        'Выводит попадания в кэш ответов и кэш пользователей и '
+        'сэкономленные сжатием байты по снимкам всех процессов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Сколько эндпоинтов вывести в отчете о сжатии',
+        )
+
+    def handle(self, *args, **options):
+        """Складывает счетчики процессов и печатает сводку."""
+        self.print_cache(
+            'Кэш ответов', load_snapshots('response_cache'), ()
+        )
+        self.print_cache(
+            'Кэш пользователей', load_snapshots('user_cache'),
+            ('size', 'max_size'),
+        )
+        self.print_compression(load_snapshots('compression'), options)
+
+    def print_cache(self, title, snapshots, extra):
+        if not snapshots:
+            self.stdout.write(f'{title}: статистика пока не собрана.')
+            return
+        counters = Counter()
+        for snapshot in snapshots:
+            counters.update({
+                name: snapshot[name] for name in ('hits', 'misses', *extra)
+            })
+        line = (
+            f'{title}: процессов {len(snapshots)}, '
+            f'попаданий {counters["hits"]}, промахов {counters["misses"]}, '
+            f'доля попаданий {hit_rate(counters):.1%}'
+        )
+        if extra:
+            line += (
+                f', записей {counters["size"]} из {counters["max_size"]}'
+            )
+        self.stdout.write(line)
+
+    def print_compression(self, snapshots, options):
+        endpoints = defaultdict(Counter)
+        for snapshot in snapshots:
+            for endpoint, stats in snapshot.items():
+                endpoints[endpoint].update(stats)
+        if not endpoints:
+            self.stdout.write('Сжатие: статистика пока не собрана.')
+            return
+        top = sorted(
+            endpoints.items(),
+            key=lambda item: item[1]['saved_bytes'],
+            reverse=True,
+        )[:options['limit']]
+        self.stdout.write(
+            f'{"эндпоинт":<40} {"ответов":>8} {"исходно, Б":>12} '
+            f'{"сжато, Б":>12} {"экономия, Б":>12}'
+        )
+        for endpoint, stats in top:
+            self.stdout.write(
+                f'{endpoint:<40} {stats["responses"]:>8} '
+                f'{stats["original_bytes"]:>12} '
+                f'{stats["compressed_bytes"]:>12} '
+                f'{stats["saved_bytes"]:>12}'
+            )
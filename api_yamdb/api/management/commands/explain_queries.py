@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.query_plans import collect_query_plans
+
+
+class Command(BaseCommand):
+    """Команда проверки планов запросов API."""
+
+    help = (
+        'Выполняет канонические запросы каждого ViewSet, печатает их '
+        'EXPLAIN и завершается ошибкой при полном чтении таблиц'
+    )
+
+    def handle(self, *args, **options):
+        """Печатает планы и ищет полное чтение таблиц без индекса."""
+        plans = collect_query_plans()
+        failures = 0
+        for query in plans:
+            if not query.full_scans and options['verbosity'] < 2:
+                continue
+            if query.full_scans:
+                failures += 1
+                self.stdout.write(self.style.ERROR(
+                    f'{query.url}: полное чтение '
+                    f'{", ".join(query.full_scans)}'
+                ))
+            else:
+                self.stdout.write(query.url)
+            self.stdout.write(f'  {query.sql}')
+            for line in query.plan:
+                self.stdout.write(f'    {line}')
+        if failures:
+            raise CommandError(
+                f'Запросов с полным чтением таблиц: {failures}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено запросов: {len(plans)}, полного чтения нет.'
+        ))
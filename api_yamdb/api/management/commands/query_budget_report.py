@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+
+from api.query_budget import collect_snapshots
+
+ORDERINGS = (
+    'db_ms_p95', 'queries_p95', 'total_ms_p95', 'over_budget', 'requests',
+)
+
+
+class Command(BaseCommand):
+    """Команда отчета о самых дорогих эндпоинтах API."""
+
+    help = (
+        'Выводит эндпоинты с наибольшим числом SQL-запросов и временем БД '
+        'по статистике QueryBudgetMiddleware'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--order-by',
+            choices=ORDERINGS,
+            default='db_ms_p95',
+            help='Показатель для сортировки, по умолчанию db_ms_p95',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Сколько эндпоинтов вывести',
+        )
+
+    def handle(self, *args, **options):
+        """Печатает перцентили по эндпоинтам, начиная с худших."""
+        stats = collect_snapshots()
+        if not stats:
+            self.stdout.write('Статистика запросов пока не собрана.')
+            return
+        order_by = options['order_by']
+        top = sorted(
+            stats.items(), key=lambda item: item[1][order_by], reverse=True
+        )[:options['limit']]
+        self.stdout.write(
+            f'{"эндпоинт":<40} {"запросов":>8} '
+            f'{"SQL p50/p95/p99":>16} {"БД мс p50/p95/p99":>22} '
+            f'{"ответ мс p95":>12} {"сверх бюджета":>13}'
+        )
+        for endpoint, summary in top:
+            queries = '/'.join(
+                str(summary[f'queries_p{rank}']) for rank in (50, 95, 99)
+            )
+            db_ms = '/'.join(
+                f'{summary[f"db_ms_p{rank}"]:.1f}' for rank in (50, 95, 99)
+            )
+            self.stdout.write(
+                f'{endpoint:<40} {summary["requests"]:>8} '
+                f'{queries:>16} {db_ms:>22} '
+                f'{summary["total_ms_p95"]:>12.1f} '
+                f'{summary["over_budget"]:>13}'
+            )
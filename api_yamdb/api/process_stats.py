@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from contextlib import suppress
+
+from django.conf import settings
+
+PROCESS_STATS_SETTINGS = {
+    'DIR': os.path.join(os.path.dirname(__file__), 'stats'),
+    # Снимки остановленных процессов со временем исчезают из отчетов.
+    'TIMEOUT': 24 * 60 * 60,
+    # Как часто ProcessStatsMiddleware сохраняет счетчики процесса.
+    'FLUSH_INTERVAL': 10,
+    **getattr(settings, 'PROCESS_STATS', {}),
+}
+
+logger = logging.getLogger(__name__)
+
+# Счетчики модулей, которые ProcessStatsMiddleware сохраняет в файлы.
+_collectors = {}
+
+
+def process_key():
+    """Имя текущего процесса, после fork у воркера оно свое."""
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+def get_directory(kind):
+    return os.path.join(PROCESS_STATS_SETTINGS['DIR'], kind)
+
+
+def save_snapshot(kind, data):
+    """Записывает снимок статистики процесса в его файл.
+
+    Файл заменяется атомарно через os.replace, поэтому отчет не читает
+    недописанный снимок, а процессы не перезаписывают чужие файлы.
+    """
+    directory = get_directory(kind)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+        os.replace(
+            temporary, os.path.join(directory, f'{process_key()}.json')
+        )
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(temporary)
+        raise
+
+
+def load_snapshots(kind):
+    """Снимки всех процессов, обновленные не раньше TIMEOUT секунд назад."""
+    directory = get_directory(kind)
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return []
+    deadline = time.time() - PROCESS_STATS_SETTINGS['TIMEOUT']
+    snapshots = []
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < deadline:
+                continue
+            with open(path, encoding='utf-8') as file:
+                snapshots.append(json.load(file))
+        except (OSError, ValueError):
+            # Файл удален между чтением каталога и открытием.
+            continue
+    return snapshots
+
+
+def clear_snapshots(kind):
+    shutil.rmtree(get_directory(kind), ignore_errors=True)
+
+
+def register_stats(kind, collect):
+    """Регистрирует функцию, возвращающую счетчики процесса."""
+    _collectors[kind] = collect
+
+
+def save_registered_stats():
+    """Сохраняет счетчики всех зарегистрированных модулей."""
+    for kind, collect in _collectors.items():
+        try:
+            save_snapshot(kind, collect())
+        except OSError:
+            logger.exception('Не удалось сохранить статистику %s', kind)
+
+
+class ProcessStatsMiddleware:
+    """Раз в FLUSH_INTERVAL секунд сохраняет счетчики процесса в файлы.
+
+    Так команда api_stats_report видит статистику всех процессов
+    сервера, а не только своего.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        now = time.monotonic()
+        interval = PROCESS_STATS_SETTINGS['FLUSH_INTERVAL']
+        with self.lock:
+            if now - self.last_flush < interval:
+                return response
+            self.last_flush = now
+        save_registered_stats()
+        return response
@@ -0,0 +1,237 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.dispatch import Signal
+
+from .process_stats import clear_snapshots, load_snapshots, save_snapshot
+
+QUERY_BUDGET_SETTINGS = {
+    'ENABLED': True,
+    'PATH_PREFIX': '/api/',
+    # Сколько последних запросов каждого эндпоинта хранится для перцентилей.
+    'WINDOW': 500,
+    # Бюджеты по ключу «view_name:action», например
+    # {'titles-list:list': {'QUERIES': 5, 'DB_TIME_MS': 50}}.
+    'BUDGETS': {},
+    'DEFAULT_BUDGET': {'QUERIES': None, 'DB_TIME_MS': None},
+    'SERVER_TIMING': True,
+    # Раз в FLUSH_INTERVAL секунд снимок процесса сохраняется в файл
+    # для команды отчета (api.process_stats).
+    'FLUSH_INTERVAL': 10,
+    **getattr(settings, 'QUERY_BUDGET', {}),
+}
+STATS_KIND = 'query_budget'
+PERCENTILES = (50, 95, 99)
+
+logger = logging.getLogger(__name__)
+
+# Отправляется, когда запрос превысил бюджет эндпоинта.
+query_budget_exceeded = Signal()
+
+
+def percentile(values, rank):
+    """Перцентиль по ближайшему рангу для отсортированного списка."""
+    if not values:
+        return None
+    index = max(0, -(-rank * len(values) // 100) - 1)
+    return values[index]
+
+
+def summarize(samples, over_budget=0):
+    """Сводка по списку замеров (число запросов, время БД, время ответа)."""
+    summary = {'requests': len(samples), 'over_budget': over_budget}
+    for position, name in enumerate(('queries', 'db_ms', 'total_ms')):
+        values = sorted(sample[position] for sample in samples)
+        for rank in PERCENTILES:
+            summary[f'{name}_p{rank}'] = percentile(values, rank)
+    return summary
+
+
+def get_budget(endpoint):
+    return {
+        **QUERY_BUDGET_SETTINGS['DEFAULT_BUDGET'],
+        **QUERY_BUDGET_SETTINGS['BUDGETS'].get(endpoint, {}),
+    }
+
+
+class QueryStats:
+    """Скользящие замеры запросов к БД по эндпоинтам в памяти процесса.
+
+    Для каждого эндпоинта хранятся последние `window` замеров, из них
+    считаются p50, p95 и p99. Раз в `flush_interval` секунд снимок
+    сохраняется в файл этого процесса, чтобы команда
+    query_budget_report могла собрать статистику всех процессов.
+    """
+
+    def __init__(self, window=500, flush_interval=10):
+        self.window = window
+        self.flush_interval = flush_interval
+        self.samples = defaultdict(lambda: deque(maxlen=self.window))
+        self.over_budget = defaultdict(int)
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+        self.pid = os.getpid()
+
+    def _check_fork(self):
+        """Сбрасывает замеры, унаследованные от родителя."""
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.samples.clear()
+            self.over_budget.clear()
+
+    def record(self, endpoint, queries, db_ms, total_ms, exceeded):
+        with self.lock:
+            self._check_fork()
+            self.samples[endpoint].append((queries, db_ms, total_ms))
+            if exceeded:
+                self.over_budget[endpoint] += 1
+            if time.monotonic() - self.last_flush < self.flush_interval:
+                return
+            self.last_flush = time.monotonic()
+            snapshot = self._snapshot()
+        self.save(snapshot)
+
+    def _snapshot(self):
+        return {
+            endpoint: {
+                'samples': list(samples),
+                'over_budget': self.over_budget[endpoint],
+            }
+            for endpoint, samples in self.samples.items()
+        }
+
+    def snapshot(self):
+        with self.lock:
+            self._check_fork()
+            return self._snapshot()
+
+    def save(self, snapshot=None):
+        """Сохраняет снимок процесса в его файл статистики."""
+        if snapshot is None:
+            snapshot = self.snapshot()
+        try:
+            save_snapshot(STATS_KIND, snapshot)
+        except OSError:
+            logger.exception('Не удалось сохранить статистику запросов')
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+            self.over_budget.clear()
+
+
+query_stats = QueryStats(
+    window=QUERY_BUDGET_SETTINGS['WINDOW'],
+    flush_interval=QUERY_BUDGET_SETTINGS['FLUSH_INTERVAL'],
+)
+
+
+def collect_snapshots():
+    """Объединяет сохраненные снимки всех процессов."""
+    merged = defaultdict(lambda: {'samples': [], 'over_budget': 0})
+    for snapshot in load_snapshots(STATS_KIND):
+        for endpoint, data in snapshot.items():
+            merged[endpoint]['samples'].extend(data['samples'])
+            merged[endpoint]['over_budget'] += data['over_budget']
+    return {
+        endpoint: summarize(data['samples'], data['over_budget'])
+        for endpoint, data in merged.items()
+    }
+
+
+def reset_query_stats():
+    """Очищает статистику процесса и сохраненные снимки."""
+    query_stats.clear()
+    clear_snapshots(STATS_KIND)
+
+
+class QueryCounter:
+    """Обертка execute_wrapper, которая считает запросы и их время."""
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.queries += 1
+
+
+def get_endpoint(request):
+    """Ключ эндпоинта: имя маршрута DRF и действие ViewSet.
+
+    Действие берется из маршрута, поэтому ответы из кэша попадают
+    в тот же эндпоинт, что и обычные.
+    """
+    method = request.method.lower()
+    match = request.resolver_match
+    if match is None:
+        return f'{request.path}:{method}'
+    actions = getattr(match.func, 'actions', None) or {}
+    return f'{match.view_name}:{actions.get(method, method)}'
+
+
+class QueryBudgetMiddleware:
+    """Считает SQL-запросы и время БД для каждого запроса к API.
+
+    Добавляет заголовок Server-Timing, копит перцентили по эндпоинтам
+    и сообщает о превышении бюджетов из QUERY_BUDGET['BUDGETS']
+    сигналом `query_budget_exceeded` и записью в журнал.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (
+            not QUERY_BUDGET_SETTINGS['ENABLED']
+            or not request.path.startswith(
+                QUERY_BUDGET_SETTINGS['PATH_PREFIX']
+            )
+        ):
+            return self.get_response(request)
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = counter.duration * 1000
+
+        endpoint = get_endpoint(request)
+        budget = get_budget(endpoint)
+        exceeded = (
+            budget['QUERIES'] is not None
+            and counter.queries > budget['QUERIES']
+        ) or (
+            budget['DB_TIME_MS'] is not None and db_ms > budget['DB_TIME_MS']
+        )
+        query_stats.record(
+            endpoint, counter.queries, db_ms, total_ms, exceeded
+        )
+        if exceeded:
+            logger.warning(
+                'Бюджет эндпоинта %s превышен: %d запросов, %.1f мс БД',
+                endpoint, counter.queries, db_ms,
+            )
+            query_budget_exceeded.send(
+                sender=self.__class__, request=request, endpoint=endpoint,
+                queries=counter.queries, db_ms=db_ms, budget=budget,
+            )
+        if QUERY_BUDGET_SETTINGS['SERVER_TIMING']:
+            response['Server-Timing'] = (
+                f'db;dur={db_ms:.1f};desc="{counter.queries} queries", '
+                f'app;dur={total_ms:.1f}'
+            )
+        return response
@@ -0,0 +1,149 @@
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.test import Client
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from .authentication import issue_access_token
+from .cache import response_cache_enabled
+
+# Канонические запросы каждого ViewSet: списки с фильтрами и сортировками,
+# курсорная пагинация и отдельные объекты. Поиск SearchFilter по
+# категориям, жанрам и пользователям (icontains) не входит: он всегда
+# читает таблицу целиком.
+CANONICAL_REQUESTS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/?pagination=cursor',
+    '/api/v1/titles/?year={year}',
+    '/api/v1/titles/?name={title_name}',
+    '/api/v1/titles/?category={category}',
+    '/api/v1/titles/?genre={genre}',
+    '/api/v1/titles/?ordering=-rating',
+    '/api/v1/titles/?search={title_name}',
+    '/api/v1/titles/{title}/',
+    '/api/v1/categories/',
+    '/api/v1/genres/',
+    '/api/v1/titles/{title}/reviews/',
+    '/api/v1/titles/{title}/reviews/?pagination=cursor',
+    '/api/v1/titles/{title}/reviews/{review}/',
+    '/api/v1/titles/{title}/reviews/{review}/comments/',
+    '/api/v1/titles/{title}/reviews/{review}/comments/?pagination=cursor',
+    '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/',
+    '/api/v1/users/',
+    '/api/v1/users/{username}/',
+    '/api/v1/users/me/',
+)
+
+# SQLite: «SCAN table» без индекса, для старых версий «SCAN TABLE table».
+SQLITE_FULL_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+POSTGRES_FULL_SCAN_RE = re.compile(r'Seq Scan on (\w+)')
+
+QueryPlan = namedtuple('QueryPlan', ('url', 'sql', 'plan', 'full_scans'))
+
+
+def seed_objects():
+    """Создает по одному объекту каждой модели для канонических запросов."""
+    category = Category.objects.create(name='explain', slug='explain-c')
+    genre = Genre.objects.create(name='explain', slug='explain-g')
+    title = Title.objects.create(
+        name='explain', year=2000, category=category, description='explain'
+    )
+    title.genre.add(genre)
+    admin = User.objects.create(
+        username='explain-admin', email='explain@yamdb.fake',
+        role=User.Role.ADMIN,
+    )
+    review = Review.objects.create(
+        title=title, author=admin, text='explain', score=5
+    )
+    comment = Comment.objects.create(
+        review=review, author=admin, text='explain'
+    )
+    return admin, {
+        'year': title.year, 'title_name': title.name, 'title': title.pk,
+        'category': category.slug, 'genre': genre.slug,
+        'review': review.pk, 'comment': comment.pk,
+        'username': admin.username,
+    }
+
+
+@contextmanager
+def capture_selects():
+    """Собирает SQL и параметры всех SELECT внутри блока."""
+    queries = []
+
+    def wrapper(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith('SELECT'):
+            queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield queries
+
+
+def explain(sql, params):
+    """Возвращает строки плана запроса для текущей БД."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN {sql}', params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def is_primary_key_walk(table, sql, plan):
+    """Проверяет, что SQLite обходит таблицу по первичному ключу до LIMIT.
+
+    Такой обход SQLite показывает как «SCAN table», хотя это чтение
+    индекса rowid, которое останавливается на границе страницы.
+    """
+    return (
+        re.search(rf'ORDER BY "{table}"\."id" (?:ASC|DESC) LIMIT', sql)
+        and not any('TEMP B-TREE' in line for line in plan)
+    )
+
+
+def find_full_scans(sql, plan):
+    """Возвращает таблицы, которые план читает целиком, без индекса."""
+    if connection.vendor != 'sqlite':
+        return [
+            match[1] for line in plan
+            if (match := POSTGRES_FULL_SCAN_RE.search(line))
+        ]
+    return [
+        match[1] for line in plan
+        if (match := SQLITE_FULL_SCAN_RE.match(line.strip()))
+        and not is_primary_key_walk(match[1], sql, plan)
+    ]
+
+
+def collect_query_plans(requests=None):
+    """Выполняет канонические запросы и возвращает планы их SELECT.
+
+    Данные создаются в транзакции, которая откатывается, а кэш ответов
+    на время проверки выключается, чтобы каждый запрос дошел до БД.
+    В PostgreSQL последовательное чтение запрещается планировщику:
+    на маленьких таблицах он выбирает его даже при наличии индекса.
+    """
+    plans = []
+    with response_cache_enabled(False), transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        admin, values = seed_objects()
+        client = Client(
+            HTTP_AUTHORIZATION=f'Bearer {issue_access_token(admin)}'
+        )
+        for template in requests or CANONICAL_REQUESTS:
+            url = template.format(**values)
+            with capture_selects() as queries:
+                client.get(url)
+            for sql, params in queries:
+                plan = explain(sql, params)
+                plans.append(
+                    QueryPlan(url, sql, plan, find_full_scans(sql, plan))
+                )
+        transaction.set_rollback(True)
+    return plans
@@ -0,0 +1,105 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Даты, подклассы словарей и прочие типы, которые orjson кодирует
+# по-своему, отдаются кодировщику DRF, чтобы вывод не менялся.
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson else 0
+)
+# JSONRenderer экранирует эти символы: они ломают JSON внутри JavaScript.
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если он установлен.
+
+    Вывод совпадает с JSONRenderer: компактный JSON в UTF-8 с
+    экранированием U+2028 и U+2029. Запросы с отступами (`indent`),
+    настройки DRF COMPACT_JSON = False и UNICODE_JSON = False и
+    окружение без orjson обрабатываются стандартным рендерером.
+    Отличается только запись float с экспонентой (1e16 вместо 1e+16),
+    таких значений API не отдает.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context)
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            content = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=ORJSON_OPTIONS,
+            )
+        except orjson.JSONEncodeError:
+            # Например, целые больше 64 бит: их умеет только json.
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        return content.replace(
+            LINE_SEPARATOR, b'\\u2028'
+        ).replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser на orjson, если он установлен."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Ответ в MessagePack для клиентов с Accept: application/msgpack."""
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(
+            data,
+            default=JSONRenderer.encoder_class().default,
+            use_bin_type=True,
+        )
+
+
+class MessagePackParser(BaseParser):
+    """Разбор тела запроса в MessagePack."""
+
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData,
+                msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
@@ -1,10 +1,13 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.utils.crypto import get_random_string
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework.settings import api_settings
 
+from .authentication import issue_access_token
 from .confirmations import send_confirmation_code
 from .mixins import UsernameValidationMixin
 from reviews.constants import PASSWORD_LENGTH
@@ -12,6 +15,8 @@ from reviews.models import Category, Comment, Genre, Title, Review
 
 User = get_user_model()
 
+DUPLICATE_REVIEW_MESSAGE = 'Вы уже оставляли отзыв на это произведение'
+
 
 class CategorySerializer(serializers.ModelSerializer):
 
@@ -27,10 +32,31 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
+class NameSlugField(serializers.Field):
+    """Вложенная категория или жанр как простой словарь.
+
+    Заменяет вложенный ModelSerializer на чтении: не создает
+    сериализатор на каждый объект и читает только `name` и `slug`.
+    """
+
+    def __init__(self, many=False, **kwargs):
+        self.many = many
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if self.many:
+            return [
+                {'name': item.name, 'slug': item.slug}
+                for item in value.all()
+            ]
+        return {'name': value.name, 'slug': value.slug}
+
+
 class TitleReadSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True)
-    genre = GenreSerializer(many=True, read_only=True)
-    category = CategorySerializer(read_only=True)
+    genre = NameSlugField(many=True)
+    category = NameSlugField()
 
     class Meta:
         model = Title
@@ -83,15 +109,24 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         read_only_fields = ('author', 'title', 'pub_date')
 
-    def validate(self, data):
-        if self.context['request'].method == 'POST':
-            title = self.context['view'].kwargs.get('title_id')
-            author = self.context['request'].user
-            if Review.objects.filter(title=title, author=author).exists():
-                raise serializers.ValidationError(
-                    'Вы уже оставляли отзыв на это произведение'
-                )
-        return data
+    def create(self, validated_data):
+        """Создает отзыв, повтор отсекается ограничением unique_review.
+
+        Вставка идет в точке сохранения, поэтому ошибка не ломает
+        внешнюю транзакцию, а рейтинг не меняется.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author_id=validated_data['author'].pk,
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_REVIEW_MESSAGE]
+            })
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -116,18 +151,30 @@ class SignUpSerializer(serializers.Serializer, UsernameValidationMixin):
     )
 
     def validate(self, data):
-        """Проверяет существование пользователя и уникальность полей."""
+        """Проверяет существование пользователя и уникальность полей.
+
+        Кандидаты по username и email выбираются одним запросом.
+        """
         username = data.get('username')
         email = data.get('email')
 
-        user = User.objects.filter(username=username, email=email).first()
+        candidates = list(
+            User.objects.filter(Q(username=username) | Q(email=email))[:2]
+        )
+        user = next(
+            (candidate for candidate in candidates
+             if candidate.username == username and candidate.email == email),
+            None
+        )
 
-        if User.objects.filter(username=username).exists() and not user:
+        if not user and any(
+            candidate.username == username for candidate in candidates
+        ):
             raise serializers.ValidationError(
                 'Пользователь с таким username уже существует с другим email'
             )
 
-        if User.objects.filter(email=email).exists() and not user:
+        if not user and candidates:
             raise serializers.ValidationError(
                 'Пользователь с таким email уже существует'
             )
@@ -171,15 +218,14 @@ class TokenSerializer(serializers.Serializer):
                 'Неверный код подтверждения'
             )
 
+        data['user'] = user
         return data
 
     def create(self, validated_data):
-        """Генерирует JWT токен для пользователя."""
-        username = validated_data['username']
-        user = get_object_or_404(User, username=username)
-        refresh = AccessToken.for_user(user)
+        """Генерирует JWT токен для пользователя из validate."""
+        token = issue_access_token(validated_data['user'])
 
-        return {'token': str(refresh)}
+        return {'token': str(token)}
 
 
 class UserSerializer(serializers.ModelSerializer, UsernameValidationMixin):
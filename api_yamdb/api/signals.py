@@ -0,0 +1,85 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_save
+)
+from django.dispatch import receiver
+
+from .authentication import forget_token_version
+from .cache import bump_generation
+from .user_cache import user_cache
+from reviews.models import Category, Genre, Review, Title, User
+from reviews.signals import bulk_data_changed
+
+CACHED_MODELS = (Category, Genre, Title, Review, User)
+# Поля пользователя, которые попадают в токен или влияют на доступ.
+TOKEN_FIELDS = ('username', 'role', 'is_superuser', 'is_active')
+
+
+def bump_model_generation(sender, **kwargs):
+    """Сбрасывает кэш ответов, зависящих от измененной модели."""
+    bump_generation(sender._meta.label_lower)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(bump_model_generation, sender=model)
+    post_delete.connect(bump_model_generation, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_genres(sender, action, **kwargs):
+    """Сбрасывает кэш произведений при изменении их жанров."""
+    if action.startswith('post_'):
+        bump_generation(Title._meta.label_lower)
+
+
+@receiver(bulk_data_changed)
+def bump_all_generations(sender, **kwargs):
+    """Сбрасывает весь кэш после массовых операций без сигналов моделей."""
+    for model in CACHED_MODELS:
+        bump_generation(model._meta.label_lower)
+
+
+@receiver(pre_save, sender=User)
+def detect_token_changes(sender, instance, **kwargs):
+    """Запоминает, изменились ли данные, записанные в токены."""
+    instance._revoke_tokens = False
+    if instance._state.adding or instance.pk is None:
+        return
+    stored = (
+        User.objects.filter(pk=instance.pk)
+        .values_list(*TOKEN_FIELDS)
+        .first()
+    )
+    instance._revoke_tokens = stored is not None and stored != tuple(
+        getattr(instance, field) for field in TOKEN_FIELDS
+    )
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens(sender, instance, created, **kwargs):
+    """Отзывает выданные токены после смены роли или блокировки."""
+    if not getattr(instance, '_revoke_tokens', False):
+        return
+    instance._revoke_tokens = False
+    User.objects.filter(pk=instance.pk).update(
+        token_version=F('token_version') + 1
+    )
+    instance.refresh_from_db(fields=('token_version',))
+    transaction.on_commit(lambda: forget_token_version(instance.pk))
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user_tokens(sender, instance, **kwargs):
+    """Удаленный пользователь не должен проходить проверку по кэшу."""
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_token_version(user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_state(sender, instance, **kwargs):
+    """Убирает пользователя из кэша состояния этого процесса."""
+    user_id = instance.pk
+    user_cache.invalidate(user_id)
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
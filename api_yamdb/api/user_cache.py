@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import Counter, OrderedDict, namedtuple
+
+from django.conf import settings
+
+from .process_stats import register_stats
+from reviews.models import User
+
+USER_CACHE_SETTINGS = {
+    'MAX_SIZE': 1024,
+    'TTL': 60,
+    **getattr(settings, 'USER_CACHE', {}),
+}
+
+UserState = namedtuple(
+    'UserState', ('username', 'role', 'is_superuser', 'is_active')
+)
+
+
+class UserStateCache:
+    """Ограниченный LRU-кэш состояния пользователей в памяти процесса.
+
+    Хранит только то, что нужно для проверки прав. Запись живет не
+    дольше `ttl` секунд: изменения в других процессах не сбрасывают
+    локальный кэш, и срок жизни ограничивает их задержку.
+
+    Чтение из БД идет без блокировки. Чтобы invalidate() во время
+    чтения не дал сохранить прочитанное до изменения состояние, для
+    читаемых ключей ведется счетчик поколений: invalidate() увеличивает
+    его, и результат чтения не сохраняется, если поколение изменилось.
+    """
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Число незавершенных чтений из БД и поколения читаемых ключей.
+        self.reading = Counter()
+        self.generations = Counter()
+
+    def get(self, user_id):
+        """Возвращает состояние пользователя или None, если его нет."""
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            self.reading[user_id] += 1
+            generation = self.generations[user_id]
+        try:
+            state = (
+                User.objects.filter(pk=user_id)
+                .values_list(*UserState._fields)
+                .first()
+            )
+        except BaseException:
+            with self.lock:
+                self._finish_reading(user_id)
+            raise
+        if state is not None:
+            state = UserState(*state)
+        with self.lock:
+            if state is not None and self.generations[user_id] == generation:
+                self.entries[user_id] = now + self.ttl, state
+                self.entries.move_to_end(user_id)
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+            self._finish_reading(user_id)
+        return state
+
+    def _finish_reading(self, user_id):
+        """Забывает поколение ключа, когда его больше никто не читает."""
+        self.reading[user_id] -= 1
+        if not self.reading[user_id]:
+            del self.reading[user_id]
+            self.generations.pop(user_id, None)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+            if user_id in self.reading:
+                self.generations[user_id] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            for user_id in self.reading:
+                self.generations[user_id] += 1
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Счетчики попаданий для подбора размера кэша."""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0,
+            }
+
+
+user_cache = UserStateCache(
+    max_size=USER_CACHE_SETTINGS['MAX_SIZE'],
+    ttl=USER_CACHE_SETTINGS['TTL'],
+)
+register_stats('user_cache', user_cache.stats)
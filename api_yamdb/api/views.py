@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, mixins, status, viewsets
@@ -11,6 +11,13 @@ from rest_framework.permissions import (AllowAny,
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .authentication import get_user_instance, get_user_reference
+from .cache import CachedResponseMixin
+from .conditional import ConditionalGetMixin
+from .fast_serializers import (
+    CommentValuesSerializer, FastListMixin, ReviewValuesSerializer,
+    TitleValuesSerializer
+)
 from .permissions import (
     IsAdmin, IsAdminOrReadOnly, IsAuthorModeratorAdminOrReadOnly
 )
@@ -19,33 +26,66 @@ from .serializers import (
     SignUpSerializer, TitleReadSerializer, TitleWriteSerializer,
     TokenSerializer, UserSerializer, UserMeSerializer
 )
-from api.filters import TitleFilter
-from reviews.models import Category, Genre, Title, Review, User
+from api.filters import TitleFilter, TitleSearchFilter
+from reviews.models import Category, Comment, Genre, Title, Review, User
 
 User = get_user_model()
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+def with_author_name(queryset):
+    """Подгружает автора одним запросом, из его полей только имя."""
+    return queryset.select_related('author').only(
+        *(field.name for field in queryset.model._meta.concrete_fields),
+        'author__username',
+    )
+
+
+class TitleViewSet(ConditionalGetMixin, CachedResponseMixin, FastListMixin,
+                   viewsets.ModelViewSet):
     queryset = (
         Title.objects
-        .annotate(rating=Avg('reviews__score'))
         .select_related('category')
-        .prefetch_related('genre')
+        .prefetch_related(
+            Prefetch('genre', queryset=Genre.objects.only('name', 'slug'))
+        )
         .order_by('name', 'year')
     )
+    serializer_class = TitleReadSerializer
+    fast_list_serializer_class = TitleValuesSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
-    filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
+    filter_backends = (
+        DjangoFilterBackend, TitleSearchFilter, filters.OrderingFilter
+    )
     filterset_class = TitleFilter
     ordering_fields = ('name', 'year', 'rating')
+    keyset_ordering = ('name', 'year', 'id')
     permission_classes = (IsAdminOrReadOnly,)
+    cache_dependencies = (
+        'reviews.title', 'reviews.category', 'reviews.genre', 'reviews.review'
+    )
+    conditional_dependencies = ('reviews.category', 'reviews.genre')
+
+    def get_conditional_state(self, request):
+        if self.action == 'retrieve':
+            return self.get_object_state(
+                Title.objects.filter(pk=self.kwargs['pk']), request
+            )
+        if TitleSearchFilter.search_param in request.query_params:
+            # Выдача поиска зависит и от текстов отзывов, которые
+            # не меняют дату изменения произведения.
+            return None
+        return self.get_list_state(
+            self.filter_queryset(self.get_queryset()), request
+        )
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
-            return TitleReadSerializer
+            return super().get_serializer_class()
         return TitleWriteSerializer
 
 
-class BaseCategoryGenreViewSet(mixins.CreateModelMixin,
+class BaseCategoryGenreViewSet(CachedResponseMixin,
+                               mixins.CreateModelMixin,
                                mixins.DestroyModelMixin,
                                mixins.ListModelMixin,
                                viewsets.GenericViewSet):
@@ -60,54 +100,120 @@ class BaseCategoryGenreViewSet(mixins.CreateModelMixin,
 class CategoryViewSet(BaseCategoryGenreViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_dependencies = ('reviews.category',)
 
 
 class GenreViewSet(BaseCategoryGenreViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_dependencies = ('reviews.genre',)
+
+
+class ParentObjectMixin:
+    """Родительский объект из URL загружается не больше раза за запрос.
 
+    Списки фильтруются по id родителя без его загрузки, а существование
+    родителя проверяется, только если страница оказалась пустой, чтобы
+    для неизвестного id по-прежнему возвращался 404.
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    Родитель ищется в `parent_model` по полям `parent_lookup`:
+    поле модели -> имя параметра URL.
+    """
+
+    parent_model = None
+    parent_lookup = {}
+
+    def load_parent(self):
+        return get_object_or_404(self.parent_model, **{
+            field: self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_lookup.items()
+        })
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = self.load_parent()
+        return self._parent
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.get_parent()
+        return page
+
+
+class ReviewViewSet(ConditionalGetMixin, FastListMixin, ParentObjectMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    fast_list_serializer_class = ReviewValuesSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
+    keyset_ordering = ('-pub_date', '-id')
     permission_classes = (IsAuthenticatedOrReadOnly,
                           IsAuthorModeratorAdminOrReadOnly)
+    conditional_dependencies = ('reviews.user',)
+    parent_model = Title
+    parent_lookup = {'id': 'title_id'}
+
+    def get_conditional_state(self, request):
+        reviews = Review.objects.filter(title_id=self.kwargs['title_id'])
+        if self.action == 'retrieve':
+            return self.get_object_state(
+                reviews.filter(pk=self.kwargs['pk']), request
+            )
+        return self.get_list_state(reviews, request)
 
     def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        return self.get_parent()
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return with_author_name(
+            Review.objects.filter(title_id=self.kwargs.get('title_id'))
+        )
 
     def perform_create(self, serializer):
         serializer.save(
-            author=self.request.user,
+            author=get_user_reference(self.request.user),
             title=self.get_title()
         )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalGetMixin, FastListMixin, ParentObjectMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    fast_list_serializer_class = CommentValuesSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
+    keyset_ordering = ('-pub_date', '-id')
     permission_classes = (IsAuthenticatedOrReadOnly,
                           IsAuthorModeratorAdminOrReadOnly)
+    conditional_dependencies = ('reviews.user',)
+    parent_model = Review
+    parent_lookup = {'id': 'review_id', 'title_id': 'title_id'}
+
+    def get_conditional_state(self, request):
+        comments = Comment.objects.filter(
+            review_id=self.kwargs['review_id'],
+            review__title_id=self.kwargs['title_id']
+        )
+        if self.action == 'retrieve':
+            return self.get_object_state(
+                comments.filter(pk=self.kwargs['pk']), request
+            )
+        return self.get_list_state(comments, request)
 
     def get_review(self):
         """Получаем отзыв по id из URL."""
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title_id=self.kwargs.get('title_id')
-        )
+        return self.get_parent()
 
     def get_queryset(self):
         """Получаем комментарии для отзыва."""
-        return self.get_review().comments.all()
+        return with_author_name(Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id')
+        ))
 
     def perform_create(self, serializer):
         """Создаем комментарий для отзыва."""
         serializer.save(
-            author=self.request.user,
+            author=get_user_reference(self.request.user),
             review=self.get_review()
         )
 
@@ -156,14 +262,14 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def me_get(self, request):
         """Получение профиля текущего пользователя."""
-        serializer = UserMeSerializer(request.user)
+        serializer = UserMeSerializer(get_user_instance(request.user))
         return Response(serializer.data)
 
     @me_get.mapping.patch
     def me_patch(self, request):
         """Обновление профиля текущего пользователя."""
         serializer = UserMeSerializer(
-            request.user,
+            get_user_instance(request.user),
             data=request.data,
             partial=True
         )
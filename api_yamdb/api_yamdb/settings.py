@@ -1,3 +1,4 @@
+from importlib.util import find_spec
 from pathlib import Path
 from datetime import timedelta
 
@@ -25,6 +26,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.process_stats.ProcessStatsMiddleware',
+    'api.query_budget.QueryBudgetMiddleware',
+    'api.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -54,13 +58,65 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# PRAGMA SQLite, которые выполняются при открытии соединения. WAL
+# позволяет читать во время записи, а писатели ждут блокировку
+# busy_timeout миллисекунд вместо ошибки «database is locked».
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение задает размер кэша страниц в КиБ.
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение переиспользуется между запросами и проверяется
+        # перед повторным использованием.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(
+                f'PRAGMA {name}={value}'
+                for name, value in SQLITE_PRAGMAS.items()
+            ),
+            # Транзакция сразу берет блокировку записи: иначе чтение
+            # с последующей записью не ждет busy_timeout и падает.
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+# Кэш ответов каталога: ALIAS - алиас из CACHES, TIMEOUT - в секундах.
+API_RESPONSE_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+    'ENABLED': True,
+}
+
+# Сжатие ответов API: gzip, а также br и zstd при установленных
+# brotli и zstandard. Ответы меньше MIN_SIZE байт не сжимаются.
+API_COMPRESSION = {
+    'MIN_SIZE': 1024,
+    'PATH_PREFIX': '/api/',
+}
+
+# Списки произведений, отзывов и комментариев сериализуются из строк
+# values_list без создания моделей.
+FAST_SERIALIZERS = {
+    'ENABLED': True,
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -96,16 +152,86 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 DEFAULT_FROM_EMAIL = 'from@example.com'
 
+# Очередь писем. Без EAGER письма отправляет команда send_outbox.
+EMAIL_OUTBOX = {
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF_SECONDS': 30,
+    'EAGER': False,
+}
+
+# Журнал кодов подтверждения: SINK - file, stdout или disabled.
+# Файл ротируется по размеру (MAX_BYTES) и по дате.
+CONFIRMATION_AUDIT = {
+    'SINK': 'file',
+    'PATH': BASE_DIR / 'api' / 'email' / 'confirmation_codes.txt',
+    'BUFFER_SIZE': 100,
+    'FLUSH_INTERVAL': 5,
+    'MAX_BYTES': 10 * 1024 * 1024,
+    'BACKUP_COUNT': 10,
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.OptionalKeysetPagination',
     'PAGE_SIZE': 10,
+    # JSON кодируется orjson, если он установлен, MessagePack
+    # (Accept: application/msgpack) доступен при установленном msgpack.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        *(['api.renderers.MessagePackRenderer']
+          if find_spec('msgpack') else []),
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        *(['api.renderers.MessagePackParser']
+          if find_spec('msgpack') else []),
+    ],
+}
+
+# Версия токенов пользователя кэшируется на VERSION_TIMEOUT секунд.
+# Изменение пользователя сбрасывает кэш, но LocMemCache сбрасывается
+# только в своем процессе: остальные процессы принимают отозванный токен
+# до VERSION_TIMEOUT секунд. С общим кэшем (Redis, Memcached) отзыв
+# действует сразу, и таймаут можно увеличить.
+STATELESS_AUTH = {
+    'CACHE_ALIAS': 'default',
+    'VERSION_TIMEOUT': 5,
 }
+
+# LRU-кэш ролей пользователей в памяти процесса для токенов без роли.
+USER_CACHE = {
+    'MAX_SIZE': 1024,
+    'TTL': 60,
+}
+
+# Счетчик SQL-запросов по эндпоинтам API: заголовок Server-Timing,
+# перцентили для команды query_budget_report и предупреждения о
+# превышении бюджетов вида {'titles-list:list': {'QUERIES': 5}}.
+QUERY_BUDGET = {
+    'WINDOW': 500,
+    'BUDGETS': {},
+    'FLUSH_INTERVAL': 10,
+}
+
+# Каталог снимков статистики процессов для команд отчета. Каждый процесс
+# пишет свой файл, поэтому при нескольких серверах каталог должен быть
+# общим. Снимки старше TIMEOUT секунд не попадают в отчеты. Счетчики
+# кэшей и сжатия сохраняются раз в FLUSH_INTERVAL секунд.
+PROCESS_STATS = {
+    'DIR': BASE_DIR / 'api' / 'stats',
+    'TIMEOUT': 24 * 60 * 60,
+    'FLUSH_INTERVAL': 10,
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-from .models import Category, Comment, Genre, Title, Review, User
+from .models import (
+    Category, Comment, Genre, OutgoingEmail, Title, Review, User
+)
 
 
 @admin.register(User)
@@ -48,6 +50,7 @@ class TitleAdmin(admin.ModelAdmin):
         'description',
         'category',
         'display_genres',
+        'rating',
     )
     list_filter = ('name', 'genre', 'category')
     search_fields = ('name', 'year', 'genre__name', 'category__name')
@@ -82,3 +85,17 @@ class CommentAdmin(admin.ModelAdmin):
     )
     list_filter = ('author',)
     search_fields = ('author',)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient',
+        'subject',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'sent_at',
+    )
+    list_filter = ('status',)
+    search_fields = ('recipient',)
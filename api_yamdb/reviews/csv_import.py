@@ -0,0 +1,69 @@
+import csv
+import time
+from itertools import islice
+
+import django
+from django.apps import apps
+
+# Колонки CSV со ссылками, которые проверяются по уже загруженным id.
+REFERENCE_COLUMNS = ('category', 'author')
+
+
+def read_rows(file_path):
+    """Построчно читает CSV, не загружая файл в память целиком."""
+    with open(file_path, encoding='utf-8', newline='') as csvfile:
+        yield from csv.DictReader(csvfile)
+
+
+def batched(iterable, size):
+    """Разбивает поток на списки фиксированного размера."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def build_fields(row):
+    """Преобразует строку CSV в аргументы модели.
+
+    Ссылки на категорию и автора записываются в `*_id` без запросов к БД,
+    их существование проверяется при сохранении.
+    """
+    model_fields = {}
+    for field, value in row.items():
+        value = value.strip() if value else ''
+        if not value:
+            continue
+        if field in REFERENCE_COLUMNS:
+            model_fields[f'{field}_id'] = int(value)
+        else:
+            model_fields[field] = value
+    return model_fields
+
+
+def build_objects(model, rows):
+    """Лениво создает объекты модели вместе с исходными строками."""
+    for row in rows:
+        model_fields = build_fields(row)
+        if model_fields:
+            yield row, model(**model_fields)
+
+
+def init_worker():
+    """Настраивает Django в процессе пула, если это еще не сделано.
+
+    Модуль не импортирует модели при загрузке, поэтому его можно
+    импортировать в новом процессе до вызова django.setup().
+    """
+    if not apps.ready:
+        django.setup()
+
+
+def parse_file(file_path, model_label):
+    """Разбирает файл целиком в процессе пула.
+
+    Возвращает пары (строка, объект) и время разбора в секундах.
+    """
+    started = time.monotonic()
+    model = apps.get_model(model_label)
+    objects = list(build_objects(model, read_rows(file_path)))
+    return objects, time.monotonic() - started
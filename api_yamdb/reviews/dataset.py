@@ -0,0 +1,234 @@
+"""Генерация синтетических CSV в формате команды load_csv_data.
+
+Все значения берутся из одного генератора случайных чисел в заданном
+порядке, поэтому при одинаковых параметрах и seed файлы совпадают
+байт в байт. Строки пишутся потоком, в памяти держатся только массивы
+размером с число произведений.
+"""
+import csv
+import os
+import random
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from .constants import MAX_SCORE, MIN_SCORE
+
+WORDS = (
+    'фильм', 'книга', 'песня', 'сюжет', 'герой', 'героиня', 'финал',
+    'актер', 'роман', 'автор', 'музыка', 'смысл', 'история', 'мир',
+    'время', 'любовь', 'война', 'дорога', 'город', 'море', 'ночь',
+    'режиссер', 'сцена', 'голос', 'память', 'тайна', 'дом', 'жизнь',
+    'прекрасный', 'скучный', 'яркий', 'долгий', 'странный', 'добрый',
+    'смотреть', 'читать', 'слушать', 'понравиться', 'вспоминать',
+    'очень', 'снова', 'всегда', 'никогда', 'немного', 'совсем',
+)
+ROLES = ('user',) * 97 + ('moderator',) * 2 + ('admin',)
+FIRST_YEAR = 1900
+LAST_YEAR = 2024
+DATES_START = datetime(2015, 1, 1, tzinfo=timezone.utc)
+DATES_SPAN = timedelta(days=3650)
+
+HEADERS = {
+    'category.csv': ('id', 'name', 'slug'),
+    'genre.csv': ('id', 'name', 'slug'),
+    'users.csv': (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    ),
+    'titles.csv': ('id', 'name', 'year', 'category'),
+    'genre_title.csv': ('id', 'title_id', 'genre_id'),
+    'review.csv': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments.csv': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+
+
+def zipf_weights(count, exponent):
+    """Накопленные веса закона Ципфа для рангов 1..count."""
+    return list(accumulate(
+        1 / rank ** exponent for rank in range(1, count + 1)
+    ))
+
+
+def score_weights(skew):
+    """Веса оценок: при skew > 0 чаще высокие, при skew < 0 низкие."""
+    return [score ** skew for score in range(MIN_SCORE, MAX_SCORE + 1)]
+
+
+def spread_reviews(counts, capacity):
+    """Ограничивает число отзывов на произведение числом авторов.
+
+    Лишние отзывы переходят к следующим по популярности произведениям,
+    чтобы пара (автор, произведение) не повторялась.
+    """
+    excess = 0
+    for rank, count in enumerate(counts):
+        count += excess
+        counts[rank] = min(count, capacity)
+        excess = count - counts[rank]
+    return excess
+
+
+class DatasetGenerator:
+    """Генератор связанных CSV-файлов заданного размера.
+
+    Популярность произведений подчиняется закону Ципфа с показателем
+    `zipf`: произведение ранга r получает отзывы с весом 1 / r ** zipf.
+    Ранги случайно распределены по id. Комментарии выбирают
+    произведение с теми же весами, а отзыв внутри него равновероятно.
+    """
+
+    def __init__(self, users=1000, categories=10, genres=30, titles=10000,
+                 reviews=100000, comments=200000, zipf=1.1, score_skew=1.5,
+                 review_words=(10, 80), comment_words=(3, 30),
+                 max_genres=3, seed=0):
+        if reviews > users * titles:
+            raise ValueError(
+                'Отзывов больше, чем пар (автор, произведение).'
+            )
+        self.users = users
+        self.categories = categories
+        self.genres = genres
+        self.titles = titles
+        self.reviews = reviews
+        self.comments = comments
+        self.zipf = zipf
+        self.score_skew = score_skew
+        self.review_words = review_words
+        self.comment_words = comment_words
+        self.max_genres = min(max_genres, genres)
+        self.rng = random.Random(seed)
+
+    def text(self, bounds):
+        words = self.rng.choices(WORDS, k=self.rng.randint(*bounds))
+        return ' '.join(words).capitalize() + '.'
+
+    def pub_date(self):
+        moment = DATES_START + DATES_SPAN * self.rng.random()
+        return moment.strftime('%Y-%m-%dT%H:%M:%S.') + (
+            f'{moment.microsecond // 1000:03}Z'
+        )
+
+    def category_rows(self):
+        for pk in range(1, self.categories + 1):
+            yield pk, f'Категория {pk}', f'category-{pk}'
+
+    def genre_rows(self):
+        for pk in range(1, self.genres + 1):
+            yield pk, f'Жанр {pk}', f'genre-{pk}'
+
+    def user_rows(self):
+        for pk in range(1, self.users + 1):
+            yield (
+                pk, f'user{pk}', f'user{pk}@yamdb.fake',
+                self.rng.choice(ROLES), '', '', '',
+            )
+
+    def title_rows(self):
+        for pk in range(1, self.titles + 1):
+            name = ' '.join(self.rng.choices(WORDS, k=2)).capitalize()
+            yield (
+                pk, f'{name} {pk}',
+                self.rng.randint(FIRST_YEAR, LAST_YEAR),
+                self.rng.randint(1, self.categories) if self.categories
+                else '',
+            )
+
+    def genre_title_rows(self):
+        pk = 0
+        genres = range(1, self.genres + 1)
+        for title_id in range(1, self.titles + 1):
+            for genre_id in sorted(self.rng.sample(
+                genres, self.rng.randint(1, self.max_genres)
+            )):
+                pk += 1
+                yield pk, title_id, genre_id
+
+    def plan_reviews(self):
+        """Число отзывов каждого произведения и первый id его отзывов."""
+        ranks = list(range(1, self.titles + 1))
+        self.rng.shuffle(ranks)
+        self.popularity = zipf_weights(self.titles, self.zipf)
+        self.by_rank = ranks
+        counts = [0] * self.titles
+        chosen = self.rng.choices(
+            range(self.titles), cum_weights=self.popularity, k=self.reviews
+        )
+        for rank in chosen:
+            counts[rank] += 1
+        spread_reviews(counts, self.users)
+        self.review_counts = [0] * (self.titles + 1)
+        for rank, count in enumerate(counts):
+            self.review_counts[ranks[rank]] = count
+        self.first_review = list(accumulate(self.review_counts, initial=1))
+
+    def review_rows(self):
+        self.plan_reviews()
+        scores = list(accumulate(score_weights(self.score_skew)))
+        pk = 0
+        for title_id in range(1, self.titles + 1):
+            authors = self.rng.sample(
+                range(1, self.users + 1), self.review_counts[title_id]
+            )
+            for author in authors:
+                pk += 1
+                score = MIN_SCORE + bisect_right(
+                    scores, self.rng.random() * scores[-1]
+                )
+                yield (
+                    pk, title_id, self.text(self.review_words), author,
+                    min(score, MAX_SCORE), self.pub_date(),
+                )
+
+    def comment_rows(self):
+        if not self.reviews:
+            return
+        # Только произведения с отзывами, с весами их популярности.
+        ranked = [
+            (self.by_rank[rank], self.popularity[rank]
+             - (self.popularity[rank - 1] if rank else 0))
+            for rank in range(self.titles)
+            if self.review_counts[self.by_rank[rank]]
+        ]
+        titles = [title_id for title_id, _ in ranked]
+        weights = list(accumulate(weight for _, weight in ranked))
+        for pk in range(1, self.comments + 1):
+            title_id = titles[bisect_right(
+                weights, self.rng.random() * weights[-1]
+            )]
+            review_id = self.first_review[title_id] + self.rng.randrange(
+                self.review_counts[title_id]
+            )
+            yield (
+                pk, review_id, self.text(self.comment_words),
+                self.rng.randint(1, self.users), self.pub_date(),
+            )
+
+    def files(self):
+        """Пары (имя файла, поток строк) в порядке генерации."""
+        return (
+            ('category.csv', self.category_rows()),
+            ('genre.csv', self.genre_rows()),
+            ('users.csv', self.user_rows()),
+            ('titles.csv', self.title_rows()),
+            ('genre_title.csv', self.genre_title_rows()),
+            ('review.csv', self.review_rows()),
+            ('comments.csv', self.comment_rows()),
+        )
+
+    def write(self, output_dir, on_file=None):
+        """Записывает все файлы в каталог и возвращает число строк."""
+        os.makedirs(output_dir, exist_ok=True)
+        written = {}
+        for filename, rows in self.files():
+            path = os.path.join(output_dir, filename)
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                writer = csv.writer(file, lineterminator='\n')
+                writer.writerow(HEADERS[filename])
+                count = 0
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+            written[filename] = count
+            if on_file is not None:
+                on_file(filename, count)
+        return written
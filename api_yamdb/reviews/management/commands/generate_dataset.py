@@ -0,0 +1,127 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.dataset import DatasetGenerator
+
+
+def dashed(option):
+    return option.replace('_', '-')
+
+
+class Command(BaseCommand):
+    """Команда генерации синтетических CSV для load_csv_data."""
+
+    help = (
+        'Генерирует CSV файлы заданного размера в формате static/data: '
+        'популярность произведений по закону Ципфа, смещенные оценки, '
+        'уникальные пары автор-произведение'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output_dir', help='Каталог для CSV файлов'
+        )
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--titles', type=int, default=10000)
+        parser.add_argument('--reviews', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=200000)
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель закона Ципфа для популярности произведений',
+        )
+        parser.add_argument(
+            '--score-skew',
+            type=float,
+            default=1.5,
+            help=(
+                'Смещение оценок: вес оценки s равен s ** skew, '
+                '0 - равномерно, меньше 0 - чаще низкие'
+            ),
+        )
+        parser.add_argument(
+            '--review-words',
+            type=int,
+            nargs=2,
+            default=(10, 80),
+            metavar=('MIN', 'MAX'),
+            help='Длина текста отзыва в словах',
+        )
+        parser.add_argument(
+            '--comment-words',
+            type=int,
+            nargs=2,
+            default=(3, 30),
+            metavar=('MIN', 'MAX'),
+            help='Длина текста комментария в словах',
+        )
+        parser.add_argument(
+            '--max-genres',
+            type=int,
+            default=3,
+            help='Наибольшее число жанров у произведения',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def validate(self, options):
+        """Проверяет размеры до генерации, чтобы не писать пустые файлы."""
+        for name in ('users', 'titles', 'genres', 'max_genres'):
+            if options[name] < 1:
+                raise CommandError(
+                    f'Параметр --{dashed(name)} должен быть больше 0.'
+                )
+        for name in ('categories', 'reviews', 'comments'):
+            if options[name] < 0:
+                raise CommandError(
+                    f'Параметр --{dashed(name)} не может быть меньше 0.'
+                )
+        if options['comments'] and not options['reviews']:
+            raise CommandError(
+                'Комментариям нужны отзывы: задайте --reviews больше 0.'
+            )
+        for name in ('review_words', 'comment_words'):
+            low, high = options[name]
+            if not 1 <= low <= high:
+                raise CommandError(
+                    f'Некорректная длина текста --{dashed(name)}: '
+                    f'{low} {high}.'
+                )
+
+    def handle(self, *args, **options):
+        """Пишет файлы потоком и печатает число строк в каждом."""
+        self.validate(options)
+        try:
+            generator = DatasetGenerator(
+                users=options['users'],
+                categories=options['categories'],
+                genres=options['genres'],
+                titles=options['titles'],
+                reviews=options['reviews'],
+                comments=options['comments'],
+                zipf=options['zipf'],
+                score_skew=options['score_skew'],
+                review_words=options['review_words'],
+                comment_words=options['comment_words'],
+                max_genres=options['max_genres'],
+                seed=options['seed'],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+
+        started = time.monotonic()
+
+        def report(filename, count):
+            if options['verbosity'] >= 1:
+                self.stdout.write(
+                    f'{filename}: {count} строк, '
+                    f'{time.monotonic() - started:.1f} с'
+                )
+
+        generator.write(options['output_dir'], on_file=report)
+        self.stdout.write(self.style.SUCCESS(
+            f'Данные записаны в {options["output_dir"]}.'
+        ))
@@ -1,70 +1,339 @@
-import csv
+import hashlib
+import json
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from graphlib import TopologicalSorter
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
 
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.csv_import import (
+    batched, build_objects, init_worker, parse_file, read_rows
+)
+from reviews.models import (
+    Category, Comment, Genre, ImportedRow, Review, Title
+)
+from reviews.ratings import rebuild_ratings
+from reviews.search import rebuild_search_index
+from reviews.signals import bulk_data_changed
 
 User = get_user_model()
 
+DEFAULT_BATCH_SIZE = 1000
+
+# Порядок сохранения определяется зависимостями между моделями.
+CSV_FILES = (
+    ('category.csv', Category),
+    ('genre.csv', Genre),
+    ('users.csv', User),
+    ('titles.csv', Title),
+    ('genre_title.csv', Title.genre.through),
+    ('review.csv', Review),
+    ('comments.csv', Comment),
+)
+
+# Колонки CSV, значения которых проверяются по уже загруженным id.
+FOREIGN_KEYS = {
+    'category': Category,
+    'author': User,
+}
+
+# Естественные ключи для режима --upsert. Связь жанров и произведений
+# не имеет изменяемых полей, поэтому для нее конфликты игнорируются.
+UPSERT_KEYS = {
+    Category: ('slug',),
+    Genre: ('slug',),
+    User: ('username',),
+    Title: ('id',),
+    Review: ('author', 'title'),
+    Comment: ('id',),
+}
+
+
+def build_dependencies():
+    """Строит граф зависимостей файлов по внешним ключам моделей."""
+    files_by_model = {model: filename for filename, model in CSV_FILES}
+    return {
+        filename: {
+            files_by_model[field.related_model]
+            for field in model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model is not model
+            and field.related_model in files_by_model
+        }
+        for filename, model in CSV_FILES
+    }
+
 
 class Command(BaseCommand):
     """Команда загрузки данных из CSV файлов."""
 
     help = 'Загружает данные из CSV файлов в базу данных'
 
-    def handle(self, *args, **options):  # noqa: C901
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одной вставке и транзакции',
+        )
+        parser.add_argument(
+            '--data-dir',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог с CSV файлами',
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help='Обновлять измененные строки и пропускать неизмененные',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Число процессов для разбора файлов. При значении больше 1 '
+                'каждый файл разбирается целиком, и в памяти одновременно '
+                'находится не больше стольких разобранных файлов и еще '
+                'один сохраняемый'
+            ),
+        )
+
+    def handle(self, *args, **options):
         """Основной метод импорта данных."""
+        if options['batch_size'] < 1:
+            raise CommandError('Размер пакета должен быть положительным.')
+        if options['workers'] < 1:
+            raise CommandError('Число процессов должно быть положительным.')
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+        self.upsert = options['upsert']
+        self.touched_titles = set()
+        self.timings = {}
+        self.known_ids = {
+            column: set(model.objects.values_list('id', flat=True))
+            for column, model in FOREIGN_KEYS.items()
+        }
         self.stdout.write(
             self.style.SUCCESS('Начало загрузки данных из CSV...'))
 
-        models_config = {
-            'category.csv': Category,
-            'genre.csv': Genre,
-            'users.csv': User,
-            'titles.csv': Title,
-            'genre_title.csv': Title.genre.through,
-            'review.csv': Review,
-            'comments.csv': Comment
+        models = dict(CSV_FILES)
+        paths = {
+            filename: os.path.join(options['data_dir'], filename)
+            for filename in models
         }
+        order = [
+            filename
+            for filename in TopologicalSorter(build_dependencies())
+            .static_order()
+            if os.path.exists(paths[filename])
+        ]
+        if options['workers'] > 1:
+            self.load_parallel(order, paths, models, options['workers'])
+        else:
+            for filename in order:
+                objects = build_objects(
+                    models[filename], read_rows(paths[filename])
+                )
+                self.load_file(filename, models[filename], objects)
+        self.reset_sequences([models[filename] for filename in order])
+
+        # bulk_create не отправляет сигналы, поэтому рейтинги
+        # и поисковые документы пересчитываются.
+        if self.upsert:
+            touched = Title.objects.filter(pk__in=self.touched_titles)
+            rebuild_ratings(touched)
+            rebuild_search_index(touched)
+        else:
+            rebuild_ratings()
+            rebuild_search_index()
+        bulk_data_changed.send(sender=self.__class__)
+
+        self.print_timings()
+        self.stdout.write(self.style.SUCCESS('Загрузка данных завершена!'))
 
-        for filename, model in models_config.items():
-            file_path = os.path.join(
-                settings.BASE_DIR, 'static', 'data', filename)
+    def reset_sequences(self, models):
+        """Сдвигает счетчики id после вставки строк с явными id.
 
-            if not os.path.exists(file_path):
-                continue
+        Как и loaddata: в PostgreSQL иначе следующая запись получит уже
+        занятый id. SQLite счетчиков не требует.
+        """
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
 
-            with open(file_path, encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                objects_to_create = []
+    def load_parallel(self, order, paths, models, workers):
+        """Разбирает файлы в пуле процессов и сохраняет их по порядку.
 
-                for row in reader:
-                    model_fields = {}
+        Разбор не зависит от БД, поэтому следующие файлы разбираются,
+        пока сохраняется текущий. Вперед разбирается не больше `workers`
+        файлов, чтобы в памяти не копились результаты всех файлов.
+        """
+        pending = deque(order)
+        futures = deque()
+        with ProcessPoolExecutor(workers, initializer=init_worker) as pool:
 
-                    for field, value in row.items():
-                        if not value.strip():
-                            continue
+            def submit():
+                filename = pending.popleft()
+                futures.append(pool.submit(
+                    parse_file, paths[filename], models[filename]._meta.label
+                ))
 
-                        if field == 'category':
-                            category = Category.objects.filter(
-                                id=int(value)).first()
-                            if category:
-                                model_fields[field] = category
-                        elif field == 'author':
-                            user = User.objects.filter(id=int(value)).first()
-                            if user:
-                                model_fields[field] = user
-                        else:
-                            model_fields[field] = value.strip()
+            while pending and len(futures) < workers:
+                submit()
+            for filename in order:
+                objects, parse_time = futures.popleft().result()
+                if pending:
+                    submit()
+                self.load_file(filename, models[filename], objects)
+                self.timings[filename]['parse'] = parse_time
+                del objects
 
-                    if model_fields:
-                        objects_to_create.append(model(**model_fields))
+    def check_references(self, objects):
+        """Отбрасывает ссылки на отсутствующие категории и авторов.
 
-                if objects_to_create:
+        Строка без существующего автора пропускается, а несуществующая
+        категория заменяется пустым значением.
+        """
+        for row, obj in objects:
+            for column in FOREIGN_KEYS:
+                attname = f'{column}_id'
+                value = obj.__dict__.get(attname)
+                if value is None or value in self.known_ids[column]:
+                    continue
+                if column == 'author':
+                    break
+                setattr(obj, attname, None)
+            else:
+                yield row, obj
+
+    def load_file(self, filename, model, objects):
+        """Сохраняет объекты файла пакетами, каждый в своей транзакции."""
+        started = time.monotonic()
+        loaded = 0
+        self.skipped = 0
+        objects = self.check_references(objects)
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                if self.upsert and model in UPSERT_KEYS:
+                    self.upsert_batch(filename, model, batch)
+                else:
                     model.objects.bulk_create(
-                        objects_to_create, ignore_conflicts=True)
+                        [obj for _, obj in batch], ignore_conflicts=True
+                    )
+            loaded += len(batch)
+            if self.verbosity > 1:
+                self.report(filename, loaded, started)
+        if self.verbosity <= 1 or not loaded:
+            self.report(filename, loaded, started)
+        self.timings[filename] = {
+            'rows': loaded, 'load': time.monotonic() - started
+        }
 
-        self.stdout.write(self.style.SUCCESS('Загрузка данных завершена!'))
+        for column, target in FOREIGN_KEYS.items():
+            if target is model:
+                self.known_ids[column] = set(
+                    model.objects.values_list('id', flat=True)
+                )
+
+    def upsert_batch(self, filename, model, batch):
+        """Вставляет или обновляет только строки с измененным хэшем."""
+        unique_fields = UPSERT_KEYS[model]
+        rows = {}
+        for row, obj in batch:
+            key = json.dumps(
+                [getattr(obj, model._meta.get_field(name).attname)
+                 for name in unique_fields],
+                ensure_ascii=False, default=str,
+            )
+            digest = hashlib.sha256(
+                json.dumps(row, sort_keys=True, ensure_ascii=False).encode()
+            ).hexdigest()
+            rows[key] = digest, obj
+
+        stored = dict(
+            ImportedRow.objects
+            .filter(source=filename, key__in=rows)
+            .values_list('key', 'digest')
+        )
+        changed = {
+            key: (digest, obj) for key, (digest, obj) in rows.items()
+            if stored.get(key) != digest
+        }
+        self.skipped += len(batch) - len(changed)
+        if not changed:
+            return
+        if model is Review:
+            self.touched_titles.update(
+                int(obj.title_id) for _, obj in changed.values()
+            )
+        elif model is Title:
+            self.touched_titles.update(
+                int(obj.pk) for _, obj in changed.values()
+            )
+
+        model.objects.bulk_create(
+            [obj for _, obj in changed.values()],
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=self.get_update_fields(model, batch[0][0]),
+        )
+        ImportedRow.objects.bulk_create(
+            [
+                ImportedRow(source=filename, key=key, digest=digest)
+                for key, (digest, _) in changed.items()
+            ],
+            update_conflicts=True,
+            unique_fields=('source', 'key'),
+            update_fields=('digest',),
+        )
+
+    @staticmethod
+    def get_update_fields(model, row):
+        """Поля, которые обновляются при конфликте по ключу.
+
+        Это колонки файла, кроме ключа и даты создания, и дата изменения.
+        """
+        unique_fields = UPSERT_KEYS[model]
+        return [
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key
+            and field.name not in unique_fields
+            and not getattr(field, 'auto_now_add', False)
+            and (
+                field.name in row
+                or field.attname in row
+                or getattr(field, 'auto_now', False)
+            )
+        ]
+
+    def report(self, filename, loaded, started):
+        elapsed = time.monotonic() - started
+        rate = loaded / elapsed if elapsed else 0
+        message = (
+            f'{filename}: {loaded} строк за {elapsed:.2f} с '
+            f'({rate:.0f} строк/с)'
+        )
+        if self.upsert:
+            message += f', без изменений: {self.skipped}'
+        self.stdout.write(message)
+
+    def print_timings(self):
+        """Печатает сводку времени разбора и сохранения по файлам."""
+        self.stdout.write(
+            f'{"Файл":<20} {"строк":>6} {"разбор, с":>10} {"запись, с":>10}'
+        )
+        for filename, timing in self.timings.items():
+            parse = timing.get('parse')
+            self.stdout.write(
+                f'{filename:<20} {timing["rows"]:>6} '
+                f'{"-" if parse is None else f"{parse:.2f}":>10} '
+                f'{timing["load"]:>10.2f}'
+            )
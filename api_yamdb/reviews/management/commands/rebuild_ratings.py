@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.ratings import find_rating_mismatches, rebuild_ratings
+from reviews.signals import bulk_data_changed
+
+
+class Command(BaseCommand):
+    """Команда пересчета сохраненных рейтингов произведений."""
+
+    help = 'Пересчитывает и проверяет рейтинги произведений по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить рейтинги, не исправляя их',
+        )
+
+    def handle(self, *args, **options):
+        """Проверяет или исправляет расхождения с живой агрегацией."""
+        if options['check']:
+            mismatches = find_rating_mismatches()
+            for title in mismatches:
+                self.stdout.write(
+                    f'Произведение {title.pk}: ожидается '
+                    f'{title.rating_count} оценок с суммой {title.rating_sum}'
+                )
+            if mismatches:
+                raise CommandError(
+                    f'Рейтинг расходится у {len(mismatches)} произведений'
+                )
+            self.stdout.write(self.style.SUCCESS('Рейтинги согласованы.'))
+            return
+
+        fixed = rebuild_ratings()
+        if fixed:
+            bulk_data_changed.send(sender=self.__class__)
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено рейтингов: {fixed}.')
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """Команда пересборки поискового индекса произведений."""
+
+    help = 'Пересобирает поисковые документы произведений'
+
+    def handle(self, *args, **options):
+        """Пересобирает документы всех произведений."""
+        count = rebuild_search_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано произведений: {count}.')
+        )
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    """Команда отправки писем из очереди."""
+
+    help = 'Отправляет письма из очереди OutgoingEmail'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Сколько писем отправлять через одно соединение',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, проверяя очередь с интервалом',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками пустой очереди, в секундах',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = self.deliver(options['batch_size'])
+            if not options['loop']:
+                break
+            if not sent and not failed:
+                time.sleep(options['interval'])
+
+    def deliver(self, batch_size):
+        """Отправляет пакеты, пока в очереди есть готовые письма."""
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = deliver_pending(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if not sent:
+                break
+        if total_sent or total_failed:
+            self.stdout.write(
+                f'Отправлено писем: {total_sent}, ошибок: {total_failed}'
+            )
+        return total_sent, total_failed
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.1 on 2026-10-17 03:59
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    titles = Title.objects.annotate(
+        live_sum=Coalesce(Sum('reviews__score'), 0),
+        live_count=Count('reviews'),
+    ).filter(live_count__gt=0)
+    for title in titles.iterator(chunk_size=2000):
+        title.rating_sum = title.live_sum
+        title.rating_count = title.live_count
+        title.rating = title.live_sum / title.live_count
+        title.save(update_fields=('rating_sum', 'rating_count', 'rating'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_alter_category_name_alter_category_slug_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='text',
+            field=models.TextField(verbose_name='текст'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='score',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1, message='Оценка не может быть меньше 1.'), django.core.validators.MaxValueValidator(10, message='Оценка не может быть больше 10.')], verbose_name='оценка'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='text',
+            field=models.TextField(verbose_name='текст'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
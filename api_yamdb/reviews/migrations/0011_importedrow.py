@@ -0,0 +1,27 @@
+# Generated by Django 5.1.1 on 2026-10-17 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, verbose_name='файл')),
+                ('key', models.CharField(max_length=256, verbose_name='ключ строки')),
+                ('digest', models.CharField(max_length=64, verbose_name='хэш содержимого')),
+            ],
+            options={
+                'verbose_name': 'загруженная строка',
+                'verbose_name_plural': 'Загруженные строки',
+                'constraints': [models.UniqueConstraint(fields=('source', 'key'), name='unique_imported_row')],
+            },
+        ),
+    ]
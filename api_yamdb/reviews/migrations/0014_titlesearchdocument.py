@@ -0,0 +1,159 @@
+# Generated by Django 5.1.1 on 2026-10-17 04:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from ._stemmer import stem_text
+
+TOKENIZE = "tokenize='unicode61 remove_diacritics 0'"
+
+
+def fts_statements(fts, content, rowid, columns):
+    """Таблица FTS5 с внешним содержимым и триггеры синхронизации."""
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.{rowid}, {old}); "
+    )
+    insert = f'INSERT INTO {fts}(rowid, {names}) VALUES (new.{rowid}, {new}); '
+    return (
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, "
+        f"content='{content}', content_rowid='{rowid}', {TOKENIZE})",
+        f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {content} BEGIN '
+        f'{insert}END',
+        f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {content} BEGIN '
+        f'{delete}END',
+        f'CREATE TRIGGER {fts}_update AFTER UPDATE ON {content} BEGIN '
+        f'{delete}{insert}END',
+        # Индексирует строки, которые уже есть в таблице.
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    )
+
+
+def fts_drop(fts):
+    return (
+        f'DROP TRIGGER IF EXISTS {fts}_update',
+        f'DROP TRIGGER IF EXISTS {fts}_delete',
+        f'DROP TRIGGER IF EXISTS {fts}_insert',
+        f'DROP TABLE IF EXISTS {fts}',
+    )
+
+
+SQLITE_INDEX = (
+    *fts_statements(
+        'reviews_title_fts', 'reviews_titlesearchdocument', 'title_id',
+        ('name', 'description'),
+    ),
+    *fts_statements(
+        'reviews_review_fts', 'reviews_reviewsearchdocument', 'review_id',
+        ('text',),
+    ),
+)
+SQLITE_DROP = (*fts_drop('reviews_review_fts'), *fts_drop('reviews_title_fts'))
+# Стемминг выполняется в Python, поэтому используется конфигурация
+# simple: тексты уже приведены к основам одинаково для обеих БД.
+POSTGRES_INDEX = (
+    "ALTER TABLE reviews_titlesearchdocument ADD COLUMN search_vector "
+    "tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', name), 'A') || "
+    "setweight(to_tsvector('simple', description), 'B')) STORED",
+    "CREATE INDEX reviews_title_search_idx "
+    "ON reviews_titlesearchdocument USING GIN (search_vector)",
+    "ALTER TABLE reviews_reviewsearchdocument ADD COLUMN search_vector "
+    "tsvector GENERATED ALWAYS AS (to_tsvector('simple', text)) STORED",
+    "CREATE INDEX reviews_review_search_idx "
+    "ON reviews_reviewsearchdocument USING GIN (search_vector)",
+)
+POSTGRES_DROP = (
+    'DROP INDEX IF EXISTS reviews_review_search_idx',
+    'ALTER TABLE reviews_reviewsearchdocument '
+    'DROP COLUMN IF EXISTS search_vector',
+    'DROP INDEX IF EXISTS reviews_title_search_idx',
+    'ALTER TABLE reviews_titlesearchdocument '
+    'DROP COLUMN IF EXISTS search_vector',
+)
+
+
+def run_statements(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    TitleSearchDocument = apps.get_model('reviews', 'TitleSearchDocument')
+    ReviewSearchDocument = apps.get_model('reviews', 'ReviewSearchDocument')
+    TitleSearchDocument.objects.bulk_create(
+        (
+            TitleSearchDocument(
+                title_id=title_id,
+                name=stem_text(name),
+                description=stem_text(description),
+            )
+            for title_id, name, description in Title.objects.values_list(
+                'id', 'name', 'description'
+            ).iterator()
+        ),
+        batch_size=500,
+    )
+    ReviewSearchDocument.objects.bulk_create(
+        (
+            ReviewSearchDocument(
+                review_id=review_id, title_id=title_id,
+                text=stem_text(text),
+            )
+            for review_id, title_id, text in Review.objects.values_list(
+                'id', 'title_id', 'text'
+            ).iterator()
+        ),
+        batch_size=500,
+    )
+    run_statements(
+        schema_editor,
+        {'sqlite': SQLITE_INDEX, 'postgresql': POSTGRES_INDEX},
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    run_statements(
+        schema_editor,
+        {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleSearchDocument',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='reviews.title', verbose_name='произведение')),
+                ('name', models.TextField(verbose_name='название')),
+                ('description', models.TextField(blank=True, verbose_name='описание')),
+            ],
+            options={
+                'verbose_name': 'поисковый документ',
+                'verbose_name_plural': 'Поисковые документы',
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewSearchDocument',
+            fields=[
+                ('review', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='reviews.review', verbose_name='отзыв')),
+                ('text', models.TextField(blank=True, verbose_name='текст')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_search_documents', to='reviews.title', verbose_name='произведение')),
+            ],
+            options={
+                'verbose_name': 'поисковый документ отзыва',
+                'verbose_name_plural': 'Поисковые документы отзывов',
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
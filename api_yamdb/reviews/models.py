@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from .constants import (
     MAX_STR_LENGTH, MAX_CHAR_LENGTH, MAX_SLUG_LENGTH,
@@ -55,6 +56,9 @@ class User(AbstractUser):
         choices=Role.choices,
         default=Role.USER
     )
+    token_version = models.PositiveIntegerField(
+        'Версия токенов', default=0, editable=False
+    )
 
     class Meta:
         verbose_name = 'Пользователь'
@@ -80,6 +84,9 @@ class NameSlugAbstract(models.Model):
     class Meta:
         abstract = True
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name',), name='%(class)s_name_idx'),
+        )
 
     def __str__(self):
         return self.name[:MAX_STR_LENGTH]
@@ -99,6 +106,10 @@ class Genre(NameSlugAbstract):
         verbose_name_plural = 'Жанры'
 
 
+# Поля рейтинга, которые обновляются только из reviews.ratings.
+RATING_FIELDS = ('rating_sum', 'rating_count', 'rating')
+
+
 class Title(models.Model):
     name = models.CharField('Название', max_length=MAX_CHAR_LENGTH)
     year = models.SmallIntegerField(
@@ -117,16 +128,58 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Категория'
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок', default=0, editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок', default=0, editable=False
+    )
+    rating = models.FloatField(
+        'Рейтинг', null=True, blank=True, editable=False, db_index=True
+    )
+    updated_at = models.DateTimeField('дата изменения', auto_now=True)
 
     class Meta():
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
         default_related_name = 'titles'
         ordering = ('name', 'year')
+        indexes = (
+            models.Index(
+                fields=('name', 'year', 'id'), name='title_name_year_id_idx'
+            ),
+            models.Index(
+                fields=('year', 'name', 'id'), name='title_year_name_id_idx'
+            ),
+            models.Index(
+                fields=('category', 'name', 'year', 'id'),
+                name='title_category_name_idx'
+            ),
+            # Состояние списка для условного GET: MAX(updated_at) и COUNT.
+            models.Index(fields=('updated_at',), name='title_updated_at_idx'),
+        )
 
     def __str__(self):
         return self.name[:MAX_STR_LENGTH]
 
+    def save(self, **kwargs):
+        """Сохраняет произведение, не затрагивая рейтинг.
+
+        Рейтинг меняется атомарными UPDATE из reviews.ratings, поэтому
+        полное сохранение загруженного ранее произведения (сериализатор,
+        админка) не должно записывать прочитанные тогда значения.
+        """
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in RATING_FIELDS
+            ]
+        super().save(**kwargs)
+
 
 class AuthorTextPubdateAbstract(models.Model):
     author = models.ForeignKey(
@@ -136,6 +189,7 @@ class AuthorTextPubdateAbstract(models.Model):
     )
     text = models.TextField('текст')
     pub_date = models.DateTimeField('дата публикации', auto_now_add=True)
+    updated_at = models.DateTimeField('дата изменения', auto_now=True)
 
     class Meta:
         abstract = True
@@ -175,6 +229,25 @@ class Review(AuthorTextPubdateAbstract):
                 name='unique_review'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', '-id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает оценку и текст из БД для рейтинга и поиска."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        instance._loaded_text = instance.__dict__.get('text')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохраняет отзыв и обновляет рейтинг в одной транзакции."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
 
 class Comment(AuthorTextPubdateAbstract):
@@ -187,3 +260,129 @@ class Comment(AuthorTextPubdateAbstract):
     class Meta(AuthorTextPubdateAbstract.Meta):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', '-id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
+
+
+class TitleSearchDocument(models.Model):
+    """Поисковый документ произведения: основы слов его текстов.
+
+    Хранит название и описание уже после стемминга. Поверх таблицы
+    строится полнотекстовый индекс БД (FTS5 в SQLite, GIN по tsvector
+    в PostgreSQL). Тексты отзывов индексируются отдельно, в
+    ReviewSearchDocument.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document',
+        verbose_name='произведение'
+    )
+    name = models.TextField('название')
+    description = models.TextField('описание', blank=True)
+
+    class Meta:
+        verbose_name = 'поисковый документ'
+        verbose_name_plural = 'Поисковые документы'
+
+
+class ReviewSearchDocument(models.Model):
+    """Поисковый документ отзыва: основы слов его текста.
+
+    У каждого отзыва своя строка индекса, поэтому изменение отзыва
+    обновляет только ее, а не документ всего произведения.
+    """
+
+    review = models.OneToOneField(
+        Review,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document',
+        verbose_name='отзыв'
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='review_search_documents',
+        verbose_name='произведение'
+    )
+    text = models.TextField('текст', blank=True)
+
+    class Meta:
+        verbose_name = 'поисковый документ отзыва'
+        verbose_name_plural = 'Поисковые документы отзывов'
+
+
+class ImportedRow(models.Model):
+    """Отпечаток строки CSV, загруженной в режиме upsert.
+
+    Позволяет при повторной загрузке пропускать неизмененные строки.
+    """
+
+    source = models.CharField('файл', max_length=MAX_SLUG_LENGTH)
+    key = models.CharField('ключ строки', max_length=MAX_CHAR_LENGTH)
+    digest = models.CharField('хэш содержимого', max_length=64)
+
+    class Meta:
+        verbose_name = 'загруженная строка'
+        verbose_name_plural = 'Загруженные строки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('source', 'key'),
+                name='unique_imported_row'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.source}: {self.key}'[:MAX_STR_LENGTH]
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку.
+
+    Письма отправляет команда send_outbox, поэтому запрос не ждет SMTP.
+    """
+
+    class Status(models.TextChoices):
+        """Статусы отправки."""
+
+        PENDING = 'pending', 'Ожидает отправки'
+        SENT = 'sent', 'Отправлено'
+        FAILED = 'failed', 'Не отправлено'
+
+    recipient = models.EmailField('получатель', max_length=MAX_EMAIL_LENGTH)
+    subject = models.CharField('тема', max_length=MAX_CHAR_LENGTH)
+    body = models.TextField('текст')
+    status = models.CharField(
+        'статус',
+        max_length=max(len(status) for status, _ in Status.choices),
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('попыток', default=0)
+    next_attempt_at = models.DateTimeField(
+        'следующая попытка', default=timezone.now
+    )
+    last_error = models.TextField('последняя ошибка', blank=True)
+    created_at = models.DateTimeField('дата создания', auto_now_add=True)
+    sent_at = models.DateTimeField('дата отправки', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'письмо'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('next_attempt_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outgoing_email_queue_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'[:MAX_STR_LENGTH]
@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+OUTBOX_SETTINGS = {
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF_SECONDS': 30,
+    'MAX_BACKOFF_SECONDS': 3600,
+    # Сколько секунд взятые в отправку письма скрыты от других
+    # процессов. Если процесс упал, письма вернутся в очередь.
+    'CLAIM_SECONDS': 300,
+    'EAGER': False,
+    **getattr(settings, 'EMAIL_OUTBOX', {}),
+}
+
+
+def enqueue_email(subject, body, recipient):
+    """Ставит письмо в очередь.
+
+    В режиме EAGER письмо отправляется сразу после фиксации транзакции,
+    это удобно для разработки без отдельного процесса отправки.
+    """
+    email = OutgoingEmail.objects.create(
+        subject=subject, body=body, recipient=recipient
+    )
+    if OUTBOX_SETTINGS['EAGER']:
+        transaction.on_commit(lambda: deliver_pending(ids=(email.pk,)))
+    return email
+
+
+def get_backoff(attempts):
+    """Задержка перед следующей попыткой растет экспоненциально."""
+    delay = OUTBOX_SETTINGS['BACKOFF_SECONDS'] * 2 ** (attempts - 1)
+    return timedelta(
+        seconds=min(delay, OUTBOX_SETTINGS['MAX_BACKOFF_SECONDS'])
+    )
+
+
+def mark_failed(email, error, now):
+    """Назначает повторную попытку или помечает письмо неотправленным."""
+    email.last_error = repr(error)
+    if email.attempts >= OUTBOX_SETTINGS['MAX_ATTEMPTS']:
+        email.status = OutgoingEmail.Status.FAILED
+    else:
+        email.next_attempt_at = now + get_backoff(email.attempts)
+
+
+def send_batch(emails, now):
+    """Отправляет письма через одно соединение, возвращает число ошибок."""
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            mark_failed(email, error, now)
+        return len(emails)
+    failed = 0
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject,
+                email.body,
+                settings.DEFAULT_FROM_EMAIL,
+                [email.recipient],
+                connection=connection,
+            )
+            try:
+                connection.send_messages([message])
+            except Exception as error:
+                failed += 1
+                mark_failed(email, error, now)
+            else:
+                email.status = OutgoingEmail.Status.SENT
+                email.sent_at = timezone.now()
+                email.last_error = ''
+    finally:
+        connection.close()
+    return failed
+
+
+def claim_batch(queue, batch_size, now):
+    """Забирает пакет писем в отправку короткой транзакцией.
+
+    Письма получают новую попытку и откладываются на CLAIM_SECONDS,
+    поэтому другие процессы их не берут, а блокировки строк
+    снимаются до обращения к почтовому серверу.
+    """
+    with transaction.atomic():
+        emails = list(
+            queue.select_for_update(skip_locked=True)
+            .order_by('next_attempt_at', 'id')
+            [:batch_size or OUTBOX_SETTINGS['BATCH_SIZE']]
+        )
+        claimed_until = now + timedelta(
+            seconds=OUTBOX_SETTINGS['CLAIM_SECONDS']
+        )
+        for email in emails:
+            email.attempts += 1
+            email.next_attempt_at = claimed_until
+        OutgoingEmail.objects.bulk_update(
+            emails, ('attempts', 'next_attempt_at')
+        )
+    return emails
+
+
+def deliver_pending(batch_size=None, ids=None):
+    """Отправляет готовые к отправке письма одним пакетом.
+
+    Возвращает пару (отправлено, ошибок). Ошибка одного письма
+    не мешает остальным: оно получает новую попытку с задержкой.
+    """
+    now = timezone.now()
+    queue = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.Status.PENDING, next_attempt_at__lte=now
+    )
+    if ids is not None:
+        queue = queue.filter(pk__in=ids)
+    emails = claim_batch(queue, batch_size, now)
+    if not emails:
+        return 0, 0
+    failed = send_batch(emails, now)
+    OutgoingEmail.objects.bulk_update(
+        emails, ('status', 'next_attempt_at', 'last_error', 'sent_at')
+    )
+    return len(emails) - failed, failed
@@ -0,0 +1,77 @@
+from django.db.models import (
+    Case, Count, F, FloatField, Sum, Value, When
+)
+from django.db.models.functions import Cast, Coalesce, Now
+from django.utils import timezone
+
+from .models import Title
+
+
+def rating_update(score_delta, count_delta):
+    """Возвращает выражения для атомарного изменения рейтинга в UPDATE.
+
+    Все выражения ссылаются на значения строки до обновления, поэтому
+    сумма, количество и средняя оценка меняются одним запросом.
+    """
+    new_sum = F('rating_sum') + score_delta
+    new_count = F('rating_count') + count_delta
+    return {
+        'rating_sum': new_sum,
+        'rating_count': new_count,
+        'rating': Case(
+            When(rating_count__lte=-count_delta, then=Value(None)),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField(),
+        ),
+        'updated_at': Now(),
+    }
+
+
+def apply_rating_change(title_id, score_delta, count_delta):
+    """Изменяет сохраненный рейтинг произведения на указанные величины."""
+    if not score_delta and not count_delta:
+        return
+    Title.objects.filter(pk=title_id).update(
+        **rating_update(score_delta, count_delta)
+    )
+
+
+def live_ratings(queryset=None):
+    """Аннотирует произведения рейтингом, посчитанным по отзывам."""
+    if queryset is None:
+        queryset = Title.objects.all()
+    return queryset.annotate(
+        live_sum=Coalesce(Sum('reviews__score'), 0),
+        live_count=Count('reviews'),
+    ).order_by('pk')
+
+
+def find_rating_mismatches(queryset=None):
+    """Возвращает произведения, у которых рейтинг расходится с отзывами."""
+    mismatches = []
+    for title in live_ratings(queryset).iterator(chunk_size=2000):
+        live_rating = (
+            title.live_sum / title.live_count if title.live_count else None
+        )
+        if (
+            title.rating_sum != title.live_sum
+            or title.rating_count != title.live_count
+            or title.rating != live_rating
+        ):
+            title.rating_sum = title.live_sum
+            title.rating_count = title.live_count
+            title.rating = live_rating
+            title.updated_at = timezone.now()
+            mismatches.append(title)
+    return mismatches
+
+
+def rebuild_ratings(queryset=None, batch_size=500):
+    """Пересчитывает сохраненные рейтинги и возвращает число исправлений."""
+    mismatches = find_rating_mismatches(queryset)
+    Title.objects.bulk_update(
+        mismatches,
+        ('rating_sum', 'rating_count', 'rating', 'updated_at'),
+        batch_size=batch_size,
+    )
+    return len(mismatches)
@@ -0,0 +1,179 @@
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Review, ReviewSearchDocument, Title, TitleSearchDocument
+from .stemmer import stem, stem_text, tokenize
+
+TITLE_FTS = 'reviews_title_fts'
+REVIEW_FTS = 'reviews_review_fts'
+# Веса bm25 и setweight: совпадение в названии важнее описания.
+# Отзывы ранжируются отдельно, в выдачу идет лучший отзыв произведения.
+SQLITE_TITLE_RANK = f'bm25({TITLE_FTS}, 10.0, 4.0)'
+SQLITE_REVIEW_RANK = f'bm25({REVIEW_FTS})'
+POSTGRES_QUERY = "to_tsquery('simple', %s)"
+NO_RANK = Value(0.0, output_field=FloatField())
+
+
+def build_title_document(title_id, name, description):
+    return TitleSearchDocument(
+        title_id=title_id,
+        name=stem_text(name),
+        description=stem_text(description),
+    )
+
+
+def build_review_document(review_id, title_id, text):
+    return ReviewSearchDocument(
+        review_id=review_id, title_id=title_id, text=stem_text(text)
+    )
+
+
+def save_title_documents(documents):
+    TitleSearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=('title',),
+        update_fields=('name', 'description'),
+    )
+
+
+def save_review_documents(documents):
+    ReviewSearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=('review',),
+        update_fields=('title', 'text'),
+    )
+
+
+def index_title(title):
+    """Обновляет поисковый документ одного произведения."""
+    save_title_documents((
+        build_title_document(title.pk, title.name, title.description),
+    ))
+
+
+def index_review(review):
+    """Обновляет строку поискового индекса одного отзыва."""
+    save_review_documents((
+        build_review_document(review.pk, review.title_id, review.text),
+    ))
+
+
+def update_search_documents(title_ids):
+    """Пересобирает документы произведений и всех их отзывов.
+
+    Документы удаленных произведений и отзывов удаляются каскадом.
+    """
+    title_ids = set(title_ids)
+    if not title_ids:
+        return
+    save_title_documents([
+        build_title_document(*row)
+        for row in Title.objects.filter(pk__in=title_ids).values_list(
+            'id', 'name', 'description'
+        )
+    ])
+    save_review_documents([
+        build_review_document(*row)
+        for row in Review.objects.filter(title__in=title_ids).values_list(
+            'id', 'title_id', 'text'
+        )
+    ])
+
+
+def rebuild_search_index(queryset=None, batch_size=500):
+    """Пересобирает документы всех или выбранных произведений."""
+    if queryset is None:
+        queryset = Title.objects.all()
+    title_ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(title_ids), batch_size):
+        update_search_documents(title_ids[start:start + batch_size])
+    return len(title_ids)
+
+
+def search_terms(query):
+    """Основы слов поискового запроса без повторов, в исходном порядке."""
+    return list(dict.fromkeys(stem(word) for word in tokenize(query)))
+
+
+def search_sqlite(queryset, terms):
+    table = queryset.model._meta.db_table
+    documents = ReviewSearchDocument._meta.db_table
+    for term in terms:
+        # Слово может встретиться в документе произведения или в любом
+        # из его отзывов.
+        queryset = queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {TITLE_FTS} WHERE {TITLE_FTS} MATCH %s '
+            f'UNION SELECT d.title_id FROM {REVIEW_FTS} '
+            f'JOIN {documents} d ON d.review_id = {REVIEW_FTS}.rowid '
+            f'WHERE {REVIEW_FTS} MATCH %s',
+            (f'"{term}"*', f'"{term}"*'),
+        ))
+    match = ' OR '.join(f'"{term}"*' for term in terms)
+    # bm25 нельзя передать в агрегат, поэтому ранги отзывов считаются
+    # в подзапросе. LIMIT -1 не дает SQLite встроить его во внешний.
+    return queryset.annotate(search_rank=RawSQL(
+        f'COALESCE((SELECT -{SQLITE_TITLE_RANK} FROM {TITLE_FTS} '
+        f'WHERE {TITLE_FTS} MATCH %s AND rowid = {table}.id), 0) + '
+        f'COALESCE((SELECT MAX(m.rank) FROM ('
+        f'SELECT -{SQLITE_REVIEW_RANK} AS rank, rowid AS review_id '
+        f'FROM {REVIEW_FTS} WHERE {REVIEW_FTS} MATCH %s LIMIT -1) m '
+        f'JOIN {documents} d ON d.review_id = m.review_id '
+        f'WHERE d.title_id = {table}.id), 0)',
+        (match, match),
+        output_field=FloatField(),
+    ))
+
+
+def search_postgresql(queryset, terms):
+    table = queryset.model._meta.db_table
+    titles = TitleSearchDocument._meta.db_table
+    reviews = ReviewSearchDocument._meta.db_table
+    for term in terms:
+        queryset = queryset.filter(pk__in=RawSQL(
+            f'SELECT title_id FROM {titles} '
+            f'WHERE search_vector @@ {POSTGRES_QUERY} '
+            f'UNION SELECT title_id FROM {reviews} '
+            f'WHERE search_vector @@ {POSTGRES_QUERY}',
+            (f'{term}:*', f'{term}:*'),
+        ))
+    tsquery = ' | '.join(f'{term}:*' for term in terms)
+    return queryset.annotate(search_rank=RawSQL(
+        f'COALESCE((SELECT ts_rank(search_vector, {POSTGRES_QUERY}) '
+        f'FROM {titles} WHERE title_id = {table}.id), 0) + '
+        f'COALESCE((SELECT MAX(ts_rank(search_vector, {POSTGRES_QUERY})) '
+        f'FROM {reviews} WHERE title_id = {table}.id '
+        f'AND search_vector @@ {POSTGRES_QUERY}), 0)',
+        (tsquery, tsquery, tsquery),
+        output_field=FloatField(),
+    ))
+
+
+def search_titles(queryset, query):
+    """Фильтрует произведения по запросу и аннотирует их `search_rank`.
+
+    Каждое слово запроса должно встретиться в названии, описании или
+    хотя бы одном отзыве, слова сравниваются по основе как префикс.
+    Ранг складывается из ранга документа произведения и лучшего из
+    его отзывов и считается при запросе. Чем больше `search_rank`,
+    тем выше произведение в выдаче.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.annotate(search_rank=NO_RANK).none()
+    if connection.vendor == 'sqlite':
+        return search_sqlite(queryset, terms)
+    if connection.vendor == 'postgresql':
+        return search_postgresql(queryset, terms)
+    # Остальные БД: поиск без индекса по тем же основам слов.
+    for term in terms:
+        queryset = queryset.filter(
+            Q(search_document__name__contains=term)
+            | Q(search_document__description__contains=term)
+            | Q(pk__in=ReviewSearchDocument.objects.filter(
+                text__contains=term
+            ).values('title_id'))
+        )
+    return queryset.annotate(search_rank=NO_RANK)
@@ -0,0 +1,79 @@
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_save
+)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .models import Review, Title
+from .ratings import apply_rating_change
+from .search import index_review, index_title
+
+# Отправляется после массовых изменений, которые обходят сигналы моделей.
+bulk_data_changed = Signal()
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    """Подгружает прежнюю оценку, если отзыв пришел без нее."""
+    if instance._state.adding or instance.pk is None:
+        return
+    if getattr(instance, '_loaded_score', None) is None:
+        instance._loaded_score = (
+            Review.objects.filter(pk=instance.pk)
+            .values_list('score', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    """Учитывает новую или измененную оценку в рейтинге произведения."""
+    if created:
+        apply_rating_change(instance.title_id, instance.score, 1)
+    else:
+        previous = getattr(instance, '_loaded_score', None)
+        if previous is None:
+            previous = instance.score
+        apply_rating_change(instance.title_id, instance.score - previous, 0)
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """Убирает оценку удаленного отзыва из рейтинга произведения."""
+    score = getattr(instance, '_loaded_score', None)
+    if score is None:
+        score = instance.score
+    apply_rating_change(instance.title_id, -score, -1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_title_on_genres_change(sender, instance, action, reverse,
+                                 pk_set, **kwargs):
+    """Обновляет дату изменения произведений при смене их жанров."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        titles = Title.objects.filter(pk=instance.pk)
+    elif action == 'pre_clear':
+        titles = instance.titles.all()
+    else:
+        titles = Title.objects.filter(pk__in=pk_set)
+    titles.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Title)
+def index_title_on_save(sender, instance, **kwargs):
+    """Обновляет поисковый документ после изменения произведения."""
+    index_title(instance)
+
+
+@receiver(post_save, sender=Review)
+def index_review_on_save(sender, instance, created, **kwargs):
+    """Обновляет строку индекса отзыва, если его текст изменился.
+
+    Строка удаленного отзыва удаляется каскадом.
+    """
+    if created or instance.text != getattr(instance, '_loaded_text', None):
+        index_review(instance)
+    instance._loaded_text = instance.text
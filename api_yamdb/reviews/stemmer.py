@@ -0,0 +1,122 @@
+"""Стемминг русских слов для полнотекстового поиска.
+
+Упрощенная реализация алгоритма Snowball для русского языка: окончания
+снимаются только в области RV, после первой гласной. Основы хранятся
+в поисковом индексе, поэтому при изменении алгоритма индекс нужно
+пересобрать командой rebuild_search_index.
+"""
+import re
+
+WORD_RE = re.compile(r'\w+')
+VOWELS = frozenset('аеиоуыэюя')
+
+PERFECTIVE_GERUND = (
+    ('в', 'вши', 'вшись'),
+    ('ив', 'ивши', 'ившись', 'ыв', 'ывши', 'ывшись'),
+)
+REFLEXIVE = ((), ('ся', 'сь'))
+ADJECTIVE = ((), (
+    'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем',
+    'им', 'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю',
+    'ая', 'яя', 'ою', 'ею',
+))
+PARTICIPLE = (
+    ('ем', 'нн', 'вш', 'ющ', 'щ'),
+    ('ивш', 'ывш', 'ующ'),
+)
+VERB = (
+    ('ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет',
+     'ют', 'ны', 'ть', 'ешь', 'нно'),
+    ('ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй',
+     'ил', 'ыл', 'им', 'ым', 'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют',
+     'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю'),
+)
+NOUN = ((), (
+    'а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и',
+    'ией', 'ей', 'ой', 'ий', 'й', 'иям', 'ям', 'ием', 'ем', 'ам', 'ом', 'о',
+    'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия', 'ья', 'я',
+))
+SUPERLATIVE = ('ейше', 'ейш')
+DERIVATIONAL = ('ость', 'ост')
+
+
+def _after_vowel(word, start=0):
+    """Позиция после первой пары «гласная, согласная» начиная со start."""
+    for i in range(start + 1, len(word)):
+        if word[i] not in VOWELS and word[i - 1] in VOWELS:
+            return i + 1
+    return len(word)
+
+
+def _strip(word, start, groups):
+    """Снимает самое длинное подходящее окончание внутри word[start:].
+
+    Окончания первой группы должны идти после «а» или «я».
+    """
+    after_a, plain = groups
+    endings = sorted(
+        [(ending, True) for ending in after_a]
+        + [(ending, False) for ending in plain],
+        key=lambda item: -len(item[0]),
+    )
+    for ending, needs_a in endings:
+        stem = word[:len(word) - len(ending)]
+        if not word.endswith(ending) or len(stem) < start:
+            continue
+        if needs_a and (len(stem) <= start or stem[-1] not in 'ая'):
+            continue
+        return stem
+    return None
+
+
+def _stem(word):
+    rv = next(
+        (i + 1 for i, letter in enumerate(word) if letter in VOWELS),
+        len(word),
+    )
+    r2 = _after_vowel(word, _after_vowel(word))
+
+    stem = _strip(word, rv, PERFECTIVE_GERUND)
+    if stem is None:
+        word = _strip(word, rv, REFLEXIVE) or word
+        stem = _strip(word, rv, ADJECTIVE)
+        if stem is not None:
+            stem = _strip(stem, rv, PARTICIPLE) or stem
+        else:
+            stem = _strip(word, rv, VERB) or _strip(word, rv, NOUN)
+    word = stem or word
+
+    if word.endswith('и') and len(word) > rv:
+        word = word[:-1]
+    for ending in DERIVATIONAL:
+        if word.endswith(ending) and len(word) - len(ending) >= r2:
+            word = word[:-len(ending)]
+            break
+
+    for ending in SUPERLATIVE:
+        if word.endswith(ending) and len(word) - len(ending) >= rv:
+            word = word[:-len(ending)]
+            break
+    if word.endswith('нн') and len(word) - 1 > rv:
+        return word[:-1]
+    if word.endswith('ь') and len(word) > rv:
+        return word[:-1]
+    return word
+
+
+def stem(word):
+    """Возвращает основу слова в нижнем регистре."""
+    word = word.lower().replace('ё', 'е')
+    if not any(letter in VOWELS for letter in word):
+        return word
+    return _stem(word)
+
+
+def tokenize(text):
+    """Разбивает текст на слова в нижнем регистре."""
+    return WORD_RE.findall((text or '').lower().replace('ё', 'е'))
+
+
+def stem_text(text):
+    """Заменяет слова текста их основами, разделяя их пробелами."""
+    return ' '.join(stem(word) for word in tokenize(text))
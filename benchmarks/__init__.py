@@ -0,0 +1,53 @@
+"""Бенчмарки API.
+
+Запускаются из корня репозитория: `python -m benchmarks.<модуль>`.
+Каждый бенчмарк работает на отдельной тестовой базе, рабочая база
+не затрагивается.
+"""
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'api_yamdb'))
+
+
+def setup_django(database=True):
+    """Настраивает Django и, если нужно, создает пустую тестовую базу.
+
+    Возвращает функцию, которая удаляет тестовую базу.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    django.setup()
+    if not database:
+        return lambda: None
+
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment, teardown_test_environment
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    def teardown():
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    return teardown
+
+
+def measure(func, repeat=5):
+    """Запускает функцию `repeat` раз и возвращает время в секундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+    }
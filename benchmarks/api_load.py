@@ -0,0 +1,388 @@
+"""Нагрузочный прогон всех эндпоинтов API через тестовый клиент.
+
+Заполняет тестовую базу синтетическими данными generate_dataset
+(reviews.dataset), выполняет каждый маршрут из api/urls.py заданное
+число раз и сохраняет в JSON пропускную способность, перцентили
+задержки и число SQL-запросов на запрос. Сеть не нужна.
+
+    python -m benchmarks.api_load --titles 500 --reviews 5000 \\
+        --output results.json
+    python -m benchmarks.api_load --compare results.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from io import StringIO
+from unittest import mock
+
+from benchmarks import ROOT, setup_django
+
+Scenario = namedtuple('Scenario', ('name', 'method', 'build', 'admin'))
+
+WORDS = (
+    'фильм', 'книга', 'песня', 'сюжет', 'герой', 'финал', 'актер',
+    'роман', 'автор', 'музыка', 'смысл', 'история', 'мир', 'время',
+)
+
+
+def text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def seed(users=100, categories=5, genres=10, titles=200, reviews=1000,
+         comments=2000, random_seed=0):
+    """Заполняет базу данными generate_dataset и возвращает их ключи.
+
+    Файлы загружаются командой load_csv_data, поэтому бенчмарк работает
+    с той же формой данных, что и команды наполнения базы.
+    """
+    from django.core.management import call_command
+
+    from api.user_cache import user_cache
+    from reviews.dataset import DatasetGenerator
+    from reviews.models import Category, Genre, Review, Title, User
+
+    generator = DatasetGenerator(
+        users=users, categories=categories, genres=genres, titles=titles,
+        reviews=reviews, comments=comments, seed=random_seed,
+    )
+    with tempfile.TemporaryDirectory() as data_dir:
+        generator.write(data_dir)
+        call_command('load_csv_data', data_dir=data_dir, stdout=StringIO())
+    user_cache.clear()
+    usernames = list(
+        User.objects.order_by('pk').values_list('username', flat=True)
+    )
+    admin = User.objects.create(
+        username='bench-admin', email='bench-admin@yamdb.fake',
+        role=User.Role.ADMIN,
+    )
+    return {
+        'admin': admin,
+        'titles': list(
+            Title.objects.order_by('pk').values_list('pk', flat=True)
+        ),
+        'reviews': list(
+            Review.objects.order_by('pk').values_list('title_id', 'pk')
+        ),
+        'category': Category.objects.order_by('pk').first().slug,
+        'genre': Genre.objects.order_by('pk').first().slug,
+        'users': usernames,
+        'created': {},
+    }
+
+
+def pick(items, i):
+    return items[i % len(items)]
+
+
+def review_url(data, i):
+    title_id, review_id = pick(data['reviews'], i)
+    return f'/api/v1/titles/{title_id}/reviews/{review_id}/'
+
+
+def created(data, name, i):
+    return pick(data['created'][name], i)
+
+
+# Сценарии идут по порядку: чтение, создание, изменение, удаление.
+# Изменения и удаления работают с объектами, созданными раньше.
+SCENARIOS = (
+    Scenario('api-root', 'get', lambda d, i: ('/api/v1/', None), False),
+    Scenario('titles-list', 'get', lambda d, i: (
+        '/api/v1/titles/', None), False),
+    Scenario('titles-list-filtered', 'get', lambda d, i: (
+        f'/api/v1/titles/?genre={d["genre"]}&ordering=-rating', None),
+        False),
+    Scenario('titles-list-cursor', 'get', lambda d, i: (
+        '/api/v1/titles/?pagination=cursor', None), False),
+    Scenario('titles-search', 'get', lambda d, i: (
+        f'/api/v1/titles/?search={pick(WORDS, i)}', None), False),
+    Scenario('titles-detail', 'get', lambda d, i: (
+        f'/api/v1/titles/{pick(d["titles"], i)}/', None), False),
+    Scenario('categories-list', 'get', lambda d, i: (
+        '/api/v1/categories/', None), False),
+    Scenario('genres-list', 'get', lambda d, i: (
+        '/api/v1/genres/', None), False),
+    Scenario('reviews-list', 'get', lambda d, i: (
+        f'/api/v1/titles/{pick(d["titles"], i)}/reviews/', None), False),
+    Scenario('reviews-detail', 'get', lambda d, i: (
+        review_url(d, i), None), False),
+    Scenario('comments-list', 'get', lambda d, i: (
+        f'{review_url(d, i)}comments/', None), False),
+    Scenario('users-list', 'get', lambda d, i: (
+        '/api/v1/users/', None), True),
+    Scenario('users-detail', 'get', lambda d, i: (
+        f'/api/v1/users/{pick(d["users"], i)}/', None), True),
+    Scenario('users-me', 'get', lambda d, i: (
+        '/api/v1/users/me/', None), True),
+    Scenario('auth-signup', 'post', lambda d, i: ('/api/v1/auth/signup/', {
+        'username': f'signup{i}', 'email': f'signup{i}@yamdb.fake',
+    }), False),
+    Scenario('auth-token', 'post', lambda d, i: (
+        '/api/v1/auth/token/', d['token_request']), False),
+    Scenario('categories-create', 'post', lambda d, i: (
+        '/api/v1/categories/',
+        {'name': f'Новая {i}', 'slug': f'bench-category-{i}'}), True),
+    Scenario('genres-create', 'post', lambda d, i: (
+        '/api/v1/genres/',
+        {'name': f'Новый {i}', 'slug': f'bench-genre-{i}'}), True),
+    Scenario('titles-create', 'post', lambda d, i: ('/api/v1/titles/', {
+        'name': f'Новое {i}', 'year': 2000, 'genre': [d['genre']],
+        'category': d['category'], 'description': text(random, 10),
+    }), True),
+    Scenario('reviews-create', 'post', lambda d, i: (
+        f'/api/v1/titles/{pick(d["titles"], i)}/reviews/',
+        {'text': text(random, 20), 'score': 8}), True),
+    Scenario('comments-create', 'post', lambda d, i: (
+        f'{review_url(d, i)}comments/', {'text': text(random, 8)}), True),
+    Scenario('users-create', 'post', lambda d, i: ('/api/v1/users/', {
+        'username': f'created{i}', 'email': f'created{i}@yamdb.fake',
+    }), True),
+    Scenario('titles-update', 'patch', lambda d, i: (
+        f'/api/v1/titles/{created(d, "titles-create", i)}/',
+        {'name': f'Измененное {i}'}), True),
+    Scenario('reviews-update', 'patch', lambda d, i: (
+        created(d, 'reviews-create', i), {'text': text(random, 20)}), True),
+    Scenario('comments-update', 'patch', lambda d, i: (
+        created(d, 'comments-create', i), {'text': text(random, 8)}), True),
+    Scenario('users-update', 'patch', lambda d, i: (
+        f'/api/v1/users/{created(d, "users-create", i)}/',
+        {'bio': text(random, 5)}), True),
+    Scenario('users-me-update', 'patch', lambda d, i: (
+        '/api/v1/users/me/', {'bio': text(random, 5)}), True),
+    Scenario('comments-delete', 'delete', lambda d, i: (
+        created(d, 'comments-create', i), None), True),
+    Scenario('reviews-delete', 'delete', lambda d, i: (
+        created(d, 'reviews-create', i), None), True),
+    Scenario('titles-delete', 'delete', lambda d, i: (
+        f'/api/v1/titles/{created(d, "titles-create", i)}/', None), True),
+    Scenario('categories-delete', 'delete', lambda d, i: (
+        f'/api/v1/categories/bench-category-{i}/', None), True),
+    Scenario('genres-delete', 'delete', lambda d, i: (
+        f'/api/v1/genres/bench-genre-{i}/', None), True),
+    Scenario('users-delete', 'delete', lambda d, i: (
+        f'/api/v1/users/{created(d, "users-create", i)}/', None), True),
+)
+# Что запомнить из ответа на создание для следующих сценариев.
+CREATED_KEYS = {
+    'titles-create': lambda url, body: body['id'],
+    'reviews-create': lambda url, body: f'{url}{body["id"]}/',
+    'comments-create': lambda url, body: f'{url}{body["id"]}/',
+    'users-create': lambda url, body: body['username'],
+}
+
+
+def percentiles(values):
+    from api.query_budget import percentile
+
+    values = sorted(values)
+    return {f'p{rank}': percentile(values, rank) for rank in (50, 95, 99)}
+
+
+def run_scenario(scenario, clients, data, requests, warmup):
+    """Выполняет сценарий и возвращает его замеры."""
+    from django.db import connections
+    from django.urls import resolve
+
+    from api.query_budget import QueryCounter
+
+    client = clients[scenario.admin]
+    send = getattr(client, scenario.method)
+    latencies, queries, statuses = [], [], {}
+    url = None
+    started = time.perf_counter()
+    for i in range(-warmup, requests):
+        # Прогрев только для чтения: запись изменяет данные.
+        if i < 0 and scenario.method != 'get':
+            continue
+        index = i if i >= 0 else requests + i
+        url, body = scenario.build(data, index)
+        counter = QueryCounter()
+        request_started = time.perf_counter()
+        with connections['default'].execute_wrapper(counter):
+            response = send(url, body, content_type='application/json')
+        elapsed = time.perf_counter() - request_started
+        if i < 0:
+            started = time.perf_counter()
+            continue
+        latencies.append(elapsed * 1000)
+        queries.append(counter.queries)
+        statuses[response.status_code] = (
+            statuses.get(response.status_code, 0) + 1
+        )
+        if scenario.name in CREATED_KEYS and response.status_code == 201:
+            data['created'].setdefault(scenario.name, []).append(
+                CREATED_KEYS[scenario.name](url, response.json())
+            )
+    total = time.perf_counter() - started
+    return {
+        'method': scenario.method.upper(),
+        'route': resolve(url.split('?')[0]).view_name if url else None,
+        'requests': len(latencies),
+        'errors': sum(
+            count for status, count in statuses.items() if status >= 400
+        ),
+        'statuses': {str(status): n for status, n in statuses.items()},
+        'throughput_rps': len(latencies) / total if total else None,
+        'latency_ms': {
+            **percentiles(latencies),
+            'mean': sum(latencies) / len(latencies) if latencies else None,
+        },
+        'queries': {**percentiles(queries), 'max': max(queries, default=0)},
+    }
+
+
+def run(requests=50, warmup=2, response_cache=False, **dataset):
+    """Заполняет базу, прогоняет все сценарии и возвращает отчет."""
+    import django
+    from django.contrib.auth.tokens import default_token_generator
+    from django.db import connection
+    from django.test import Client
+
+    from api import audit
+    from api.authentication import issue_access_token
+    from api.cache import response_cache_enabled
+
+    random.seed(dataset.get('random_seed', 0))
+    # Коды подтверждения из регистраций не должны попадать в журнал.
+    # Настройки процесса возвращаются после прогона.
+    with mock.patch.dict(audit.AUDIT_SETTINGS, SINK='disabled'), \
+            response_cache_enabled(response_cache):
+        data = seed(**dataset)
+        admin = data['admin']
+        data['token_request'] = {
+            'username': admin.username,
+            'confirmation_code': default_token_generator.make_token(admin),
+        }
+        clients = {
+            False: Client(),
+            True: Client(
+                HTTP_AUTHORIZATION=f'Bearer {issue_access_token(admin)}'
+            ),
+        }
+        endpoints = {
+            scenario.name: run_scenario(
+                scenario, clients, data, requests, warmup
+            )
+            for scenario in SCENARIOS
+        }
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'requests': requests,
+            'response_cache': response_cache,
+            'dataset': dataset,
+        },
+        'endpoints': endpoints,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'), cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold):
+    """Ищет регрессии: рост SQL-запросов или p95 задержки сверх порога."""
+    regressions = []
+    for name, result in current['endpoints'].items():
+        old = baseline['endpoints'].get(name)
+        if old is None:
+            continue
+        if result['queries']['max'] > old['queries']['max']:
+            regressions.append(
+                f'{name}: SQL-запросов {old["queries"]["max"]} -> '
+                f'{result["queries"]["max"]}'
+            )
+        old_p95 = old['latency_ms']['p95']
+        new_p95 = result['latency_ms']['p95']
+        if old_p95 and new_p95 and new_p95 > old_p95 * (1 + threshold):
+            regressions.append(
+                f'{name}: p95 {old_p95:.1f} мс -> {new_p95:.1f} мс'
+            )
+        if result['errors'] > old['errors']:
+            regressions.append(
+                f'{name}: ошибок {old["errors"]} -> {result["errors"]}'
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--categories', type=int, default=5)
+    parser.add_argument('--genres', type=int, default=10)
+    parser.add_argument('--titles', type=int, default=200)
+    parser.add_argument('--reviews', type=int, default=1000)
+    parser.add_argument('--comments', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--requests', type=int, default=50,
+        help='Запросов на каждый сценарий',
+    )
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument(
+        '--response-cache', action='store_true',
+        help='Не выключать кэш ответов API',
+    )
+    parser.add_argument('--output', help='Файл для отчета в JSON')
+    parser.add_argument(
+        '--compare', help='Отчет прошлого прогона для поиска регрессий'
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=0.25,
+        help='Допустимый рост p95 задержки, доля (по умолчанию 0.25)',
+    )
+    args = parser.parse_args()
+
+    teardown = setup_django()
+    try:
+        report = run(
+            requests=args.requests, warmup=args.warmup,
+            response_cache=args.response_cache,
+            users=args.users, categories=args.categories,
+            genres=args.genres, titles=args.titles, reviews=args.reviews,
+            comments=args.comments, random_seed=args.seed,
+        )
+    finally:
+        teardown()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f'{"сценарий":<22} {"RPS":>8} {"p50, мс":>8} {"p95, мс":>8} '
+          f'{"p99, мс":>8} {"SQL p50":>8} {"ошибок":>7}')
+    for name, result in report['endpoints'].items():
+        latency = result['latency_ms']
+        print(f'{name:<22} {result["throughput_rps"]:>8.1f} '
+              f'{latency["p50"]:>8.2f} {latency["p95"]:>8.2f} '
+              f'{latency["p99"]:>8.2f} {result["queries"]["p50"]:>8} '
+              f'{result["errors"]:>7}')
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            regressions = compare(json.load(file), report, args.threshold)
+        for line in regressions:
+            print(f'Регрессия: {line}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Сравнение кодировщиков ответа на страницах отзывов.
+
+Отзывы с длинным текстом на кириллице кодируются стандартным
+JSONRenderer, FastJSONRenderer и, если установлен msgpack,
+MessagePackRenderer.
+
+    python -m benchmarks.json_encoders --reviews 10 100 1000
+"""
+import argparse
+import json
+import random
+
+from benchmarks import measure, setup_django
+
+WORDS = (
+    'фильм', 'сюжет', 'актеры', 'режиссер', 'музыка', 'финал', 'герой',
+    'сценарий', 'атмосфера', 'впечатление', 'неожиданно', 'прекрасно',
+    'скучно', 'рекомендую', 'пересмотрю', 'книга', 'автор', 'глава',
+)
+
+
+def build_page(count, words, seed=0):
+    """Страница отзывов в том виде, в каком ее отдает сериализатор."""
+    rng = random.Random(seed)
+    return {
+        'count': count,
+        'next': 'http://testserver/api/v1/titles/1/reviews/?page=2',
+        'previous': None,
+        'results': [
+            {
+                'id': i,
+                'title': 1,
+                'text': ' '.join(rng.choices(WORDS, k=words)).capitalize(),
+                'author': f'user_{rng.randrange(1000)}',
+                'score': rng.randint(1, 10),
+                'pub_date': f'2024-01-{i % 28 + 1:02}T12:00:00.000000+03:00',
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def get_renderers():
+    from rest_framework.renderers import JSONRenderer
+
+    from api import renderers
+
+    result = {'json': JSONRenderer()}
+    if renderers.orjson is not None:
+        result['orjson'] = renderers.FastJSONRenderer()
+    if renderers.msgpack is not None:
+        result['msgpack'] = renderers.MessagePackRenderer()
+    return result
+
+
+def run(sizes, words, repeat):
+    results = []
+    for size in sizes:
+        page = build_page(size, words)
+        for name, renderer in get_renderers().items():
+            timing = measure(lambda: renderer.render(page), repeat)
+            results.append({
+                'encoder': name,
+                'reviews': size,
+                'bytes': len(renderer.render(page)),
+                'us_per_review': timing['median'] / size * 1e6,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--reviews', type=int, nargs='+', default=(10, 100, 1000)
+    )
+    parser.add_argument(
+        '--words', type=int, default=80, help='Слов в тексте отзыва'
+    )
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    setup_django(database=False)
+    results = run(args.reviews, args.words, args.repeat)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    print(f'{"кодировщик":<10} {"отзывов":>8} {"байт":>9} '
+          f'{"мкс на отзыв":>13}')
+    for row in results:
+        print(f'{row["encoder"]:<10} {row["reviews"]:>8} {row["bytes"]:>9} '
+              f'{row["us_per_review"]:>13.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Стоимость сериализации страницы произведений.
+
+Сравнивает прежний путь чтения (полные строки жанров и вложенные
+ModelSerializer) с текущим (Prefetch с only() и плоские словари).
+
+    python -m benchmarks.title_serialization --sizes 10 100 1000
+"""
+import argparse
+import json
+
+from benchmarks import measure, setup_django
+
+GENRES = 10
+CATEGORIES = 5
+GENRES_PER_TITLE = 3
+
+
+def seed(count):
+    from reviews.models import Category, Genre, Title
+
+    categories = Category.objects.bulk_create(
+        Category(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(CATEGORIES)
+    )
+    genres = Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(GENRES)
+    )
+    titles = Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {i:05}',
+            year=1900 + i % 120,
+            description='Описание произведения ' * 5,
+            category=categories[i % CATEGORIES],
+        )
+        for i in range(count)
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(
+            title_id=title.pk, genre_id=genres[(i + j) % GENRES].pk
+        )
+        for i, title in enumerate(titles)
+        for j in range(GENRES_PER_TITLE)
+    )
+
+
+def build_legacy_serializer():
+    """Сериализатор чтения в том виде, в каком он был до оптимизации."""
+    from rest_framework import serializers
+
+    from api.serializers import CategorySerializer, GenreSerializer
+    from reviews.models import Title
+
+    class LegacyTitleReadSerializer(serializers.ModelSerializer):
+        rating = serializers.IntegerField(read_only=True)
+        genre = GenreSerializer(many=True, read_only=True)
+        category = CategorySerializer(read_only=True)
+
+        class Meta:
+            model = Title
+            fields = (
+                'id', 'name', 'year', 'description', 'rating',
+                'genre', 'category'
+            )
+
+    return LegacyTitleReadSerializer
+
+
+def run(sizes, repeat):
+    from api.serializers import TitleReadSerializer
+    from api.views import TitleViewSet
+    from reviews.models import Title
+
+    seed(max(sizes))
+    variants = {
+        'legacy': (
+            Title.objects.select_related('category')
+            .prefetch_related('genre').order_by('name', 'year'),
+            build_legacy_serializer(),
+        ),
+        'current': (TitleViewSet.queryset, TitleReadSerializer),
+    }
+    results = []
+    for size in sizes:
+        for name, (queryset, serializer_class) in variants.items():
+            page = list(queryset.all()[:size])
+            total = measure(
+                lambda: serializer_class(
+                    list(queryset.all()[:size]), many=True
+                ).data,
+                repeat,
+            )
+            serialize = measure(
+                lambda: serializer_class(page, many=True).data, repeat
+            )
+            results.append({
+                'variant': name,
+                'titles': size,
+                'total_us_per_title': total['median'] / size * 1e6,
+                'serialize_us_per_title': serialize['median'] / size * 1e6,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=(10, 100, 1000)
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    teardown = setup_django()
+    try:
+        results = run(args.sizes, args.repeat)
+    finally:
+        teardown()
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    print(f'{"вариант":<10} {"строк":>6} {"всего, мкс":>12} '
+          f'{"сериализация, мкс":>18}')
+    for row in results:
+        print(f'{row["variant"]:<10} {row["titles"]:>6} '
+              f'{row["total_us_per_title"]:>12.1f} '
+              f'{row["serialize_us_per_title"]:>18.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -28,4 +28,7 @@ if FILENAME not in project_dir_content:
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_cache',
+    'tests.fixtures.fixture_outbox',
+    'tests.fixtures.fixture_stats',
 ]
@@ -0,0 +1,13 @@
+import pytest
+from django.core.cache import caches
+
+from api.user_cache import user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Очищает кэши, чтобы ответы не переживали очистку БД между тестами."""
+    for cache in caches.all():
+        cache.clear()
+    user_cache.clear()
+    yield
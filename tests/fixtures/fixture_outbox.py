@@ -0,0 +1,15 @@
+import pytest
+
+from reviews.outbox import OUTBOX_SETTINGS
+
+
+@pytest.fixture(autouse=True)
+def eager_outbox(monkeypatch):
+    """Письма отправляются сразу, как ожидают тесты регистрации."""
+    monkeypatch.setitem(OUTBOX_SETTINGS, 'EAGER', True)
+
+
+@pytest.fixture
+def queued_outbox(monkeypatch):
+    """Письма остаются в очереди до запуска send_outbox."""
+    monkeypatch.setitem(OUTBOX_SETTINGS, 'EAGER', False)
@@ -0,0 +1,9 @@
+import pytest
+
+from api.process_stats import PROCESS_STATS_SETTINGS
+
+
+@pytest.fixture(autouse=True)
+def process_stats_dir(tmp_path, monkeypatch):
+    """Снимки статистики процессов пишутся во временный каталог теста."""
+    monkeypatch.setitem(PROCESS_STATS_SETTINGS, 'DIR', str(tmp_path / 'stats'))
@@ -0,0 +1,129 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from api.views import TitleViewSet
+from reviews.models import Title
+from reviews.ratings import apply_rating_change
+from tests.utils import create_reviews, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08Rating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_stored_rating(self, title_id):
+        return Title.objects.values(
+            'rating_sum', 'rating_count', 'rating'
+        ).get(pk=title_id)
+
+    def test_01_rating_follows_review_changes(self, admin_client, user_client,
+                                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(user_client, title_id, 'Норм', 3).json()
+        create_single_review(moderator_client, title_id, 'Отлично', 8)
+        assert self.get_stored_rating(title_id) == {
+            'rating_sum': 11, 'rating_count': 2, 'rating': 5.5
+        }, (
+            'Проверьте, что при создании отзыва сохраненный рейтинг '
+            'произведения пересчитывается.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            ),
+            data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_stored_rating(title_id) == {
+            'rating_sum': 18, 'rating_count': 2, 'rating': 9.0
+        }, (
+            'Проверьте, что при изменении оценки сохраненный рейтинг '
+            'произведения пересчитывается.'
+        )
+
+        response = user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_stored_rating(title_id) == {
+            'rating_sum': 8, 'rating_count': 1, 'rating': 8.0
+        }
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.json()['rating'] == 8
+
+    def test_02_rating_follows_author_deletion(self, admin_client, admin,
+                                               user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        user.delete()
+        assert self.get_stored_rating(titles[0]['id']) == {
+            'rating_sum': 5, 'rating_count': 1, 'rating': 5.0
+        }, (
+            'Проверьте, что при удалении автора его оценки убираются '
+            'из рейтинга произведения.'
+        )
+        admin.delete()
+        assert self.get_stored_rating(titles[0]['id']) == {
+            'rating_sum': 0, 'rating_count': 0, 'rating': None
+        }
+
+    def test_03_rebuild_ratings_command(self, admin_client, admin,
+                                        user_client, user):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        call_command('rebuild_ratings', '--check')
+
+        Title.objects.filter(pk=titles[0]['id']).update(
+            rating_sum=0, rating_count=0, rating=None
+        )
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+
+        call_command('rebuild_ratings')
+        assert self.get_stored_rating(titles[0]['id']) == {
+            'rating_sum': 10, 'rating_count': 2, 'rating': 5.0
+        }
+        call_command('rebuild_ratings', '--check')
+
+    def test_04_title_update_keeps_rating(self, admin_client, user_client,
+                                          monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Норм', 4)
+        perform_update = TitleViewSet.perform_update
+
+        def update_after_review(view, serializer):
+            # Отзыв меняет рейтинг, пока произведение уже загружено.
+            apply_rating_change(title_id, 6, 1)
+            perform_update(view, serializer)
+
+        monkeypatch.setattr(
+            TitleViewSet, 'perform_update', update_after_review
+        )
+        response = admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            data={'name': 'Новое название'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_stored_rating(title_id) == {
+            'rating_sum': 10, 'rating_count': 2, 'rating': 5.0
+        }, (
+            'Проверьте, что изменение произведения не перезаписывает '
+            'рейтинг, измененный отзывом после загрузки произведения.'
+        )
+        assert Title.objects.get(pk=title_id).name == 'Новое название'
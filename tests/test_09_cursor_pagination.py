@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Comment, Review, Title
+
+
+def walk(client, url, link_key):
+    """Проходит по всем страницам и возвращает id и число запросов."""
+    ids = []
+    pages = 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            'В курсорном режиме пагинации не должен считаться `count`.'
+        )
+        page_ids = [obj['id'] for obj in data['results']]
+        ids = page_ids + ids if link_key == 'previous' else ids + page_ids
+        pages += 1
+        url = data[link_key]
+    return ids, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_titles_cursor(self, client):
+        category = Category.objects.create(name='Фильмы', slug='films')
+        Title.objects.bulk_create(
+            Title(name=f'Фильм {idx % 4}', year=1990 + idx % 3,
+                  category=category)
+            for idx in range(23)
+        )
+        expected = list(
+            Title.objects.order_by('name', 'year', 'id')
+            .values_list('id', flat=True)
+        )
+
+        ids, pages = walk(client, f'{self.TITLES_URL}?pagination=cursor',
+                          'next')
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` '
+            'возвращает все произведения в порядке (name, year, id).'
+        )
+        assert pages == 3
+
+        response = client.get(f'{self.TITLES_URL}?pagination=cursor')
+        next_url = response.json()['next']
+        last_page = client.get(client.get(next_url).json()['next']).json()
+        back_ids, _ = walk(client, last_page['previous'], 'previous')
+        assert back_ids == expected[:20], (
+            'Проверьте, что ссылка `previous` в курсорном режиме '
+            'возвращает предыдущие страницы.'
+        )
+
+    def test_02_reviews_and_comments_cursor(self, client, django_user_model):
+        title = Title.objects.create(name='Фильм', year=2000)
+        authors = django_user_model.objects.bulk_create(
+            django_user_model(username=f'user{idx}',
+                              email=f'user{idx}@yamdb.fake')
+            for idx in range(15)
+        )
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            )
+            for author in authors
+        ]
+        for author in authors:
+            Comment.objects.create(
+                review=reviews[0], author=author, text='Комментарий'
+            )
+
+        expected = list(
+            title.reviews.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        ids, pages = walk(
+            client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+            + '?pagination=cursor',
+            'next'
+        )
+        assert ids == expected
+        assert pages == 2
+
+        expected = list(
+            reviews[0].comments.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        ids, _ = walk(
+            client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=reviews[0].id
+            ) + '?pagination=cursor',
+            'next'
+        )
+        assert ids == expected
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=not-a-cursor')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_page_number_is_default(self, client):
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert 'count' in response.json()
+
+    @pytest.mark.parametrize('query', (
+        'ordering=-year', 'ordering=rating', 'search=фильм'
+    ))
+    def test_05_foreign_ordering_is_rejected(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?pagination=cursor&{query}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что курсорная пагинация не подменяет сортировку '
+            'из `ordering` и ранжирование поиска, а отвечает 400.'
+        )
+        assert 'ordering' in response.json()
+
+    def test_06_keyset_prefix_ordering_is_allowed(self, client):
+        response = client.get(
+            f'{self.TITLES_URL}?pagination=cursor&ordering=name'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert 'count' not in response.json()
@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.cache import cache_stats, reset_cache_stats
+from reviews.models import Category, Genre, Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def get_twice(self, client, url):
+        first = client.get(url)
+        second = client.get(url)
+        assert first.status_code == second.status_code == HTTPStatus.OK
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдается из кэша.'
+        )
+        assert first.content == second.content
+        return second.json()
+
+    def test_01_hits_and_misses(self, client, admin_client):
+        create_titles(admin_client)
+        reset_cache_stats()
+        self.get_twice(client, self.TITLES_URL)
+        self.get_twice(client, self.TITLES_URL + '?year=1984')
+        self.get_twice(client, self.CATEGORIES_URL)
+        assert cache_stats() == {'hits': 3, 'misses': 3, 'hit_rate': 0.5}
+
+    def test_02_title_invalidation(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        assert self.get_twice(client, url)['rating'] is None
+
+        create_single_review(user_client, title_id, 'Отзыв', 7)
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что создание отзыва сбрасывает кэш произведения.'
+        )
+
+        Category.objects.filter(slug=titles[0]['category']).first().save()
+        assert client.get(url)['X-Cache'] == 'MISS'
+
+        Title.objects.get(pk=title_id).genre.clear()
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['genre'] == []
+
+        Review.objects.filter(title_id=title_id).delete()
+        response = client.get(url)
+        assert response.json()['rating'] is None
+
+    def test_03_category_genre_invalidation(self, client, admin_client):
+        self.get_twice(client, self.GENRES_URL)
+        self.get_twice(client, self.CATEGORIES_URL)
+
+        Genre.objects.create(name='Драма', slug='drama')
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1
+        assert client.get(self.CATEGORIES_URL)['X-Cache'] == 'HIT'
+
+        response = admin_client.delete(f'{self.GENRES_URL}drama/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(self.GENRES_URL).json()['count'] == 0
+
+    def test_04_browsable_api_is_not_cached(self, client, admin_client):
+        response = admin_client.get(
+            self.CATEGORIES_URL, HTTP_ACCEPT='text/html'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert 'X-Cache' not in response
+        response = client.get(self.CATEGORIES_URL, HTTP_ACCEPT='text/html')
+        assert 'X-Cache' not in response, (
+            'Проверьте, что страница Browsable API не кэшируется: в ней '
+            'формы и CSRF-токен конкретного пользователя.'
+        )
+        assert 'csrfmiddlewaretoken' not in response.content.decode()
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert response['Last-Modified']
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert response['ETag'] == etag
+        assert not response.content
+        return etag
+
+    def test_01_not_modified(self, client, admin_client, admin, user_client,
+                             user, django_assert_max_num_queries):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        urls = (
+            self.TITLES_URL,
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+        )
+        for url in urls:
+            etag = self.check_not_modified(client, url)
+            with django_assert_max_num_queries(1):
+                client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_02_etag_changes(self, client, admin_client, admin, user_client,
+                             user, moderator_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        title_etag = self.check_not_modified(client, title_url)
+        reviews_etag = self.check_not_modified(client, reviews_url)
+
+        create_single_review(moderator_client, title_id, 'Новый', 9)
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после нового отзыва ETag произведения меняется.'
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 3
+
+        title_etag = self.check_not_modified(client, title_url)
+        category = Category.objects.get(slug=titles[0]['category'])
+        category.name = 'Кино'
+        category.save()
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['category']['name'] == 'Кино'
+
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[1]['id']
+        )
+        review_etag = self.check_not_modified(client, review_url)
+        user_client.patch(review_url, data={'text': 'Изменен'})
+        response = client.get(review_url, HTTP_IF_NONE_MATCH=review_etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['text'] == 'Изменен'
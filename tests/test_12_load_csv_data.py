@@ -0,0 +1,165 @@
+import csv
+import os
+from concurrent.futures import Future
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from reviews.management.commands import load_csv_data
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+FILES = (
+    ('category.csv', Category),
+    ('genre.csv', Genre),
+    ('users.csv', User),
+    ('titles.csv', Title),
+    ('genre_title.csv', Title.genre.through),
+    ('review.csv', Review),
+    ('comments.csv', Comment),
+)
+
+
+class InlinePool:
+    """Пул, который разбирает файлы сразу и считает неполученные результаты."""
+
+    def __init__(self, workers, initializer=None):
+        self.in_flight = 0
+        self.peak = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, function, *args):
+        pool = self
+
+        class CountedFuture(Future):
+            def result(self, timeout=None):
+                pool.in_flight -= 1
+                return super().result(timeout)
+
+        future = CountedFuture()
+        future.set_result(function(*args))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        return future
+
+
+def count_rows(filename):
+    with open(os.path.join(DATA_DIR, filename), encoding='utf-8') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12LoadCsvData:
+
+    def test_01_load_all_files(self):
+        out = StringIO()
+        call_command(
+            'load_csv_data', batch_size=10, data_dir=DATA_DIR, stdout=out
+        )
+        for filename, model in FILES:
+            assert model.objects.count() == count_rows(filename), (
+                f'Проверьте, что команда load_csv_data загружает все '
+                f'строки файла {filename}.'
+            )
+            assert f'{filename}: {count_rows(filename)} строк' in (
+                out.getvalue()
+            )
+        call_command('rebuild_ratings', '--check', stdout=StringIO())
+
+    def test_02_reload_is_idempotent(self):
+        call_command('load_csv_data', data_dir=DATA_DIR, stdout=StringIO())
+        call_command('load_csv_data', data_dir=DATA_DIR, stdout=StringIO())
+        for filename, model in FILES:
+            assert model.objects.count() == count_rows(filename)
+
+    def test_03_queries_do_not_grow_with_rows(
+            self, django_assert_max_num_queries):
+        with django_assert_max_num_queries(40):
+            call_command(
+                'load_csv_data', batch_size=1000, data_dir=DATA_DIR,
+                stdout=StringIO()
+            )
+
+    def test_04_upsert_updates_only_changed_rows(self, tmp_path):
+        for filename, _ in FILES:
+            with open(os.path.join(DATA_DIR, filename), encoding='utf-8') as f:
+                (tmp_path / filename).write_text(f.read(), encoding='utf-8')
+        call_command(
+            'load_csv_data', '--upsert', data_dir=tmp_path, stdout=StringIO()
+        )
+        review = Review.objects.get(pk=1)
+
+        out = StringIO()
+        call_command(
+            'load_csv_data', '--upsert', data_dir=tmp_path, stdout=out
+        )
+        rows = count_rows('review.csv')
+        assert f'без изменений: {rows}' in out.getvalue(), (
+            'Проверьте, что повторная загрузка с --upsert пропускает '
+            'неизмененные строки.'
+        )
+
+        with open(tmp_path / 'review.csv', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            fieldnames = reader.fieldnames
+            data = list(reader)
+        data[0]['score'] = '1' if review.score != 1 else '2'
+        data[0]['text'] = 'Новый текст'
+        with open(tmp_path / 'review.csv', 'w', encoding='utf-8',
+                  newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(data)
+
+        out = StringIO()
+        call_command(
+            'load_csv_data', '--upsert', data_dir=tmp_path, stdout=out
+        )
+        assert f'без изменений: {rows - 1}' in out.getvalue()
+        updated = Review.objects.get(pk=1)
+        assert updated.text == 'Новый текст'
+        assert updated.score == int(data[0]['score'])
+        assert updated.pub_date == review.pub_date
+        assert Review.objects.count() == rows
+        call_command('rebuild_ratings', '--check', stdout=StringIO())
+
+    def test_05_parallel_load(self):
+        out = StringIO()
+        call_command(
+            'load_csv_data', workers=2, batch_size=20, data_dir=DATA_DIR,
+            stdout=out
+        )
+        for filename, model in FILES:
+            assert model.objects.count() == count_rows(filename), (
+                'Проверьте, что команда load_csv_data с --workers загружает '
+                f'все строки файла {filename}.'
+            )
+        output = out.getvalue()
+        assert output.index('users.csv') < output.index('review.csv')
+        assert output.index('titles.csv') < output.index('genre_title.csv')
+        call_command('rebuild_ratings', '--check', stdout=StringIO())
+
+    def test_06_parallel_load_bounds_parsed_files(self, monkeypatch):
+        pools = []
+
+        def make_pool(*args, **kwargs):
+            pools.append(InlinePool(*args, **kwargs))
+            return pools[-1]
+
+        monkeypatch.setattr(load_csv_data, 'ProcessPoolExecutor', make_pool)
+        call_command(
+            'load_csv_data', workers=2, data_dir=DATA_DIR, stdout=StringIO()
+        )
+        assert Comment.objects.count() == count_rows('comments.csv')
+        assert pools[0].peak == 2, (
+            'Проверьте, что load_csv_data --workers держит в памяти '
+            'не больше `workers` разобранных файлов.'
+        )
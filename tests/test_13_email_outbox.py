@@ -0,0 +1,122 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail
+from reviews.outbox import OUTBOX_SETTINGS
+
+
+class FailingEmailBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class InspectingEmailBackend(EmailBackend):
+    """Запоминает состояние транзакции и очереди во время отправки."""
+
+    checks = []
+
+    def send_messages(self, messages):
+        self.checks.append((
+            transaction.get_connection().in_atomic_block,
+            OutgoingEmail.objects.filter(
+                next_attempt_at__lte=timezone.now()
+            ).exists(),
+        ))
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, idx):
+        response = client.post(self.URL_SIGNUP, data={
+            'email': f'user{idx}@yamdb.fake', 'username': f'user{idx}'
+        })
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_01_signup_only_enqueues(self, client, queued_outbox):
+        self.signup(client, 1)
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что при регистрации письмо ставится в очередь, '
+            'а не отправляется в запросе.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'user1@yamdb.fake'
+        assert email.status == OutgoingEmail.Status.PENDING
+
+    def test_02_worker_sends_batch(self, client, queued_outbox):
+        for idx in range(3):
+            self.signup(client, idx)
+        out = StringIO()
+        call_command('send_outbox', stdout=out)
+        assert 'Отправлено писем: 3, ошибок: 0' in out.getvalue()
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{idx}@yamdb.fake' for idx in range(3)
+        ]
+        assert not OutgoingEmail.objects.exclude(
+            status=OutgoingEmail.Status.SENT
+        ).exists()
+
+        call_command('send_outbox', stdout=StringIO())
+        assert len(mail.outbox) == 3, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_03_retry_with_backoff(self, client, queued_outbox, settings,
+                                   monkeypatch):
+        monkeypatch.setitem(OUTBOX_SETTINGS, 'MAX_ATTEMPTS', 2)
+        self.signup(client, 1)
+        settings.EMAIL_BACKEND = (
+            'tests.test_13_email_outbox.FailingEmailBackend'
+        )
+        call_command('send_outbox', stdout=StringIO())
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.Status.PENDING
+        assert email.attempts == 1
+        assert 'SMTP недоступен' in email.last_error
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что после ошибки отправка откладывается.'
+        )
+
+        OutgoingEmail.objects.update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        call_command('send_outbox', stdout=StringIO())
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.Status.FAILED
+        assert email.attempts == 2
+
+    def test_04_eager_mode_sends_after_commit(self, client):
+        self.signup(client, 1)
+        assert len(mail.outbox) == 1
+        assert OutgoingEmail.objects.get().status == (
+            OutgoingEmail.Status.SENT
+        )
+
+    def test_05_sends_outside_transaction(self, client, queued_outbox,
+                                          settings):
+        self.signup(client, 1)
+        settings.EMAIL_BACKEND = (
+            'tests.test_13_email_outbox.InspectingEmailBackend'
+        )
+        InspectingEmailBackend.checks.clear()
+        call_command('send_outbox', stdout=StringIO())
+        assert InspectingEmailBackend.checks == [(False, False)], (
+            'Проверьте, что письма отправляются вне транзакции и уже '
+            'скрыты от других процессов отправки.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.Status.SENT
+        assert email.attempts == 1
@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+from io import StringIO
+
+from api.audit import NullSink, RotatingFileSink, StreamSink, build_sink
+
+
+class Test14AuditSink:
+
+    def test_01_buffer_flushes_by_size(self):
+        stream = StringIO()
+        sink = StreamSink(stream=stream, buffer_size=3, flush_interval=60)
+        sink.write('a\n')
+        sink.write('b\n')
+        assert stream.getvalue() == '', (
+            'Проверьте, что записи журнала копятся в буфере.'
+        )
+        sink.write('c\n')
+        assert stream.getvalue() == 'a\nb\nc\n'
+
+    def test_02_buffer_flushes_by_time(self):
+        stream = StringIO()
+        sink = StreamSink(stream=stream, buffer_size=100, flush_interval=0.05)
+        sink.write('a\n')
+        time.sleep(0.3)
+        assert stream.getvalue() == 'a\n', (
+            'Проверьте, что буфер журнала сбрасывается по времени.'
+        )
+
+    def test_03_threads_do_not_interleave(self, tmp_path):
+        path = tmp_path / 'codes.txt'
+        sink = RotatingFileSink(
+            path, max_bytes=10 ** 9, buffer_size=7, flush_interval=60
+        )
+        line = 'x' * 500
+
+        def worker(idx):
+            for number in range(50):
+                sink.write(f'{idx}:{number}:{line}\n')
+
+        threads = [
+            threading.Thread(target=worker, args=(idx,)) for idx in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sink.flush()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 400
+        assert all(record.endswith(line) for record in lines)
+        assert len(set(lines)) == 400
+
+    def test_04_rotation_by_size_and_date(self, tmp_path):
+        path = tmp_path / 'codes.txt'
+        sink = RotatingFileSink(
+            path, max_bytes=100, backup_count=2, buffer_size=1,
+            flush_interval=60
+        )
+        for idx in range(5):
+            sink.write(f'{idx}:' + 'y' * 60 + '\n')
+        backups = sorted(
+            name for name in os.listdir(tmp_path) if name != 'codes.txt'
+        )
+        assert len(backups) == 2, (
+            'Проверьте, что журнал ротируется по размеру и хранит не больше '
+            'BACKUP_COUNT старых файлов.'
+        )
+        assert path.read_text().startswith('4:')
+
+        yesterday = time.time() - 24 * 60 * 60
+        os.utime(path, (yesterday, yesterday))
+        sink.write('today\n')
+        assert path.read_text() == 'today\n'
+
+    def test_05_build_sink(self, tmp_path):
+        options = {
+            'SINK': 'disabled', 'PATH': tmp_path / 'codes.txt',
+            'BUFFER_SIZE': 1, 'FLUSH_INTERVAL': 1, 'MAX_BYTES': 100,
+            'BACKUP_COUNT': 1,
+        }
+        assert isinstance(build_sink(options), NullSink)
+        options['SINK'] = 'stdout'
+        assert isinstance(build_sink(options), StreamSink)
+        options['SINK'] = 'file'
+        assert isinstance(build_sink(options), RotatingFileSink)
+
+    def test_06_failed_write_keeps_records(self, caplog):
+        stream = StringIO()
+        stream.close()
+        sink = StreamSink(stream=stream, buffer_size=1, flush_interval=60)
+        sink.write('a\n')
+        assert sink.buffer == ['a\n'], (
+            'Проверьте, что при ошибке записи строки остаются в буфере, '
+            'а ошибка не доходит до запроса.'
+        )
+        assert 'Не удалось записать журнал' in caplog.text
+        sink.stream = StringIO()
+        sink.write('b\n')
+        assert sink.stream.getvalue() == 'a\nb\n'
+        assert not sink.buffer
@@ -0,0 +1,44 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15AuthQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    VALID_DATA = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+
+    def test_01_signup_queries(self, client, queued_outbox,
+                               django_assert_num_queries):
+        # Поиск кандидатов, создание пользователя, постановка письма.
+        with django_assert_num_queries(3):
+            response = client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        assert response.status_code == HTTPStatus.OK
+
+        # Повторная регистрация: поиск кандидатов и постановка письма.
+        with django_assert_num_queries(2):
+            response = client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_signup_conflicts_use_one_query(self, client, user,
+                                               django_assert_num_queries):
+        for data in (
+            {'email': 'other@yamdb.fake', 'username': user.username},
+            {'email': user.email, 'username': 'other_username'},
+        ):
+            with django_assert_num_queries(1):
+                response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_token_queries(self, client, user, django_assert_num_queries):
+        data = {
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        }
+        with django_assert_num_queries(1):
+            response = client.post(self.URL_TOKEN, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert 'token' in response.json()
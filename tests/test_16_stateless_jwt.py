@@ -0,0 +1,132 @@
+import time
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import AUTH_SETTINGS, issue_access_token
+from reviews.models import Category, Genre, Review, Title, User
+
+
+def make_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {issue_access_token(user)}'
+    )
+    return client
+
+
+def user_queries(queries):
+    return [
+        query['sql'] for query in queries
+        if 'FROM "reviews_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16StatelessJWT:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    ME_URL = '/api/v1/users/me/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+    def test_01_no_user_query(self, admin, user):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        admin_client = make_client(admin)
+        user_client = make_client(user)
+        # Первый запрос кэширует версию токенов.
+        admin_client.get(self.ME_URL)
+        user_client.get(self.ME_URL)
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': 'Дюна', 'year': 1984, 'category': category.slug,
+                'genre': [genre.slug],
+            })
+        assert response.status_code == HTTPStatus.CREATED
+        assert not user_queries(context.captured_queries), (
+            'Проверьте, что аутентификация по токену с ролью '
+            'не загружает пользователя из БД.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                self.REVIEWS_URL_TEMPLATE.format(
+                    title_id=response.json()['id']
+                ),
+                data={'text': 'Отзыв', 'score': 8},
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        assert not user_queries(context.captured_queries)
+        assert Review.objects.get().author == user
+
+    def test_02_role_change_revokes_token(self, admin_client, user):
+        client = make_client(user)
+        assert client.get(self.ME_URL).status_code == HTTPStatus.OK
+        response = client.post(self.TITLES_URL, data={})
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.patch(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username),
+            data={'role': 'admin'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены роли старый токен отклоняется.'
+        )
+
+        user.refresh_from_db()
+        client = make_client(user)
+        response = client.post(self.TITLES_URL, data={})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        user.is_active = False
+        user.save()
+        assert client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_03_profile_is_loaded(self, user):
+        client = make_client(user)
+        response = client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == user.bio
+        response = client.patch(self.ME_URL, data={'bio': 'Новая'})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.bio == 'Новая'
+        # Смена данных профиля не отзывает токен.
+        assert client.get(self.ME_URL).status_code == HTTPStatus.OK
+
+    def test_04_legacy_token(self, user_client, user):
+        title = Title.objects.create(name='Дюна', year=1984)
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            data={'text': 'Отзыв', 'score': 5},
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что токены без роли по-прежнему принимаются.'
+        )
+
+    def test_05_revocation_delay_is_bounded(self, user):
+        client = make_client(user)
+        assert client.get(self.ME_URL).status_code == HTTPStatus.OK
+        # Изменение в другом процессе не сбрасывает локальный кэш версии.
+        User.objects.filter(pk=user.pk).update(token_version=10)
+        assert client.get(self.ME_URL).status_code == HTTPStatus.OK
+
+        later = time.time() + AUTH_SETTINGS['VERSION_TIMEOUT'] + 1
+        with mock.patch('time.time', return_value=later):
+            response = client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что версия токенов кэшируется не дольше '
+            '`VERSION_TIMEOUT` секунд.'
+        )
+        assert AUTH_SETTINGS['VERSION_TIMEOUT'] <= 10
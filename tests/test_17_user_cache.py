@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from api.user_cache import UserStateCache, user_cache
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17UserCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+    def test_01_lru_and_ttl(self, admin, moderator, user, monkeypatch):
+        cache = UserStateCache(max_size=2, ttl=60)
+        assert cache.get(user.id).role == 'user'
+        assert cache.get(admin.id).role == 'admin'
+        assert cache.get(user.id).username == user.username
+        cache.get(moderator.id)
+        assert admin.id not in cache.entries, (
+            'Проверьте, что из заполненного кэша вытесняется запись, '
+            'к которой дольше всего не обращались.'
+        )
+        assert cache.stats() == {
+            'size': 2, 'max_size': 2, 'hits': 1, 'misses': 3,
+            'hit_rate': 0.25,
+        }
+        assert cache.get(0) is None
+
+        monkeypatch.setattr('api.user_cache.time.monotonic', lambda: 1e12)
+        cache.get(user.id)
+        assert cache.stats()['misses'] == 5
+
+    def test_02_permission_checks_use_cache(self, user_client, user,
+                                            django_assert_num_queries):
+        # Первый запрос загружает состояние пользователя.
+        with django_assert_num_queries(1):
+            response = user_client.post(self.TITLES_URL, data={})
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        with django_assert_num_queries(0):
+            response = user_client.post(self.TITLES_URL, data={})
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert user_cache.stats()['hits'] == 1
+
+    def test_03_invalidation(self, admin_client, user_client, user):
+        assert user_client.post(self.TITLES_URL, data={}).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.patch(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username),
+            data={'role': 'admin'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.post(self.TITLES_URL, data={}).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что смена роли сбрасывает кэш пользователя.'
+
+        user.is_active = False
+        user.save()
+        assert user_client.get(self.TITLES_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        user.delete()
+        assert user_client.get(self.TITLES_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_04_invalidate_during_read(self, user):
+        cache = UserStateCache()
+
+        def invalidate_while_reading(execute, sql, params, many, context):
+            # Пользователь меняется, пока чтение из БД еще не сохранено.
+            result = execute(sql, params, many, context)
+            cache.invalidate(user.id)
+            return result
+
+        with connection.execute_wrapper(invalidate_while_reading):
+            assert cache.get(user.id).role == 'user'
+        assert user.id not in cache.entries, (
+            'Проверьте, что состояние, прочитанное до invalidate(), '
+            'не попадает в кэш.'
+        )
+        assert not cache.reading and not cache.generations
+        cache.get(user.id)
+        assert user.id in cache.entries
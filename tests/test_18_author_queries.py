@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18AuthorQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def urls(self, admin_client, admin, user_client, user, moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        # Прогрев кэша состояния пользователей.
+        user_client.get(reviews_url)
+        moderator_client.get(reviews_url)
+        return {
+            'reviews': reviews_url,
+            'review': f'{reviews_url}{reviews[1]["id"]}/',
+            'foreign_review': f'{reviews_url}{reviews[0]["id"]}/',
+            'comments': comments_url,
+            'comment': f'{comments_url}{comments[1]["id"]}/',
+            'foreign_comment': f'{comments_url}{comments[0]["id"]}/',
+        }
+
+    @pytest.mark.parametrize('url, queries', (
+        # Состояние для ETag, count, страница.
+        ('reviews', 3),
+        ('reviews?pagination=cursor', 2),
+        ('comments', 3),
+    ))
+    def test_01_list_queries(self, client, urls, url, queries,
+                             django_assert_num_queries):
+        name, _, params = url.partition('?')
+        url = urls[name] + (f'?{params}' if params else '')
+        with django_assert_num_queries(queries):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert all(item['author'] for item in response.json()['results'])
+
+    @pytest.mark.parametrize('name, queries', (
+        # Объект, BEGIN, UPDATE, запись строки поискового индекса, COMMIT.
+        ('review', 5),
+        # Комментарий вместе с проверкой отзыва, UPDATE.
+        ('comment', 2),
+    ))
+    def test_02_patch_queries(self, user_client, moderator_client, urls,
+                              name, queries, django_assert_num_queries):
+        for number, client in enumerate((user_client, moderator_client)):
+            with django_assert_num_queries(queries):
+                response = client.patch(
+                    urls[name], data={'text': f'Новый текст {number}'}
+                )
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что автор и модератор могут изменить '
+                f'объект по адресу `{urls[name]}`.'
+            )
+            assert response.json()['author']
+
+    def test_03_delete_queries(self, user_client, urls,
+                               django_assert_num_queries):
+        with django_assert_num_queries(2):
+            response = user_client.delete(urls['comment'])
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        with django_assert_num_queries(7):
+            response = user_client.delete(urls['review'])
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+    def test_04_foreign_object_is_forbidden(self, user_client, urls,
+                                            django_assert_num_queries):
+        for name in ('foreign_review', 'foreign_comment'):
+            # Права проверяются по author_id без загрузки автора.
+            with django_assert_num_queries(1):
+                response = user_client.patch(urls[name], data={'text': 'x'})
+            assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_05_parent_lookups(self, user_client, admin, urls,
+                               django_assert_num_queries):
+        # Проверка отзыва, создание комментария.
+        with django_assert_num_queries(2):
+            response = user_client.post(urls['comments'], data={'text': 'x'})
+        assert response.status_code == HTTPStatus.CREATED
+
+        unknown = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=0),
+            self.COMMENTS_URL_TEMPLATE.format(title_id=0, review_id=0),
+            urls['comments'].replace(
+                urls['reviews'], self.REVIEWS_URL_TEMPLATE.format(title_id=0)
+            ),
+        )
+        for url in unknown:
+            assert user_client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с несуществующим '
+                'родителем возвращает 404.'
+            )
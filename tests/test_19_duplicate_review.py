@@ -0,0 +1,104 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import OperationalError, connection
+from rest_framework.test import APIClient
+
+from api.serializers import DUPLICATE_REVIEW_MESSAGE
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19DuplicateReview:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    THREADS = 4
+    MAX_ATTEMPTS = 200
+
+    @pytest.fixture
+    def title(self):
+        return Title.objects.create(name='Дюна', year=1984)
+
+    def test_01_duplicate_is_rejected(self, user_client, title):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        response = user_client.post(url, data={'text': 'Первый', 'score': 4})
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = user_client.post(url, data={'text': 'Второй', 'score': 9})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': [DUPLICATE_REVIEW_MESSAGE]
+        }
+        title.refresh_from_db()
+        assert (title.rating_count, title.rating) == (1, 4), (
+            'Проверьте, что отклоненный повторный отзыв не меняет рейтинг.'
+        )
+
+    def test_02_no_existence_query(self, user_client, title,
+                                   django_assert_num_queries):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        user_client.get(url)
+        # Произведение, BEGIN, SAVEPOINT, INSERT, рейтинг, запись строки
+        # поискового индекса, RELEASE, COMMIT.
+        with django_assert_num_queries(8):
+            response = user_client.post(url, data={'text': 'x', 'score': 4})
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_03_parallel_duplicates(self, user_client, title):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        barrier = threading.Barrier(self.THREADS)
+        statuses = []
+        errors = []
+
+        def post(score):
+            # Исключения запросов приходят всем клиентам через общий
+            # сигнал, поэтому запрос не падает, а ошибка берется из ответа.
+            client = APIClient(raise_request_exception=False)
+            client.credentials(**user_client._credentials)
+            barrier.wait()
+            try:
+                # Общая in-memory база SQLite не ждет блокировку таблицы,
+                # а сразу возвращает ошибку, поэтому запрос повторяется.
+                for _ in range(self.MAX_ATTEMPTS):
+                    response = client.post(
+                        url, data={'text': 'Отзыв', 'score': score}
+                    )
+                    if response.status_code != (
+                        HTTPStatus.INTERNAL_SERVER_ERROR
+                    ):
+                        statuses.append(response.status_code)
+                        return
+                    error = response.exc_info and response.exc_info[1]
+                    if not (
+                        isinstance(error, OperationalError)
+                        and 'locked' in str(error)
+                    ):
+                        errors.append(error)
+                        return
+                    time.sleep(0.01)
+                errors.append('блокировка не снята')
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=post, args=(score,))
+            for score in range(1, self.THREADS + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        assert not errors, (
+            'Проверьте, что параллельные отзывы не падают с ошибкой 500.',
+            errors,
+        )
+        assert sorted(statuses) == [HTTPStatus.CREATED] + [
+            HTTPStatus.BAD_REQUEST
+        ] * (self.THREADS - 1), statuses
+        review = Review.objects.get(title=title)
+        title.refresh_from_db()
+        assert title.rating_count == 1
+        assert title.rating == review.score
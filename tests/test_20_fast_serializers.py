@@ -0,0 +1,94 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+
+from api.fast_serializers import FAST_SERIALIZERS_SETTINGS, ValuesSerializer
+from reviews.models import Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20FastSerializers:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def static_data(self):
+        call_command('load_csv_data', stdout=StringIO())
+
+    def get_content(self, client, url, monkeypatch, enabled):
+        monkeypatch.setitem(FAST_SERIALIZERS_SETTINGS, 'ENABLED', enabled)
+        for cache in caches.all():
+            cache.clear()
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, url
+        return response
+
+    def collect_pages(self, client, url, monkeypatch):
+        """Обходит все страницы списка в обоих режимах и сравнивает их."""
+        checked = 0
+        while url:
+            fast = self.get_content(client, url, monkeypatch, True)
+            slow = self.get_content(client, url, monkeypatch, False)
+            assert fast.content == slow.content, (
+                f'Проверьте, что быстрый сериализатор для `{url}` '
+                'возвращает тот же JSON, что и обычный.'
+            )
+            checked += len(slow.json()['results'])
+            url = slow.json()['next']
+        return checked
+
+    def test_01_titles(self, client, static_data, monkeypatch):
+        genre = Genre.objects.first()
+        urls = (
+            self.TITLES_URL,
+            self.TITLES_URL + '?pagination=cursor',
+            self.TITLES_URL + '?ordering=-rating',
+            self.TITLES_URL + '?ordering=year&page_size=7',
+            self.TITLES_URL + f'?genre={genre.slug}',
+            self.TITLES_URL + '?category=movie',
+            self.TITLES_URL + '?year=1994',
+        )
+        assert self.collect_pages(client, urls[0], monkeypatch) == (
+            Title.objects.count()
+        )
+        for url in urls[1:]:
+            self.collect_pages(client, url, monkeypatch)
+
+    def test_02_reviews_and_comments(self, client, static_data,
+                                     monkeypatch):
+        checked = sum(
+            self.collect_pages(
+                client,
+                self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+                monkeypatch,
+            )
+            for title_id in Title.objects.values_list('id', flat=True)
+        )
+        assert checked == Review.objects.count()
+
+        checked = sum(
+            self.collect_pages(
+                client,
+                self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=title_id, review_id=review_id
+                ) + suffix,
+                monkeypatch,
+            )
+            for review_id, title_id in Review.objects.filter(
+                comments__isnull=False
+            ).distinct().values_list('id', 'title_id')
+            for suffix in ('', '?pagination=cursor')
+        )
+        assert checked == 2 * Comment.objects.count()
+
+
+def test_values_serializer_is_abstract():
+    with pytest.raises(TypeError):
+        ValuesSerializer([])
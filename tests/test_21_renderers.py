@@ -0,0 +1,101 @@
+import datetime as dt
+import json
+from decimal import Decimal
+from http import HTTPStatus
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from api import renderers
+from api.renderers import FastJSONParser, FastJSONRenderer
+from reviews.models import Title
+
+
+@pytest.fixture(params=('orjson', 'stdlib'))
+def encoder(request, monkeypatch):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(renderers, 'orjson', None)
+    return request.param
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Renderers:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_api_responses_match_json_renderer(self, client, encoder):
+        call_command('load_csv_data', stdout=StringIO())
+        urls = [self.TITLES_URL, self.TITLES_URL + '?pagination=cursor'] + [
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+            for title_id in Title.objects.values_list('id', flat=True)
+        ]
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.content == JSONRenderer().render(
+                response.data
+            ), (
+                f'Проверьте, что ответ `{url}` совпадает с выводом '
+                'стандартного JSONRenderer.'
+            )
+
+    def test_02_special_values(self, encoder):
+        data = ReturnDict({
+            'text': 'Строка "в кавычках"\n\t\x00\u2028\u2029 / \\',
+            'date': dt.datetime(2024, 1, 2, 3, 4, 5, 678901,
+                                tzinfo=dt.timezone.utc),
+            'day': dt.date(2024, 1, 2),
+            'decimal': Decimal('1.50'),
+            'lazy': gettext_lazy('Пользователь'),
+            'big': 2 ** 70,
+            'nested': [{'score': 10, 'rating': None}, True, 7.5],
+        }, serializer=None)
+        assert FastJSONRenderer().render(data) == (
+            JSONRenderer().render(data)
+        )
+        assert FastJSONRenderer().render(None) == b''
+        indented = FastJSONRenderer().render(
+            data, 'application/json; indent=2'
+        )
+        assert indented == JSONRenderer().render(
+            data, 'application/json; indent=2'
+        )
+
+    def test_03_parser(self, encoder, client, admin_client):
+        payload = {'name': 'Драма', 'slug': 'drama'}
+        assert FastJSONParser().parse(
+            BytesIO(json.dumps(payload).encode())
+        ) == payload
+        response = admin_client.post(
+            '/api/v1/genres/', data=json.dumps(payload),
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = admin_client.post(
+            '/api/v1/genres/', data='{"name":',
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_msgpack(self, client, admin_client):
+        msgpack = pytest.importorskip('msgpack')
+        response = admin_client.post(
+            '/api/v1/genres/',
+            data=msgpack.packb({'name': 'Драма', 'slug': 'drama'}),
+            content_type='application/msgpack',
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get(
+            '/api/v1/genres/', HTTP_ACCEPT='application/msgpack'
+        )
+        assert response['Content-Type'] == 'application/msgpack'
+        assert msgpack.unpackb(response.content)['results'] == [
+            {'name': 'Драма', 'slug': 'drama'}
+        ]
@@ -0,0 +1,134 @@
+import gzip
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from api import compression
+from api.compression import (
+    choose_encoding, compression_stats, reset_compression_stats
+)
+from api.process_stats import PROCESS_STATS_SETTINGS
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Compression:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    GENRES_URL = '/api/v1/genres/'
+
+    @pytest.fixture
+    def reviews_url(self, django_user_model):
+        title = Title.objects.create(name='Дюна', year=1984)
+        authors = django_user_model.objects.bulk_create(
+            django_user_model(username=f'user{i}', email=f'u{i}@yamdb.fake')
+            for i in range(10)
+        )
+        for author in authors:
+            Review.objects.create(
+                title=title, author=author, score=7,
+                text='Длинный отзыв о произведении. ' * 20,
+            )
+        return self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+
+    def test_01_gzip(self, client, reviews_url):
+        plain = client.get(reviews_url)
+        assert plain.status_code == HTTPStatus.OK
+        assert 'Content-Encoding' not in plain
+        assert 'Accept-Encoding' in plain['Vary']
+
+        response = client.get(reviews_url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip', (
+            f'Проверьте, что ответ `{reviews_url}` сжимается, если клиент '
+            'принимает gzip.'
+        )
+        assert int(response['Content-Length']) == len(response.content)
+        assert gzip.decompress(response.content) == plain.content
+        assert response['ETag'] == f'W/{plain["ETag"]}'
+
+        response = client.get(
+            reviews_url, HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    @pytest.mark.parametrize('header', ('', 'identity', 'gzip;q=0', 'br'))
+    def test_02_not_compressed(self, client, reviews_url, header):
+        response = client.get(reviews_url, HTTP_ACCEPT_ENCODING=header)
+        assert 'Content-Encoding' not in response
+
+    def test_03_small_response(self, client):
+        response = client.get(self.GENRES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert response.status_code == HTTPStatus.OK
+        assert 'Content-Encoding' not in response
+
+    def test_04_cached_variants(self, client, monkeypatch):
+        calls = []
+
+        def counting_gzip(content):
+            calls.append(len(content))
+            return gzip.compress(content, mtime=0)
+
+        monkeypatch.setitem(compression.CODECS, 'gzip', counting_gzip)
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {i}', year=2000,
+                  description='Длинное описание. ' * 20)
+            for i in range(10)
+        )
+        url = self.TITLES_URL
+        first = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert first['X-Cache'] == 'MISS'
+        assert first['Content-Encoding'] == 'gzip'
+        assert len(calls) == 1
+        second = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert second['X-Cache'] == 'HIT'
+        assert second.content == first.content
+        assert len(calls) == 1, (
+            'Проверьте, что при попадании в кэш отдается сохраненный '
+            'сжатый вариант без повторного сжатия.'
+        )
+
+    def test_05_stats(self, client, reviews_url):
+        reset_compression_stats()
+        for _ in range(2):
+            client.get(reviews_url, HTTP_ACCEPT_ENCODING='gzip')
+        (endpoint, stats), = compression_stats().items()
+        assert endpoint.endswith('title-reviews-list')
+        assert stats['responses'] == 2
+        assert stats['saved_bytes'] == (
+            stats['original_bytes'] - stats['compressed_bytes']
+        ) > 0
+
+    def test_06_stats_report(self, client, reviews_url, monkeypatch):
+        monkeypatch.setitem(PROCESS_STATS_SETTINGS, 'FLUSH_INTERVAL', 0)
+        reset_compression_stats()
+        client.get(reviews_url, HTTP_ACCEPT_ENCODING='gzip')
+        client.get(self.GENRES_URL)
+        # Отчет читает только сохраненные файлы, а не память процесса.
+        reset_compression_stats()
+        out = StringIO()
+        call_command('api_stats_report', stdout=out)
+        output = out.getvalue()
+        assert 'title-reviews-list' in output, (
+            'Проверьте, что статистика сжатия сохраняется в файлы процесса '
+            'и выводится командой api_stats_report.'
+        )
+        assert 'Кэш ответов: процессов 1' in output
+        assert 'Кэш пользователей: процессов 1' in output
+
+
+def test_choose_encoding(monkeypatch):
+    monkeypatch.setattr(compression, 'CODECS', {
+        'br': None, 'zstd': None, 'gzip': None,
+    })
+    assert choose_encoding('gzip, deflate, br') == 'br'
+    assert choose_encoding('gzip;q=1.0, br;q=0.5') == 'gzip'
+    assert choose_encoding('zstd, gzip') == 'zstd'
+    assert choose_encoding('*') == 'br'
+    assert choose_encoding('*, br;q=0') == 'zstd'
+    assert choose_encoding('deflate') is None
+    assert choose_encoding('') is None
+    assert choose_encoding(None) is None
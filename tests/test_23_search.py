@@ -0,0 +1,174 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import (
+    Review, ReviewSearchDocument, Title, TitleSearchDocument
+)
+from reviews.stemmer import stem, stem_text
+
+
+@pytest.mark.parametrize('words', (
+    ('книга', 'книги', 'книгами'),
+    ('фильмы', 'фильмов'),
+    ('прекрасный', 'прекрасная', 'прекрасного'),
+    ('читала', 'читают'),
+))
+def test_stemmer_joins_word_forms(words):
+    assert len({stem(word) for word in words}) == 1, (
+        f'Проверьте, что формы {words} приводятся к одной основе.'
+    )
+
+
+def test_stem_text_normalizes():
+    assert stem_text('Ёлки, КОТЫ!') == 'елк кот'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Search:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self, user):
+        dune = Title.objects.create(
+            name='Дюна', year=1965,
+            description='Роман о пустынной планете и пряности.',
+        )
+        foundation = Title.objects.create(
+            name='Основание', year=1951,
+            description='Галактическая империя и пустынные миры.',
+        )
+        solaris = Title.objects.create(
+            name='Солярис', year=1961, description='Разумный океан.',
+        )
+        Review.objects.create(
+            title=solaris, author=user, score=9,
+            text='Лучшая книга о контакте с планетой.',
+        )
+        return dune, foundation, solaris
+
+    def search(self, client, query, **params):
+        response = client.get(self.TITLES_URL, {'search': query, **params})
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_word_forms(self, client, titles):
+        dune, foundation, _ = titles
+        data = self.search(client, 'пустыня')
+        assert data['count'] == 2, (
+            'Проверьте, что поиск по параметру `search` находит '
+            'произведения по другим формам слова из описания.'
+        )
+        assert {item['id'] for item in data['results']} == {
+            dune.id, foundation.id
+        }
+
+    def test_02_ranking(self, client, titles):
+        dune, _, solaris = titles
+        Title.objects.create(
+            name='Планета', year=2000, description='Без пряностей.'
+        )
+        names = [
+            item['name']
+            for item in self.search(client, 'планеты')['results']
+        ]
+        assert names[0] == 'Планета', (
+            'Проверьте, что совпадение в названии ранжируется выше '
+            'совпадений в описании и отзывах.'
+        )
+        assert set(names[1:]) == {dune.name, solaris.name}
+
+    def test_03_all_terms_and_prefix(self, client, titles):
+        dune, _, _ = titles
+        data = self.search(client, 'пустын пряност')
+        assert [item['id'] for item in data['results']] == [dune.id]
+        assert self.search(client, 'нет-такого-слова')['count'] == 0
+        assert self.search(client, ' !!! ')['count'] == 0
+
+    def test_04_review_text(self, client, titles, user):
+        _, foundation, solaris = titles
+        data = self.search(client, 'контакт')
+        assert [item['id'] for item in data['results']] == [solaris.id], (
+            'Проверьте, что поиск учитывает тексты отзывов.'
+        )
+        review = Review.objects.get(title=solaris)
+        review.text = 'Про океан.'
+        review.save()
+        assert self.search(client, 'контакт')['count'] == 0
+        Review.objects.create(
+            title=foundation, author=user, score=5, text='Первый контакт.'
+        )
+        data = self.search(client, 'контакт')
+        assert [item['id'] for item in data['results']] == [foundation.id]
+        Review.objects.filter(title=foundation).delete()
+        assert self.search(client, 'контакт')['count'] == 0
+
+    def test_05_title_changes(self, client, titles, admin_client):
+        dune, _, solaris = titles
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{dune.id}/', data={'name': 'Дюна: Мессия'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.search(client, 'мессии')['results'][0]['id'] == dune.id
+        solaris.delete()
+        assert not TitleSearchDocument.objects.filter(
+            pk=solaris.pk
+        ).exists()
+        assert self.search(client, 'океан')['count'] == 0
+
+    def test_06_pagination_and_filters(self, client, titles):
+        for year in range(2001, 2011):
+            Title.objects.create(
+                name=f'Пустыня {year}', year=year, description='Песок.'
+            )
+        data = self.search(client, 'пустыни')
+        assert data['count'] == 12
+        assert len(data['results']) == 10
+        assert data['results'][0]['name'] == 'Пустыня 2001'
+        data = self.search(client, 'пустыни', page=2)
+        assert {item['name'] for item in data['results']} == {
+            'Дюна', 'Основание'
+        }
+        data = self.search(client, 'пустыни', year=2003)
+        assert [item['name'] for item in data['results']] == [
+            'Пустыня 2003'
+        ]
+        data = self.search(client, 'пустыни', ordering='-year')
+        assert data['results'][0]['name'] == 'Пустыня 2010'
+
+    def test_07_no_review_scan(self, client, titles):
+        with CaptureQueriesContext(connection) as context:
+            self.search(client, 'планета')
+        assert not any(
+            '"reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что поиск не читает таблицу отзывов.'
+
+    def test_08_review_updates_own_row(self, client, titles, user, admin,
+                                       moderator):
+        _, _, solaris = titles
+        for author in (admin, moderator):
+            Review.objects.create(
+                title=solaris, author=author, score=5, text='Про океан.'
+            )
+        review = Review.objects.get(title=solaris, author=user)
+        review.text = 'Снова о контакте.'
+        with CaptureQueriesContext(connection) as context:
+            review.save()
+        indexed = [
+            query['sql'] for query in context.captured_queries
+            if 'reviews_review' in query['sql']
+            and '"reviews_review"' not in query['sql']
+        ]
+        assert len(indexed) == 1, (
+            'Проверьте, что изменение отзыва обновляет только его строку '
+            'поискового индекса.'
+        )
+        assert ReviewSearchDocument.objects.filter(title=solaris).count() == 3
+        moderator.delete()
+        assert ReviewSearchDocument.objects.filter(title=solaris).count() == 2
+        data = self.search(client, 'океан контакт')
+        assert [item['id'] for item in data['results']] == [solaris.id]
@@ -0,0 +1,60 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from api import query_plans
+from api.cache import CACHE_SETTINGS
+from api.query_plans import explain, find_full_scans
+from reviews.models import Review
+
+
+@pytest.mark.django_db
+class Test24QueryPlans:
+
+    def test_01_no_full_scans(self):
+        out = StringIO()
+        call_command('explain_queries', stdout=out)
+        assert 'полного чтения нет' in out.getvalue(), (
+            'Проверьте, что канонические запросы API используют индексы. '
+            'Подробности выводит `python manage.py explain_queries -v 2`.'
+        )
+
+    def test_02_verbose_plans(self, monkeypatch):
+        seeded = {}
+        seed_objects = query_plans.seed_objects
+
+        def remember_seed():
+            admin, values = seed_objects()
+            seeded.update(values)
+            return admin, values
+
+        # Данные создаются в откатываемой транзакции, поэтому их id
+        # запоминаются при создании.
+        monkeypatch.setattr(query_plans, 'seed_objects', remember_seed)
+        out = StringIO()
+        call_command('explain_queries', verbosity=2, stdout=out)
+        assert f'/api/v1/titles/?year={seeded["year"]}' in out.getvalue()
+        assert f'/api/v1/titles/{seeded["title"]}/reviews/' in out.getvalue()
+
+    def test_03_scan_is_detected(self):
+        sql, params = (
+            Review.objects.filter(text='x').query.sql_with_params()
+        )
+        assert find_full_scans(sql, explain(sql, params)) == [
+            'reviews_review'
+        ]
+
+    def test_04_regression_fails(self, monkeypatch):
+        # Поиск SearchFilter (icontains) не может использовать индекс.
+        monkeypatch.setattr(
+            query_plans, 'CANONICAL_REQUESTS',
+            ('/api/v1/users/?search=explain',)
+        )
+        with pytest.raises(CommandError):
+            call_command('explain_queries', stdout=StringIO())
+
+    def test_05_restores_response_cache(self, monkeypatch):
+        monkeypatch.setitem(CACHE_SETTINGS, 'ENABLED', True)
+        query_plans.collect_query_plans(('/api/v1/genres/',))
+        assert CACHE_SETTINGS['ENABLED'] is True
@@ -0,0 +1,144 @@
+import multiprocessing
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.query_budget import (
+    QUERY_BUDGET_SETTINGS, QueryStats, collect_snapshots, percentile,
+    query_budget_exceeded, query_stats, reset_query_stats
+)
+from reviews.models import Title
+
+
+@pytest.mark.parametrize('rank, expected', ((50, 5), (95, 10), (99, 10)))
+def test_percentile(rank, expected):
+    assert percentile(list(range(1, 11)), rank) == expected
+
+
+@pytest.mark.django_db
+class Test25QueryBudget:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture(autouse=True)
+    def clean_stats(self):
+        reset_query_stats()
+        yield
+        reset_query_stats()
+
+    def test_01_server_timing(self, client):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL)
+        header = response['Server-Timing']
+        assert header.startswith('db;dur='), (
+            'Проверьте, что ответы API содержат заголовок Server-Timing '
+            'со временем запросов к БД.'
+        )
+        assert f'desc="{len(context.captured_queries)} queries"' in header
+        assert 'app;dur=' in header
+
+    def test_02_not_api(self, client):
+        response = client.get('/admin/login/')
+        assert 'Server-Timing' not in response
+
+    def test_03_percentiles_by_endpoint(self, client):
+        title = Title.objects.create(name='Дюна', year=1965)
+        for _ in range(3):
+            client.get(self.TITLES_URL)
+        client.get(f'{self.TITLES_URL}{title.id}/')
+        query_stats.save()
+        stats = collect_snapshots()
+        assert stats['titles-list:list']['requests'] == 3, (
+            'Проверьте, что статистика ведется по имени маршрута '
+            'и действию ViewSet.'
+        )
+        assert stats['titles-detail:retrieve']['requests'] == 1
+        summary = stats['titles-list:list']
+        assert summary['queries_p50'] <= summary['queries_p99']
+        assert summary['db_ms_p95'] <= summary['total_ms_p95']
+        assert summary['over_budget'] == 0
+
+    def test_04_budget_exceeded(self, client, monkeypatch):
+        monkeypatch.setitem(
+            QUERY_BUDGET_SETTINGS, 'BUDGETS',
+            {'titles-list:list': {'QUERIES': 1}},
+        )
+        alerts = []
+
+        def receiver(sender, endpoint, queries, budget, **kwargs):
+            alerts.append((endpoint, queries, budget['QUERIES']))
+
+        query_budget_exceeded.connect(receiver)
+        try:
+            client.get(self.TITLES_URL)
+            client.get('/api/v1/genres/')
+        finally:
+            query_budget_exceeded.disconnect(receiver)
+        assert len(alerts) == 1, (
+            'Проверьте, что превышение бюджета эндпоинта отправляет '
+            'сигнал query_budget_exceeded.'
+        )
+        endpoint, queries, budget = alerts[0]
+        assert endpoint == 'titles-list:list'
+        assert queries > budget
+        query_stats.save()
+        assert collect_snapshots()['titles-list:list']['over_budget'] == 1
+
+    def test_05_report(self, client):
+        client.get(self.TITLES_URL)
+        client.get('/api/v1/genres/')
+        query_stats.save()
+        out = StringIO()
+        call_command('query_budget_report', order_by='queries_p95',
+                     stdout=out)
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 3
+        assert lines[1].startswith('titles-list:list')
+        assert lines[2].startswith('genres-list:list')
+
+    def test_06_empty_report(self):
+        out = StringIO()
+        call_command('query_budget_report', stdout=out)
+        assert 'не собрана' in out.getvalue()
+
+    def test_07_processes_keep_own_snapshots(self, monkeypatch):
+        parent = QueryStats()
+        parent.record('titles-list:list', 3, 1.0, 2.0, False)
+        parent.save()
+        # Воркер после fork наследует объект, но не замеры и ячейку.
+        worker_pid = parent.pid + 1
+        monkeypatch.setattr(os, 'getpid', lambda: worker_pid)
+        parent.record('genres-list:list', 1, 1.0, 2.0, False)
+        parent.save()
+        other_pid = worker_pid + 1
+        monkeypatch.setattr(os, 'getpid', lambda: other_pid)
+        other = QueryStats()
+        other.record('titles-list:list', 5, 1.0, 2.0, False)
+        other.save()
+        stats = collect_snapshots()
+        assert stats['titles-list:list']['requests'] == 2, (
+            'Проверьте, что процессы сохраняют снимки под своими ключами '
+            'и не перезаписывают друг друга.'
+        )
+        assert stats['genres-list:list']['requests'] == 1
+
+    def test_08_report_sees_other_process(self):
+        def worker():
+            stats = QueryStats()
+            stats.record('titles-list:list', 4, 1.0, 2.0, False)
+            stats.save()
+
+        process = multiprocessing.get_context('fork').Process(target=worker)
+        process.start()
+        process.join(10)
+        assert process.exitcode == 0
+        out = StringIO()
+        call_command('query_budget_report', stdout=out)
+        assert 'titles-list:list' in out.getvalue(), (
+            'Проверьте, что отчет собирает статистику, сохраненную '
+            'другим процессом.'
+        )
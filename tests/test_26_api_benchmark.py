@@ -0,0 +1,59 @@
+import copy
+import json
+
+import pytest
+
+from api import audit
+from api.cache import CACHE_SETTINGS
+from api.urls import auth_patterns, v1_router
+from benchmarks.api_load import compare, run
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ApiBenchmark:
+
+    @pytest.fixture
+    def report(self, monkeypatch):
+        # Бенчмарк меняет эти настройки, после теста они восстановятся.
+        monkeypatch.setitem(CACHE_SETTINGS, 'ENABLED', True)
+        monkeypatch.setitem(audit.AUDIT_SETTINGS, 'SINK', 'file')
+        return run(
+            requests=2, warmup=1, users=5, categories=2, genres=3,
+            titles=4, reviews=10, comments=10,
+        )
+
+    def test_01_all_routes_without_errors(self, report):
+        routes = {result['route'] for result in report['endpoints'].values()}
+        expected = {
+            pattern.name for pattern in (*v1_router.urls, *auth_patterns)
+        }
+        assert expected <= routes, (
+            'Проверьте, что бенчмарк вызывает все маршруты api/urls.py: '
+            f'не хватает {expected - routes}.'
+        )
+        failed = {
+            name: result['statuses']
+            for name, result in report['endpoints'].items()
+            if result['errors']
+        }
+        assert not failed, f'Сценарии завершились ошибками: {failed}'
+        assert CACHE_SETTINGS['ENABLED'] is True, (
+            'Проверьте, что бенчмарк возвращает настройки после прогона.'
+        )
+        assert audit.AUDIT_SETTINGS['SINK'] == 'file'
+
+    def test_02_json_report(self, report):
+        restored = json.loads(json.dumps(report))
+        result = restored['endpoints']['titles-list']
+        assert result['requests'] == 2
+        assert result['queries']['p50'] >= 1
+        assert set(result['latency_ms']) == {'p50', 'p95', 'p99', 'mean'}
+        assert restored['meta']['dataset']['titles'] == 4
+
+    def test_03_compare(self, report):
+        assert compare(report, report, threshold=0.25) == []
+        slower = copy.deepcopy(report)
+        slower['endpoints']['titles-list']['queries']['max'] += 1
+        regressions = compare(report, slower, threshold=0.25)
+        assert len(regressions) == 1
+        assert regressions[0].startswith('titles-list')
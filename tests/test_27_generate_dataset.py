@@ -0,0 +1,94 @@
+import csv
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Comment, Review, Title, User
+
+SMALL = {
+    'users': 30, 'categories': 3, 'genres': 5, 'titles': 40,
+    'reviews': 300, 'comments': 400,
+}
+
+
+def generate(path, **options):
+    call_command(
+        'generate_dataset', str(path), stdout=StringIO(),
+        **{**SMALL, **options},
+    )
+    return path
+
+
+def read(path, filename):
+    with open(path / filename, encoding='utf-8', newline='') as file:
+        return list(csv.DictReader(file))
+
+
+def test_01_deterministic(tmp_path):
+    first = generate(tmp_path / 'first', seed=7)
+    second = generate(tmp_path / 'second', seed=7)
+    other = generate(tmp_path / 'other', seed=8)
+    files = sorted(path.name for path in first.iterdir())
+    assert len(files) == 7
+    for filename in files:
+        assert (first / filename).read_bytes() == (
+            second / filename
+        ).read_bytes(), (
+            f'Проверьте, что при одном seed файл {filename} совпадает.'
+        )
+    assert (first / 'review.csv').read_bytes() != (
+        other / 'review.csv'
+    ).read_bytes()
+
+
+def test_02_distributions(tmp_path):
+    path = generate(tmp_path / 'zipf', users=300, zipf=1.5, score_skew=3)
+    reviews = read(path, 'review.csv')
+    assert len(reviews) == SMALL['reviews']
+    pairs = Counter((row['author'], row['title_id']) for row in reviews)
+    assert max(pairs.values()) == 1, (
+        'Проверьте, что автор оставляет не больше одного отзыва '
+        'на произведение.'
+    )
+    per_title = sorted(
+        Counter(row['title_id'] for row in reviews).values(), reverse=True
+    )
+    assert sum(per_title[:4]) > len(reviews) / 2, (
+        'Проверьте, что популярность произведений подчиняется '
+        'закону Ципфа.'
+    )
+    flat = read(generate(tmp_path / 'flat', score_skew=-3), 'review.csv')
+
+    def mean_score(rows):
+        return sum(int(row['score']) for row in rows) / len(rows)
+
+    assert mean_score(reviews) > 7 > 4 > mean_score(flat)
+    lengths = [len(row['text'].split()) for row in read(
+        generate(tmp_path / 'short', review_words=(2, 3)), 'review.csv'
+    )]
+    assert set(lengths) <= {2, 3}
+
+
+@pytest.mark.parametrize('options', (
+    {'users': 2, 'titles': 2, 'reviews': 5},
+    {'comment_words': (5, 1)},
+    {'categories': -1},
+    {'reviews': -1},
+    {'comments': -1},
+    {'reviews': 0},
+))
+def test_03_invalid_options(tmp_path, options):
+    with pytest.raises(CommandError):
+        generate(tmp_path, **options)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_04_loadable(tmp_path):
+    generate(tmp_path)
+    call_command('load_csv_data', data_dir=tmp_path, stdout=StringIO())
+    assert User.objects.count() == SMALL['users']
+    assert Title.objects.count() == SMALL['titles']
+    assert Review.objects.count() == SMALL['reviews']
+    assert Comment.objects.count() == SMALL['comments']
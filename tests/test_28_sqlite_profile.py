@@ -0,0 +1,145 @@
+import threading
+import time
+
+import pytest
+from django.conf import settings
+from django.db import connections, transaction
+
+ALIAS = 'sqlite_profile'
+WRITERS = 6
+READERS = 3
+ITERATIONS = 40
+
+
+@pytest.fixture
+def file_database(tmp_path, django_db_blocker):
+    """Файловая БД с настройками default: у тестовой БД в памяти нет WAL."""
+    connections.settings[ALIAS] = {
+        **connections['default'].settings_dict,
+        'NAME': str(tmp_path / 'profile.sqlite3'),
+    }
+    with django_db_blocker.unblock():
+        with connections[ALIAS].cursor() as cursor:
+            cursor.execute(
+                'CREATE TABLE counter (id INTEGER PRIMARY KEY, value INTEGER)'
+            )
+            cursor.execute('INSERT INTO counter VALUES (1, 0)')
+            cursor.execute(
+                'CREATE TABLE item (id INTEGER PRIMARY KEY, thread INTEGER)'
+            )
+        yield ALIAS
+        connections[ALIAS].close()
+    del connections[ALIAS]
+    del connections.settings[ALIAS]
+
+
+def run_threads(targets):
+    errors = []
+
+    def wrapped(target):
+        try:
+            target()
+        except Exception as error:
+            errors.append(error)
+        finally:
+            connections[ALIAS].close()
+
+    threads = [
+        threading.Thread(target=wrapped, args=(target,))
+        for target in targets
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_01_pragmas(file_database):
+    with connections[file_database].cursor() as cursor:
+        values = {}
+        for name in settings.SQLITE_PRAGMAS:
+            cursor.execute(f'PRAGMA {name}')
+            values[name] = cursor.fetchone()[0]
+    assert values['journal_mode'] == 'wal'
+    # NORMAL = 1, MEMORY = 2.
+    assert values['synchronous'] == 1
+    assert values['temp_store'] == 2
+    assert values['busy_timeout'] == settings.SQLITE_PRAGMAS['busy_timeout']
+    assert values['cache_size'] == settings.SQLITE_PRAGMAS['cache_size']
+    default = settings.DATABASES['default']
+    assert default['CONN_MAX_AGE'] and default['CONN_HEALTH_CHECKS']
+
+
+def test_02_writer_waits_for_lock(file_database):
+    locked = threading.Event()
+
+    def hold_lock():
+        with transaction.atomic(using=file_database):
+            with connections[file_database].cursor() as cursor:
+                cursor.execute('UPDATE counter SET value = value + 1')
+            locked.set()
+            time.sleep(0.3)
+
+    def write():
+        locked.wait()
+        with transaction.atomic(using=file_database):
+            with connections[file_database].cursor() as cursor:
+                cursor.execute('SELECT value FROM counter')
+                cursor.execute('UPDATE counter SET value = value + 1')
+
+    assert run_threads((hold_lock, write)) == [], (
+        'Проверьте, что запись ждет блокировку busy_timeout '
+        'вместо ошибки «database is locked».'
+    )
+    with connections[file_database].cursor() as cursor:
+        cursor.execute('SELECT value FROM counter')
+        assert cursor.fetchone()[0] == 2
+
+
+def test_03_mixed_load(file_database):
+    def writer(number):
+        def run():
+            for _ in range(ITERATIONS):
+                # Чтение перед записью, как при создании отзыва.
+                with transaction.atomic(using=file_database):
+                    with connections[file_database].cursor() as cursor:
+                        cursor.execute('SELECT value FROM counter')
+                        value = cursor.fetchone()[0]
+                        cursor.execute(
+                            'INSERT INTO item (thread) VALUES (%s)', [number]
+                        )
+                        cursor.execute(
+                            'UPDATE counter SET value = %s', [value + 1]
+                        )
+        return run
+
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            with connections[file_database].cursor() as cursor:
+                cursor.execute('SELECT COUNT(*), MAX(thread) FROM item')
+                cursor.fetchone()
+
+    readers = [
+        threading.Thread(target=run_threads, args=([reader],))
+        for _ in range(READERS)
+    ]
+    for thread in readers:
+        thread.start()
+    try:
+        errors = run_threads([writer(number) for number in range(WRITERS)])
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join()
+    assert not errors, (
+        'Проверьте, что параллельная запись не падает с ошибкой: '
+        f'{errors[:3]}'
+    )
+    with connections[file_database].cursor() as cursor:
+        cursor.execute('SELECT value FROM counter')
+        assert cursor.fetchone()[0] == WRITERS * ITERATIONS
+        cursor.execute('SELECT COUNT(*) FROM item')
+        assert cursor.fetchone()[0] == WRITERS * ITERATIONS